@@ -0,0 +1,43 @@
+"""
+Compares decode time and retained memory of a large query_swaps page: stdlib json vs orjson, dicts vs records
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+sys.path.append('../')
+
+from swingby.json_codec import get_loads, BACKENDS
+from swingby.records import Swap
+
+SWAPS = 100000
+
+def page():
+    items = [{
+        "hash": "{:064x}".format(i), "status": "COMPLETED", "addressIn": "tb1q{:038x}".format(i),
+        "addressOut": "tbnb1{:038x}".format(i), "amountIn": "1.{:08d}".format(i), "amountOut": "0.{:08d}".format(i),
+        "currencyIn": "BTC", "currencyOut": "BTC.B", "fee": "0.00010000", "txIdIn": "{:064x}".format(i),
+        "txIdOut": "{:064x}".format(i + 1), "timestamp": 1600000000 + i,
+    } for i in range(SWAPS)]
+    return json.dumps({ "items": items, "itemCount": len(items), "total": len(items) }).encode()
+
+def measure(fn):
+    start = time.perf_counter()
+    fn()
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    res = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return res, duration, size
+
+if __name__ == "__main__":
+    data = page()
+    print ("{} swaps, {:.1f} MB of JSON".format(SWAPS, len(data) / 1e6))
+    for backend in sorted(BACKENDS):
+        loads = get_loads(backend)
+        _, duration, size = measure(lambda: loads(data)["items"])
+        print ("{:7s} dicts:   {:6.3f}s {:8.1f} MB".format(backend, duration, size / 1e6))
+        _, duration, size = measure(lambda: Swap.from_list(loads(data)))
+        print ("{:7s} records: {:6.3f}s {:8.1f} MB".format(backend, duration, size / 1e6))
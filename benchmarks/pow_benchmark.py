@@ -0,0 +1,27 @@
+"""
+Measures local PoW nonces per second at 1, 2, 4 and N cores
+"""
+
+import os
+import sys
+sys.path.append('../')
+
+from swingby import PowSolver
+
+DIFFICULTY = 22
+ROUNDS = 5
+
+def bench(workers):
+    solver = PowSolver(difficulty=DIFFICULTY, workers=workers)
+    tries = 0
+    duration = 0.0
+    for i in range(ROUNDS):
+        solver.solve("tbnb1dedxffvl324ggfdpxl0gw5hwylc848ztuy7g7c", "1.{}".format(i), "BTC", "BTC.B")
+        tries += solver.last_tries
+        duration += solver.last_duration
+    return tries / duration
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    for workers in sorted(set(w for w in (1, 2, 4, cores) if w <= cores)):
+        print ("{:3d} workers: {:12.0f} nonces/s".format(workers, bench(workers)))
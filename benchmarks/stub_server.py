@@ -0,0 +1,241 @@
+"""
+A minimal local stub of a Swingby node used by the benchmarks
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+STATUS = {
+    "nodeInfo": { "moniker": "stub", "listenAddr": "127.0.0.1", "version": "0.0.0" },
+    "swapInfo": { "stakeAmount": "0" },
+}
+
+PEERS = [{ "id": "peer{}".format(i), "moniker": "peer{}".format(i), "address": "10.0.0.{}:12121".format(i) } for i in range(8)]
+
+ADDRESSES = [{ "address": "tb1qstub", "currency": "BTC" }, { "address": "tbnb1stub", "currency": "BTC.B" }]
+
+NODE_STAKES = [{ "address": "tbnb1stake{}".format(i), "amount": "100000", "stakeTxHash": "{:064x}".format(i),
+    "stakeTime": 1600000000, "stakeValid": True } for i in range(8)]
+
+FEES = [
+    { "currency": "BTC", "bridgeFeePercent": "0.2", "minerFee": "0.0001" },
+    { "currency": "BTC.B", "bridgeFeePercent": "0.2", "minerFee": "0.00000001" },
+]
+
+FLOATS = { "balances": { "BTC": "12.5", "BTC.B": "10.25" } }
+
+MEMO = "2020_10_01"
+
+PAYOUT = {
+    "totalTransactions": 2,
+    "holders": [{ "address": "tbnb1payout0", "amount": "0.75" }, { "address": "tbnb1payout1", "amount": "0.25" }],
+    "estimatedPayout": "1.0",
+}
+
+# query_swaps filters and the swap fields they match
+SWAP_FILTERS = {
+    "in_hash": ("hash", "txIdIn"),
+    "out_hash": ("txIdOut",),
+    "in_address": ("addressIn",),
+    "out_address": ("addressOut",),
+    "status": ("status",),
+}
+
+def _swap(i, padding):
+    return {
+        "hash": "{:064x}".format(i), "status": "COMPLETED", "addressIn": "tb1q{:038x}".format(i),
+        "addressOut": "tbnb1{:038x}".format(i), "amountIn": "1.{:08d}".format(i), "amountOut": "0.{:08d}".format(i),
+        "currencyIn": "BTC", "currencyOut": "BTC.B", "fee": "0.00010000", "txIdIn": "{:064x}".format(i),
+        "txIdOut": "{:064x}".format(i + 1), "timestamp": 1600000000 + i, "memo": "x" * padding,
+    }
+
+def _staker(i, padding):
+    return {
+        "address": "tbnb1{:038x}".format(i), "staked_amount": "{}.5".format(1000 + i),
+        "reward_amount": "{}.25".format(i % 100), "weekly_memo": MEMO, "memo": "x" * padding,
+    }
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class StubServer:
+    """
+    StubServer serves canned JSON responses on a random local port. Besides the status route it emulates
+    the api/v1/* node routes and the v1/stakes/* staking routes with generated data. Example:
+
+    with StubServer(latency=0.005, swaps=5000, rate_limit_ratio=0.01) as stub:
+        node = NodeHttpClient(stub.url)
+        api = StakesHttpClient(stub.url)
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0, swaps=1000, stakers=1000, padding=0,
+        rate_limit_ratio=0.0, retry_after=0, seed=0):
+        """
+        # Attributes
+        @param float latency - Seconds to sleep before answering every request
+        @param string host - Interface to bind
+        @param integer port - Port to bind (0 = pick a free port)
+        @param integer swaps - Number of swaps served by api/v1/swaps/query
+        @param integer stakers - Number of addresses served by the leaderboards, holders and stakes
+        @param integer padding - Extra bytes added to every swap and staker, to grow the payloads
+        @param float rate_limit_ratio - Share of requests answered with a 429
+        @param integer retry_after - Retry-After header of the injected 429 responses, in seconds
+        @param integer seed - Seed of the 429 injection, so runs are reproducible
+        """
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.swaps = [_swap(i, padding) for i in range(swaps)]
+        self.stakers = [_staker(i, padding) for i in range(stakers)]
+        self.routes = {
+            "/api/v1/status": lambda query, body: (200, STATUS),
+            "/api/v1/peers": lambda query, body: (200, PEERS),
+            "/api/v1/addresses": lambda query, body: (200, ADDRESSES),
+            "/api/v1/stakes": lambda query, body: (200, NODE_STAKES),
+            "/api/v1/swaps/fees": lambda query, body: (200, FEES),
+            "/api/v1/swaps/query": lambda query, body: (200, self._page(self._query_swaps(query), query, 0)),
+            "/api/v1/swaps/calculate": self._calculate,
+            "/api/v1/swaps/create": self._create,
+            "/v1/floats": lambda query, body: (200, FLOATS),
+            "/v1/platform_status": lambda query, body: (200, { "status": 1 }),
+            "/v1/stakes/weekly_memo": lambda query, body: (200, MEMO),
+            "/v1/stakes/leaderboard": lambda query, body: (200, self._leaderboard(query)),
+            "/v1/stakes/rewards_leaderboard": lambda query, body: (200, self._leaderboard(query)),
+            "/v1/stakes/holders": lambda query, body: (200, self._holders()),
+            "/v1/stakes/payout": lambda query, body: (200, PAYOUT),
+            "/v1/stakes": lambda query, body: (200, self._stakes(query)),
+        }
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, body=None):
+                parsed = urlparse(self.path)
+                query = { k: v[0] for k, v in parse_qs(parsed.query).items() }
+                route = server.routes.get(parsed.path)
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._rate_limited():
+                    status, payload = 429, { "message": "rate limit exceeded" }
+                elif route is None:
+                    status, payload = 404, { "message": "not found" }
+                else:
+                    status, payload = route(query, body)
+                data = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+                etag = '"{}"'.format(hashlib.sha1(data).hexdigest()) if status == 200 else None
+                if etag is not None and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                if status == 429:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                self._handle(json.loads(raw) if raw else {})
+
+        self.httpd = _ThreadingHTTPServer((host, port), Handler)
+        self.url = "http://{}:{}".format(*self.httpd.server_address)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _rate_limited(self):
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+                self.rate_limited += 1
+                return True
+            return False
+
+    def _page(self, items, query, first_page):
+        page_size = int(query.get("page_size") or 25)
+        page = int(query.get("page") or first_page) - first_page
+        page_items = items[page * page_size:(page + 1) * page_size]
+        return { "items": page_items, "itemCount": len(page_items), "total": len(items) }
+
+    def _query_swaps(self, query):
+        # every given filter has to match
+        filters = [(name, query[name]) for name in SWAP_FILTERS if query.get(name)]
+        if not filters:
+            return self.swaps
+        return [swap for swap in self.swaps
+            if all(any(swap.get(field) == value for field in SWAP_FILTERS[name]) for name, value in filters)]
+
+    def _leaderboard(self, query):
+        page = self._page(self.stakers, query, 1)
+        page["items"] = [{ "address": s["address"], "stake": s["staked_amount"], "reward": s["reward_amount"] }
+            for s in page["items"]]
+        return { **page, "totalStaked": float(len(self.stakers)) }
+
+    def _holders(self):
+        total = float(len(self.stakers))
+        return { s["address"]: { "quantity": s["staked_amount"],
+            "percentage": "{:.8f}".format(float(s["staked_amount"]) / total) } for s in self.stakers }
+
+    def _stakes(self, query):
+        address = query.get("address")
+        return [s for s in self.stakers if s["address"] == address] if address else self.stakers[:10]
+
+    def _calculate(self, query, body):
+        amount = float(body.get("amount") or 0)
+        fee = round(amount * 0.002 + 0.0001, 8)
+        return 200, {
+            "currency_from": body.get("currency_from"),
+            "currency_to": body.get("currency_to"),
+            "fee": "{:.8f}".format(fee),
+            "receive_amount": "{:.8f}".format(max(amount - fee, 0)),
+            "send_amount": body.get("amount"),
+            "nonce": 0,
+        }
+
+    def _create(self, query, body):
+        return 200, {
+            "address_in": "tb1q{:038x}".format(hash(body.get("address_to")) & 0xffffffff),
+            "address_out": body.get("address_to"),
+            "amount_in": body.get("amount"),
+            "currency_in": body.get("currency_from"),
+            "currency_out": body.get("currency_to"),
+            "timestamp": int(time.time()),
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,166 @@
+"""
+Measures throughput and p50/p99 latency of the main client operations against a local StubServer and writes
+the results to a JSON file. Pass --compare with the results of an earlier run to spot regressions.
+
+python suite.py --output results.json --latency 0.002 --rate-limit-ratio 0.01
+python suite.py --output new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+sys.path.append('../')
+sys.path.append('.')
+
+from swingby import NodeHttpClient, StakesHttpClient, HttpTransport, RateLimitScheduler
+from stub_server import StubServer
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))]
+
+def measure(op, ops, items=None):
+    """
+    Runs op() ops times and summarizes the duration of every run
+
+    # Attributes
+    @param function op - Operation to measure, may return the number of items it processed
+    @param integer ops - Number of runs
+
+    # Returns
+    @return dict result - ops, seconds, opsPerSecond, p50, p99 (seconds) and itemsPerSecond if op returns counts
+    """
+    samples = []
+    count = 0
+    start = time.perf_counter()
+    for _ in range(ops):
+        op_start = time.perf_counter()
+        res = op()
+        samples.append(time.perf_counter() - op_start)
+        if isinstance(res, int):
+            count += res
+    seconds = time.perf_counter() - start
+    result = {
+        "ops": ops,
+        "seconds": seconds,
+        "opsPerSecond": ops / seconds,
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+    }
+    if count:
+        result["itemsPerSecond"] = count / seconds
+    return result
+
+def run(args):
+    config = {
+        "latency": args.latency,
+        "swaps": args.swaps,
+        "stakers": args.stakers,
+        "padding": args.padding,
+        "rateLimitRatio": args.rate_limit_ratio,
+        "calls": args.calls,
+        "crawls": args.crawls,
+        "pageSize": args.page_size,
+        "prefetch": args.prefetch,
+        "startupRuns": args.startup_runs,
+    }
+    scheduler = None
+    if args.rate_limit_ratio:
+        rates = { "swaps": 100000, "stakes": 100000, "status": 100000, "default": 100000 }
+        scheduler = RateLimitScheduler(rates=rates, max_retries=20, base_delay=0.001, max_delay=0.01)
+    results = {}
+    with StubServer(latency=args.latency, swaps=args.swaps, stakers=args.stakers, padding=args.padding,
+        rate_limit_ratio=args.rate_limit_ratio) as stub, HttpTransport(scheduler=scheduler) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post)
+        api = StakesHttpClient(stub.url, transport.send_get, transport.send_post)
+        pages = max(1, -(-args.swaps // args.page_size))
+        page = iter(range(10 ** 9))
+
+        results["status_polling"] = measure(node.get_status, args.calls)
+        results["query_swaps_page"] = measure(lambda: len(node.query_swaps(page_size=args.page_size,
+            page=next(page) % pages)['items']), args.calls)
+        results["iter_swaps_crawl"] = measure(lambda: sum(1 for _ in node.iter_swaps(page_size=args.page_size,
+            prefetch=args.prefetch)), args.crawls)
+        results["swap"] = measure(lambda: node.swap("tbnb1stubaddress", "0.1", "BTC", "BTC.B"), args.calls)
+        results["leaderboard_crawl"] = measure(lambda: len(api.fetch_full_leaderboard(page_size=args.page_size,
+            prefetch=args.prefetch)['items']), args.crawls)
+        with HttpTransport(scheduler=scheduler, conditional=True) as conditional:
+            polling = NodeHttpClient(stub.url, conditional.send_get, conditional.send_post)
+            results["status_polling_conditional"] = measure(polling.get_status, args.calls)
+        config["rateLimited"] = stub.rate_limited
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    startup = lambda *argv: lambda: subprocess.run([sys.executable] + list(argv), cwd=root, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    results["startup_python"] = measure(startup("-c", "pass"), args.startup_runs)
+    results["startup_import"] = measure(startup("-c", "import swingby"), args.startup_runs)
+    results["startup_cli_help"] = measure(startup("-m", "swingby", "--help"), args.startup_runs)
+    return {
+        "version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "config": config,
+        "results": results,
+    }
+
+def compare(report, baseline, threshold):
+    """
+    Prints the change of every benchmark against a baseline report and returns the regressed benchmark names
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        throughput = result["opsPerSecond"] / before["opsPerSecond"] - 1
+        p99 = result["p99"] / before["p99"] - 1 if before["p99"] else 0.0
+        regressed = throughput < -threshold or p99 > threshold
+        if regressed:
+            regressions.append(name)
+        print ("{:26} throughput {:+7.1%}  p99 {:+7.1%}{}".format(name, throughput, p99, "  REGRESSION" if regressed else ""))
+    return regressions
+
+def _version():
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution("swingby").version
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="results.json", help="file the results are written to")
+    parser.add_argument("--compare", help="results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change reported as a regression")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the stub waits before answering")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--swaps", type=int, default=2000, help="swaps served by the stub")
+    parser.add_argument("--stakers", type=int, default=2000, help="addresses served by the stub leaderboards")
+    parser.add_argument("--padding", type=int, default=0, help="extra bytes per swap and staker")
+    parser.add_argument("--calls", type=int, default=300, help="runs of the single request benchmarks")
+    parser.add_argument("--crawls", type=int, default=5, help="runs of the crawl benchmarks")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--prefetch", type=int, default=4)
+    parser.add_argument("--startup-runs", type=int, default=10, help="runs of the interpreter startup benchmarks")
+    args = parser.parse_args()
+
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for name, result in report["results"].items():
+        print ("{:26} {:9.1f} ops/s  p50 {:8.2f} ms  p99 {:8.2f} ms".format(name, result["opsPerSecond"],
+            result["p50"] * 1000, result["p99"] * 1000))
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Compares calls per second of per-call requests.get against the pooled HttpTransport
+"""
+
+import sys
+import time
+import requests
+sys.path.append('../')
+sys.path.append('.')
+
+from swingby import NodeHttpClient, HttpTransport
+from stub_server import StubServer
+
+CALLS = 500
+
+def unpooled_get(endpoint, query={}, json=True):
+    r = requests.get(url=endpoint, params=query)
+    return r.json() if json else r.text
+
+def bench(node, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        node.get_status()
+    return calls / (time.perf_counter() - start)
+
+with StubServer() as stub:
+    unpooled = bench(NodeHttpClient(stub.url, unpooled_get))
+    with HttpTransport() as transport:
+        pooled = bench(NodeHttpClient(stub.url, transport.send_get, transport.send_post))
+
+print ("requests.get:  {:8.1f} calls/s".format(unpooled))
+print ("HttpTransport: {:8.1f} calls/s".format(pooled))
+print ("speedup:       {:8.2f}x".format(pooled / unpooled))
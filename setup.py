@@ -12,7 +12,13 @@ setuptools.setup(
     long_description=long_description,
     url="https://github.com/SwingbyProtocol/python-sdk.git",
     long_description_content_type="text/markdown",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks"]),
+    install_requires=["requests"],
+    extras_require={
+        "async": ["aiohttp"],
+        "numpy": ["numpy"],
+        "fast": ["orjson"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: AGPL License",
@@ -2,7 +2,55 @@
 This module contains various clients for interacting with the Swingby network
 """
 
-from .node_http_client import NodeHttpClient
-from .stakes_http_client import StakesHttpClient
+import importlib
+import sys
+
+# exported names and the modules defining them, imported on first use
+_EXPORTS = {
+    "NodeHttpClient": "node_http_client",
+    "StakesHttpClient": "stakes_http_client",
+    "NodeClusterClient": "node_cluster_client",
+    "HttpTransport": "transport",
+    "AsyncNodeHttpClient": "async_node_http_client",
+    "AsyncStakesHttpClient": "async_stakes_http_client",
+    "AsyncHttpTransport": "async_transport",
+    "ResponseCache": "cache",
+    "SingleFlight": "singleflight",
+    "RateLimitScheduler": "ratelimit",
+    "RateLimitException": "ratelimit",
+    "Metrics": "metrics",
+    "PowSolver": "pow",
+    "SwapWatcher": "swap_watcher",
+    "SwapIndex": "swap_index",
+    "SwapStats": "swap_stats",
+    "StakeTable": "stakes_analytics",
+    "QuoteEngine": "quote_engine",
+    "PayoutPipeline": "payout",
+    "PeerCrawler": "peer_crawler",
+    "TopologySnapshot": "peer_crawler",
+    "Swap": "records",
+    "Stake": "records",
+    "LeaderboardEntry": "records",
+    "Fee": "records",
+    "Holder": "records",
+}
+
+__all__ = list(_EXPORTS) + ["NAME"]
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+if sys.version_info < (3, 7):
+    # module __getattr__ needs python 3.7
+    for _name in _EXPORTS:
+        globals()[_name] = __getattr__(_name)
 
 NAME = "swingby"
@@ -0,0 +1,106 @@
+"""
+This module contains the asyncio counterpart of NodeHttpClient
+"""
+
+import asyncio
+import json
+
+from .node_http_client import NodeHttpClient
+from .async_transport import get_default_async_transport
+from .pagination import aiter_pages
+from .json_stream import ObjectItemParser
+
+class AsyncNodeHttpClient(NodeHttpClient):
+    """
+    AsyncNodeHttpClient exposes the same methods as NodeHttpClient, but every method is a coroutine.
+    Clients created with the same AsyncHttpTransport share its connection pool and concurrency limit. Example:
+
+    node = AsyncNodeHttpClient("https://testnet-node.swingby.network")
+    status = await node.get_status()
+    """
+
+    def __init__(self, url, sendGetRequestFunc=None, sendPostRequestFunc=None, transport=None, *args, **kwargs):
+        if transport is None:
+            transport = get_default_async_transport()
+        self.transport = transport
+        super().__init__(url, sendGetRequestFunc or transport.send_get, sendPostRequestFunc or transport.send_post,
+            transport.send_stream)
+
+    async def gather(self, *calls, return_exceptions=False):
+        """
+        Runs many client calls concurrently and returns their results in order. Example:
+
+        status, fees = await node.gather(node.get_status(), node.get_swap_fees())
+
+        # Attributes
+        @param coroutine calls - Pending client calls
+        @param boolean return_exceptions - Return failures in place of results instead of raising the first one
+
+        # Returns
+        @return array results
+        """
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    async def swap(self, address_to, amount, currency_from, currency_to, pow_solver=None, **kwargs):
+        if pow_solver is None:
+            calc = await self.calculate_swap(address_to, amount, currency_from, currency_to, **kwargs)
+            nonce = calc['nonce']
+        else:
+            loop = asyncio.get_event_loop()
+            calc, nonce = await asyncio.gather(self.calculate_swap(address_to, amount, currency_from, currency_to, **kwargs),
+                loop.run_in_executor(None, pow_solver.solve, address_to, amount, currency_from, currency_to))
+            # the nonce is solved over the exact amount string create_swap sends, "1" and "1.00000000" hash differently
+            if str(calc['send_amount']) != str(amount):
+                nonce = await loop.run_in_executor(None, pow_solver.solve, address_to, calc['send_amount'], currency_from, currency_to)
+        swap = await self.create_swap(address_to, calc['send_amount'], currency_from, currency_to, nonce, **kwargs)
+        return { **swap, "calc": calc }
+    swap.__doc__ = NodeHttpClient.swap.__doc__
+
+    async def swap_many(self, swaps, max_workers=8, pow_solver=None):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def create(kwargs):
+            async with semaphore:
+                try:
+                    return { "swap": await self.swap(pow_solver=pow_solver, **kwargs), "error": None }
+                except Exception as e:
+                    return { "swap": None, "error": e }
+
+        return await asyncio.gather(*[create(kwargs) for kwargs in swaps])
+    swap_many.__doc__ = NodeHttpClient.swap_many.__doc__
+
+    def iter_swaps(self, page_size=100, prefetch=4, **kwargs):
+        fetch_page = lambda page: self.query_swaps(page_size=page_size, page=page, **kwargs)
+        return aiter_pages(fetch_page, page_size, first_page=0, prefetch=prefetch)
+    iter_swaps.__doc__ = NodeHttpClient.iter_swaps.__doc__
+
+    async def get_kv_store(self):
+        kv_store = await self.get(self._url("api/v1/debug/kvstore"))
+        if isinstance(kv_store, str):
+            kv_store = json.loads(kv_store)
+        return kv_store
+    get_kv_store.__doc__ = NodeHttpClient.get_kv_store.__doc__
+
+    async def iter_kv_store(self, prefix=None, chunk_size=65536):
+        parser = ObjectItemParser()
+        async for chunk in self.stream(self._url("api/v1/debug/kvstore"), chunk_size=chunk_size):
+            for key, value in parser.feed(chunk):
+                if prefix is None or key.startswith(prefix):
+                    yield key, value
+        for key, value in parser.close():
+            if prefix is None or key.startswith(prefix):
+                yield key, value
+    iter_kv_store.__doc__ = NodeHttpClient.iter_kv_store.__doc__
+
+    async def dump_kv_store(self, path_or_file, prefix=None, chunk_size=65536):
+        if isinstance(path_or_file, str):
+            with open(path_or_file, "w") as f:
+                return await self.dump_kv_store(f, prefix, chunk_size)
+        count = 0
+        path_or_file.write("{")
+        async for key, value in self.iter_kv_store(prefix, chunk_size):
+            path_or_file.write("{}\n{}: {}".format("," if count else "", json.dumps(key), json.dumps(value)))
+            count += 1
+        path_or_file.write("\n}\n")
+        return count
+    dump_kv_store.__doc__ = NodeHttpClient.dump_kv_store.__doc__
@@ -0,0 +1,112 @@
+"""
+This module contains the asyncio counterpart of StakesHttpClient
+"""
+
+import asyncio
+
+from .stakes_http_client import StakesHttpClient
+from .async_transport import get_default_async_transport
+from .pagination import aiter_pages, page_count
+from .bulk import aimap_unordered
+from .json_stream import ObjectItemParser
+
+class AsyncStakesHttpClient(StakesHttpClient):
+    """
+    AsyncStakesHttpClient exposes the same methods as StakesHttpClient, but every method is a coroutine.
+    Clients created with the same AsyncHttpTransport share its connection pool and concurrency limit. Example:
+
+    api = AsyncStakesHttpClient("https://staking-api.swingby.network")
+    leaderboard = await api.get_leaderboard()
+    """
+
+    def __init__(self, url, sendGetRequestFunc=None, sendPostRequestFunc=None, transport=None, *args, **kwargs):
+        if transport is None:
+            transport = get_default_async_transport()
+        self.transport = transport
+        super().__init__(url, sendGetRequestFunc or transport.send_get, sendPostRequestFunc or transport.send_post,
+            transport.send_stream)
+
+    async def gather(self, *calls, return_exceptions=False):
+        """
+        Runs many client calls concurrently and returns their results in order. Example:
+
+        leaderboard, holders = await api.gather(api.get_leaderboard(), api.get_holders())
+
+        # Attributes
+        @param coroutine calls - Pending client calls
+        @param boolean return_exceptions - Return failures in place of results instead of raising the first one
+
+        # Returns
+        @return array results
+        """
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    async def iter_leaderboard(self, memo=None, page_size=100, prefetch=4, rewards=False):
+        memo = memo or await self.get_weekly_memo()
+        get_page = self.get_rewards_leaderboard if rewards else self.get_leaderboard
+        fetch_page = lambda page: get_page(memo=memo, page=page, page_size=page_size)
+        async for item in aiter_pages(fetch_page, page_size, first_page=1, prefetch=prefetch):
+            yield item
+    iter_leaderboard.__doc__ = StakesHttpClient.iter_leaderboard.__doc__
+
+    async def fetch_full_leaderboard(self, memo=None, page_size=100, prefetch=4, rewards=False):
+        memo = memo or await self.get_weekly_memo()
+        get_page = self.get_rewards_leaderboard if rewards else self.get_leaderboard
+        first = await get_page(memo=memo, page=1, page_size=page_size)
+        pages = range(2, 1 + page_count(first, page_size))
+        semaphore = asyncio.Semaphore(prefetch)
+        async def fetch_page(page):
+            async with semaphore:
+                return await get_page(memo=memo, page=page, page_size=page_size)
+        rest = await asyncio.gather(*[fetch_page(page) for page in pages])
+        items = [item for res in [first] + list(rest) for item in res['items'] or []]
+        return { **first, "memo": memo, "items": items, "itemCount": len(items) }
+    fetch_full_leaderboard.__doc__ = StakesHttpClient.fetch_full_leaderboard.__doc__
+
+    async def get_floats(self):
+        res = await self.get(self._url("v1/floats"))
+        return res['balances']
+    get_floats.__doc__ = StakesHttpClient.get_floats.__doc__
+
+    async def get_platform_status(self):
+        res = await self.get(self._url("v1/platform_status"))
+        return res['status']
+    get_platform_status.__doc__ = StakesHttpClient.get_platform_status.__doc__
+
+    async def _iter_items(self, path, query, chunk_size, keys=None):
+        parser = ObjectItemParser(keys)
+        async for chunk in self.stream(self._url(path), query=query, chunk_size=chunk_size):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+
+    def iter_holders(self, memo=None, chunk_size=65536):
+        query = { "memo": memo } if memo else {}
+        return self._iter_items("v1/stakes/holders", query, chunk_size)
+    iter_holders.__doc__ = StakesHttpClient.iter_holders.__doc__
+
+    async def iter_stakes(self, address=None, memo=None, chunk_size=65536):
+        query = { k: v for k, v in (("address", address), ("memo", memo)) if v }
+        async for _, stake in self._iter_items("v1/stakes", query, chunk_size):
+            yield stake
+    iter_stakes.__doc__ = StakesHttpClient.iter_stakes.__doc__
+
+    async def get_payout_summary(self, memo=None, chunk_size=65536):
+        query = { "memo": memo } if memo else {}
+        keys = ("totalTransactions", "estimatedPayout")
+        return { key: value async for key, value in self._iter_items("v1/stakes/payout", query, chunk_size, keys) }
+    get_payout_summary.__doc__ = StakesHttpClient.get_payout_summary.__doc__
+
+    def bulk_rewards_history(self, addresses, max_workers=8, retries=3):
+        return aimap_unordered(self.get_rewards_history, addresses, max_workers=max_workers, retries=retries)
+    bulk_rewards_history.__doc__ = StakesHttpClient.bulk_rewards_history.__doc__
+
+    def bulk_token_balance(self, addresses, max_workers=8, retries=3):
+        return aimap_unordered(self.get_token_balance, addresses, max_workers=max_workers, retries=retries)
+    bulk_token_balance.__doc__ = StakesHttpClient.bulk_token_balance.__doc__
+
+    def bulk_stakes(self, addresses, memo=None, max_workers=8, retries=3):
+        fn = lambda address: self.get_stakes(address=address, memo=memo)
+        return aimap_unordered(fn, addresses, max_workers=max_workers, retries=retries)
+    bulk_stakes.__doc__ = StakesHttpClient.bulk_stakes.__doc__
@@ -0,0 +1,271 @@
+"""
+This module contains the pooled asyncio HTTP transport shared by the async Swingby clients.
+Requires aiohttp (pip install aiohttp).
+"""
+
+import asyncio
+import atexit
+import json as jsonlib
+import time
+
+from .ratelimit import RateLimitException, parse_retry_after
+from .json_codec import get_loads
+from .conditional import ValidatorCache, validator_key
+
+class AsyncHttpTransport:
+    """
+    AsyncHttpTransport holds a pooled aiohttp session that can be shared between any number of
+    AsyncNodeHttpClient and AsyncStakesHttpClient instances, and bounds the number of requests in flight.
+    The session is opened lazily on first use, inside the running event loop, and each event loop gets its
+    own. A loop run with asyncio.run closes its session when it shuts down; a loop run by hand must close
+    the transport (close() or async with) before it is closed. Example:
+
+    async with AsyncHttpTransport(max_concurrency=500) as transport:
+        node = AsyncNodeHttpClient("https://testnet-node.swingby.network", transport=transport)
+        status = await node.get_status()
+    """
+
+    def __init__(self, limit=100, limit_per_host=0, max_concurrency=None, connect_timeout=5, read_timeout=30,
+        keep_alive=True, headers=None, scheduler=None, json_backend=None, metrics=None, conditional=False,
+        validators_maxsize=1024, *args, **kwargs):
+        """
+        # Attributes
+        @param integer limit - Max number of open connections (0 = unlimited)
+        @param integer limit_per_host - Max number of open connections per host (0 = unlimited)
+        @param integer max_concurrency - Max number of requests in flight (none provided = unbounded)
+        @param float connect_timeout - Seconds to wait for a connection to be established
+        @param float read_timeout - Seconds to wait for the server to send data
+        @param boolean keep_alive - Re-use connections between requests
+        @param dict headers - Extra headers sent with every request
+        @param RateLimitScheduler scheduler - Paces and retries requests to stay under the rate limits
+        @param string json_backend - JSON decoder, orjson or json (none provided = the fastest available)
+        @param Metrics metrics - Records per-endpoint latency, sizes and status codes (none provided = disabled)
+        @param boolean conditional - Revalidate get requests with ETag / Last-Modified, see ValidatorCache
+        @param integer validators_maxsize - Max number of urls whose validators and responses are remembered
+        """
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.validators = ValidatorCache(validators_maxsize) if conditional else None
+        self.loads = get_loads(json_backend)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.max_concurrency = max_concurrency
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.headers = headers or {}
+        self.session = None
+        self._loop = None
+        self._closer = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _get_session(self):
+        loop = asyncio.get_event_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            import aiohttp
+            self._discard_session()
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                force_close=not self.keep_alive)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+            self._loop = loop
+            # asyncio.run cancels the tasks left when its coroutine returns, before closing its loop, so the
+            # session is closed on the loop that owns it even if the transport is never closed
+            self._closer = loop.create_task(self._close_on_shutdown(self.session))
+            if self.max_concurrency:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def _close_on_shutdown(self, session):
+        try:
+            await asyncio.get_event_loop().create_future()
+        finally:
+            if self.session is session:
+                self.session = None
+            await session.close()
+
+    def _discard_session(self):
+        # forgets the session of another event loop, closing it on that loop if it is still open
+        session, loop, closer = self.session, self._loop, self._closer
+        self.session = self._closer = None
+        if session is None or session.closed or loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            loop.call_soon_threadsafe(closer.cancel)
+        else:
+            closer.cancel()
+            loop.run_until_complete(asyncio.gather(closer, return_exceptions=True))
+
+    async def close(self):
+        """
+        Close the session and all pooled connections
+        """
+        if self.session is not None and self._loop is not asyncio.get_event_loop():
+            self._discard_session()
+        elif self.session is not None:
+            session, closer = self.session, self._closer
+            self.session = self._closer = None
+            closer.cancel()
+            await session.close()
+
+    async def _request(self, endpoint, method, query, body=None, json=True):
+        if self.metrics is not None:
+            return await self._instrumented(endpoint, method, query, body, json)
+        return await self._send(endpoint, method, query, body, json, self.loads)
+
+    async def _instrumented(self, endpoint, method, query, body, json):
+        decode_seconds = [0.0]
+
+        def loads(data):
+            start = time.perf_counter()
+            try:
+                return self.loads(data)
+            finally:
+                decode_seconds[0] += time.perf_counter() - start
+
+        observed = { "status": "error", "seconds": 0.0, "bytesIn": 0 }
+        try:
+            return await self._send(endpoint, method, query, body, json, loads, observed)
+        finally:
+            self.metrics.observe(method, endpoint, observed["status"], observed["seconds"], decode_seconds[0],
+                observed["bytesIn"], len(jsonlib.dumps(body)) if body is not None else 0)
+
+    async def _send(self, endpoint, method, query, body, json, loads, observed=None):
+        session = self._get_session()
+        params = { k: str(v) for k, v in query.items() if v is not None }
+        key = entry = None
+        if self.validators is not None and method == "GET":
+            key = validator_key(endpoint, query, json)
+            entry = self.validators.lookup(key)
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        start = time.perf_counter() if observed is not None else None
+        try:
+            async with session.request(method, endpoint, params=params, json=body,
+                headers=entry.headers if entry is not None else None) as r:
+                if observed is not None:
+                    observed["status"] = r.status
+                if r.status == 429:
+                    raise RateLimitException("{} {} failed with status code {} - Err: rate limit exception".format(method, endpoint, r.status),
+                        parse_retry_after(r.headers.get("Retry-After")))
+                data = await r.read()
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            if observed is not None:
+                observed["seconds"] = time.perf_counter() - start
+        if observed is not None:
+            observed["bytesIn"] = len(data)
+        if r.status == 304 and entry is not None:
+            return self.validators.not_modified(entry), False
+        if r.status < 200 or r.status > 299:
+            text = data.decode(r.charset or "utf-8", "replace")
+            raise Exception("{} {} failed with status code {} - Err: {}".format(method, endpoint, r.status, _error_message(method, text)))
+        if not json:
+            res = data.decode(r.charset or "utf-8")
+        elif method == "POST":
+            try:
+                res = loads(data)
+            except ValueError:
+                # e.g. the html page of a proxy, never a successful result
+                raise Exception("POST {} answered status code {} with an invalid JSON body - Err: {}".format(endpoint,
+                    r.status, data.decode(r.charset or "utf-8", "replace")))
+        else:
+            res = loads(data)
+        if key is not None:
+            self.validators.store(key, r.headers, res)
+        return res, True
+
+    async def send_stream(self, endpoint, query={}, chunk_size=65536):
+        """
+        Sends a get request over the pooled session and lazily yields the raw response body in chunks
+        """
+        if self._semaphore is None:
+            self._get_session()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            start = time.perf_counter() if self.metrics is not None else None
+            if self.scheduler is not None:
+                r = await self.scheduler.run_async(endpoint, self._open_stream, query)
+            else:
+                r = await self._open_stream(endpoint, query)
+            size = 0
+            try:
+                async for chunk in r.content.iter_chunked(chunk_size):
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                r.release()
+                if start is not None:
+                    self.metrics.observe("GET", endpoint, r.status, time.perf_counter() - start, bytes_in=size)
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    async def _open_stream(self, endpoint, query):
+        params = { k: str(v) for k, v in query.items() if v is not None }
+        r = await self._get_session().get(endpoint, params=params)
+        if r.status == 429:
+            r.release()
+            raise RateLimitException("GET {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status),
+                parse_retry_after(r.headers.get("Retry-After")))
+        if r.status < 200 or r.status > 299:
+            text = await r.text()
+            r.release()
+            raise Exception("GET {} failed with status code {} - Err: {}".format(endpoint, r.status, text))
+        return r
+
+    async def send_get(self, endpoint, query={}, json=True):
+        """
+        Sends a get request over the pooled session
+        """
+        return (await self.send_get_conditional(endpoint, query, json))[0]
+
+    async def send_get_conditional(self, endpoint, query={}, json=True):
+        """
+        Sends a get request over the pooled session and tells whether its answer is new, see ValidatorCache
+
+        # Returns
+        @return tuple (value, modified) - The response, and False if it is the remembered body of a 304
+        Not Modified answer, True otherwise
+        """
+        if self.scheduler is not None:
+            return await self.scheduler.run_async(endpoint, self._request, "GET", query, json=json)
+        return await self._request(endpoint, "GET", query, json=json)
+
+    async def send_post(self, endpoint, query={}, body={}):
+        """
+        Sends a post request in application/json format over the pooled session
+        """
+        if self.scheduler is not None:
+            return (await self.scheduler.run_async(endpoint, self._request, "POST", query, body=body))[0]
+        return (await self._request(endpoint, "POST", query, body=body))[0]
+
+def _error_message(method, text):
+    if method != "POST":
+        return text
+    try:
+        res = jsonlib.loads(text)
+    except ValueError:
+        return text
+    return res.get('message', 'unknown') if isinstance(res, dict) else res
+
+_default_async_transport = None
+
+def get_default_async_transport():
+    """
+    Returns the async transport shared by every async client created without its own request functions
+    """
+    global _default_async_transport
+    if _default_async_transport is None:
+        _default_async_transport = AsyncHttpTransport()
+        # closes the session of a loop that was run by hand and never closed
+        atexit.register(_default_async_transport._discard_session)
+    return _default_async_transport
@@ -0,0 +1,94 @@
+"""
+This module contains helpers for running one client call per item over many items concurrently
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .ratelimit import RateLimitException
+
+def _retry_delay(e, attempt, base_delay):
+    delay = base_delay * (2 ** attempt) * random.uniform(0.5, 1.0)
+    if isinstance(e, RateLimitException) and e.retry_after:
+        delay = max(delay, e.retry_after)
+    return delay
+
+def _call_with_retries(fn, item, retries, base_delay):
+    attempt = 0
+    while True:
+        try:
+            return fn(item)
+        except Exception as e:
+            if attempt >= retries:
+                return e
+            time.sleep(_retry_delay(e, attempt, base_delay))
+            attempt += 1
+
+def imap_unordered(fn, items, max_workers=8, retries=3, base_delay=0.5):
+    """
+    Calls fn(item) for every item concurrently and yields (item, result) pairs as they complete. A failed call is
+    retried on its own with jittered exponential backoff, waiting at least the Retry-After of rate limited calls.
+    Once its retries are exhausted the pair holds the exception instead of a result. At most max_workers calls
+    are in flight, so items can be a lazy iterable of any size.
+
+    # Attributes
+    @param function fn - Called with one item
+    @param iterable items - Items to call fn with
+    @param integer max_workers - Max number of calls in flight
+    @param integer retries - Max number of retries of a failed call
+    @param float base_delay - First retry delay in seconds, doubled on every retry
+
+    # Returns
+    @return iterator pairs - (item, result or Exception)
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for item in items:
+            pending[executor.submit(_call_with_retries, fn, item, retries, base_delay)] = item
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                for next_item in items:
+                    pending[executor.submit(_call_with_retries, fn, next_item, retries, base_delay)] = next_item
+                    break
+                yield item, future.result()
+
+async def _acall_with_retries(fn, item, retries, base_delay):
+    attempt = 0
+    while True:
+        try:
+            return await fn(item)
+        except Exception as e:
+            if attempt >= retries:
+                return e
+            await asyncio.sleep(_retry_delay(e, attempt, base_delay))
+            attempt += 1
+
+async def aimap_unordered(fn, items, max_workers=8, retries=3, base_delay=0.5):
+    """
+    Async counterpart of imap_unordered, fn must be a coroutine function
+    """
+    items = iter(items)
+    pending = {}
+    try:
+        for item in items:
+            pending[asyncio.ensure_future(_acall_with_retries(fn, item, retries, base_delay))] = item
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                for next_item in items:
+                    pending[asyncio.ensure_future(_acall_with_retries(fn, next_item, retries, base_delay))] = next_item
+                    break
+                yield item, task.result()
+    finally:
+        for task in pending:
+            task.cancel()
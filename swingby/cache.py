@@ -0,0 +1,141 @@
+"""
+This module contains an opt-in TTL response cache for the Swingby clients
+"""
+
+import asyncio
+import collections
+import functools
+import threading
+import time
+
+DEFAULT_TTLS = {
+    "get_swap_fees": 60,
+    "get_tss_addresses": 60,
+    "get_status": 10,
+    "get_token_info": 300,
+    "get_weekly_memo": 300,
+}
+
+class ResponseCache:
+    """
+    ResponseCache memoizes slow-changing client methods for a per-method TTL, in a size bounded LRU.
+    The method arguments (and therefore the query parameters) are part of the cache key.
+    Cached responses are shared between callers and must not be mutated. Example:
+
+    cache = ResponseCache(maxsize=512)
+    node = cache.wrap(NodeHttpClient("https://testnet-node.swingby.network"))
+    api = cache.wrap(StakesHttpClient("https://staking-api.swingby.network"), ttls={ "get_weekly_memo": 60 })
+    """
+
+    def __init__(self, maxsize=1024, ttls=None, metrics=None, *args, **kwargs):
+        """
+        # Attributes
+        @param integer maxsize - Max number of cached responses, least recently used are evicted first
+        @param dict ttls - Seconds to cache each method for, by method name (none provided = DEFAULT_TTLS)
+        @param Metrics metrics - Records the hits per method (none provided = disabled)
+        """
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def wrap(self, client, ttls=None):
+        """
+        Caches the client's methods listed in ttls. Works for both the sync and the async clients.
+
+        # Attributes
+        @param object client - NodeHttpClient, StakesHttpClient or an async client
+        @param dict ttls - Seconds to cache each method for (none provided = the cache's ttls)
+
+        # Returns
+        @return object client
+        """
+        for name, ttl in (self.ttls if ttls is None else ttls).items():
+            method = getattr(client, name, None)
+            if method is not None:
+                setattr(client, name, self._cached(client, name, method, ttl))
+        return client
+
+    def _cached(self, client, name, method, ttl):
+        is_async = asyncio.iscoroutinefunction(client.get)
+        @functools.wraps(method)
+        def cached(*args, **kwargs):
+            key = (client.url, name, args, tuple(sorted(kwargs.items())))
+            found, value = self.lookup(key)
+            if found:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(name)
+                return _resolved(value) if is_async else value
+            res = method(*args, **kwargs)
+            if asyncio.iscoroutine(res):
+                return self._store_async(key, res, ttl)
+            self.store(key, res, ttl)
+            return res
+        return cached
+
+    async def _store_async(self, key, coro, ttl):
+        res = await coro
+        self.store(key, res, ttl)
+        return res
+
+    def lookup(self, key):
+        """
+        Returns (found, value) for the key, counting a hit or a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, value, ttl):
+        """
+        Stores a response for ttl seconds, evicting the least recently used entries beyond maxsize
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, name=None, url=None):
+        """
+        Drops cached responses. With no arguments the whole cache is cleared.
+
+        # Attributes
+        @param string name - Only drop responses of this method (get_status, get_swap_fees ...)
+        @param string url - Only drop responses of clients bound to this url
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if (name is None or key[1] == name) and (url is None or key[0] == url):
+                    del self._entries[key]
+
+    def stats(self):
+        """
+        Get the cache counters
+
+        # Returns
+        @return dict stats
+        @return integer stats.hits
+        @return integer stats.misses
+        @return integer stats.evictions
+        @return integer stats.size
+        """
+        return { "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries) }
+
+async def _resolved(value):
+    return value
@@ -0,0 +1,194 @@
+"""
+This module contains the command line interface, run with python -m swingby
+
+Every query prints one JSON line. A batch file holds one query per line, in the same syntax as the command line,
+and its queries run concurrently over one pooled connection. An invalid line prints an error record and does not
+abort the rest of the batch. Example:
+
+python -m swingby status
+python -m swingby leaderboard --page-size 100
+python -m swingby --batch queries.txt --concurrency 16 > results.ndjson
+"""
+
+import argparse
+import json
+import os
+import shlex
+import sys
+
+DEFAULT_NODE_URL = "https://testnet-node.swingby.network"
+DEFAULT_STAKES_URL = "https://staking-api.swingby.network"
+
+# command: (client, method, arguments as (flag, keyword, type, help))
+COMMANDS = {
+    "status": ("node", "get_status", [], "Node state and network metadata"),
+    "peers": ("node", "get_peers", [("--type", "node_type", str, "signer | normal")], "Peers of the node"),
+    "tss-addresses": ("node", "get_tss_addresses", [], "TSS addresses of the node"),
+    "node-stakes": ("node", "get_stakes", [], "Stakes on the network"),
+    "fees": ("node", "get_swap_fees", [], "Swap fees per currency"),
+    "swap-stats": ("node", "get_swap_stats", [], "Swap statistics"),
+    "swaps": ("node", "query_swaps", [
+        ("--status", "status", str, "Status of the swaps"),
+        ("--in-address", "in_address", str, "Swap inbound address"),
+        ("--in-hash", "in_hash", str, "Hash of the inbound transaction"),
+        ("--page", "page", int, "Page number"),
+        ("--page-size", "page_size", int, "Max number of items per page"),
+        ("--sort", "sort", int, "1 = old to new"),
+    ], "Query swaps"),
+    "floats": ("stakes", "get_floats", [], "Network floats"),
+    "platform-status": ("stakes", "get_platform_status", [], "Platform status (0 offline, 1 online, 3 maintenance)"),
+    "weekly-memo": ("stakes", "get_weekly_memo", [], "Current weekly memo"),
+    "leaderboard": ("stakes", "get_leaderboard", [
+        ("--memo", "memo", str, "Weekly memo"),
+        ("--page", "page", int, "Page number"),
+        ("--page-size", "page_size", int, "Number of items per page"),
+    ], "Staking leaderboard"),
+    "rewards-leaderboard": ("stakes", "get_rewards_leaderboard", [
+        ("--memo", "memo", str, "Weekly memo"),
+        ("--page", "page", int, "Page number"),
+        ("--page-size", "page_size", int, "Number of items per page"),
+    ], "Staking rewards leaderboard"),
+    "holders": ("stakes", "get_holders", [("--memo", "memo", str, "Weekly memo")], "Token holders"),
+    "stakes": ("stakes", "get_stakes", [
+        ("--address", "address", str, "Staker address"),
+        ("--memo", "memo", str, "Weekly memo"),
+    ], "Stakes of the staking API"),
+    "rewards-history": ("stakes", "get_rewards_history", [("address", "address", str, "Staker address")],
+        "Rewards history of an address"),
+    "token-info": ("stakes", "get_token_info", [], "Token info"),
+    "token-balance": ("stakes", "get_token_balance", [("address", "address", str, "Holder address")],
+        "Token balance of an address"),
+}
+
+class QueryError(Exception):
+    """
+    An invalid line of a batch file
+    """
+
+class _BatchQueryParser(argparse.ArgumentParser):
+    """
+    Raises the errors of a batch line instead of printing the usage and exiting
+    """
+
+    def error(self, message):
+        raise QueryError(message)
+
+def query_parser(parser_class=argparse.ArgumentParser):
+    """
+    Parser of a single query, shared by the command line and the lines of a batch file
+    """
+    parser = parser_class(prog="python -m swingby", add_help=False)
+    commands = parser.add_subparsers(dest="command")
+    for name, (client, method, arguments, help_text) in COMMANDS.items():
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        for flag, keyword, kind, arg_help in arguments:
+            if flag.startswith("-"):
+                command.add_argument(flag, dest=keyword, type=kind, help=arg_help)
+            else:
+                command.add_argument(keyword, type=kind, help=arg_help)
+    return parser
+
+def main_parser():
+    parser = argparse.ArgumentParser(prog="python -m swingby", description="Query a Swingby node and the staking API. "
+        "Every result is printed as one JSON line.", parents=[query_parser()])
+    parser.add_argument("--node", default=os.environ.get("SWINGBY_NODE_URL", DEFAULT_NODE_URL), help="node url")
+    parser.add_argument("--stakes", default=os.environ.get("SWINGBY_STAKES_URL", DEFAULT_STAKES_URL), help="staking API url")
+    parser.add_argument("--timeout", type=float, default=30, help="read timeout in seconds")
+    parser.add_argument("--batch", metavar="FILE", help="run the queries of a file (- = stdin), one per line; invalid lines are reported as errors")
+    parser.add_argument("--concurrency", type=int, default=8, help="max number of batch queries in flight")
+    parser.add_argument("--ordered", action="store_true", help="print batch results in the order of the file")
+    return parser
+
+def parse_batch(lines, parser=None):
+    """
+    Parses the lines of a batch file into queries, skipping blank lines and # comments. An invalid line does not
+    abort the batch, its error takes the place of the parsed arguments.
+
+    # Returns
+    @return array queries - (line number, text, parsed arguments or QueryError)
+    """
+    parser = parser or query_parser(_BatchQueryParser)
+    queries = []
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(text))
+            if not args.command:
+                raise QueryError("missing command")
+        except (QueryError, ValueError) as e:
+            args = QueryError("Invalid query on line {}: {}".format(number, e))
+        except SystemExit:
+            args = QueryError("Invalid query on line {}: {}".format(number, text))
+        queries.append((number, text, args))
+    return queries
+
+def run_query(clients, args):
+    client, method, arguments, _ = COMMANDS[args.command]
+    kwargs = { keyword: getattr(args, keyword) for _, keyword, _, _ in arguments if getattr(args, keyword) is not None }
+    return getattr(clients[client], method)(**kwargs)
+
+def _print(record, out):
+    out.write(json.dumps(record, default=str) + "\n")
+    out.flush()
+
+def run(args, out=sys.stdout):
+    """
+    Runs a query or a batch of queries and prints one JSON line per result
+
+    # Returns
+    @return integer failures - Number of failed queries
+    """
+    from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+    from .transport import HttpTransport
+    from .node_http_client import NodeHttpClient
+    from .stakes_http_client import StakesHttpClient
+
+    transport = HttpTransport(pool_maxsize=max(args.concurrency, 1), read_timeout=args.timeout)
+    clients = {
+        "node": NodeHttpClient(args.node.rstrip("/"), transport.send_get, transport.send_post),
+        "stakes": StakesHttpClient(args.stakes.rstrip("/"), transport.send_get, transport.send_post),
+    }
+    with transport:
+        if not args.batch:
+            _print(run_query(clients, args), out)
+            return 0
+        if args.batch == "-":
+            queries = parse_batch(sys.stdin)
+        else:
+            with open(args.batch) as f:
+                queries = parse_batch(f)
+        failures = 0
+
+        def submit(query):
+            if not isinstance(query, QueryError):
+                return executor.submit(run_query, clients, query)
+            future = Future()
+            future.set_exception(query)
+            return future
+
+        with ThreadPoolExecutor(max_workers=max(args.concurrency, 1)) as executor:
+            futures = [(submit(query), number, text) for number, text, query in queries]
+            if not args.ordered:
+                lines = { future: (number, text) for future, number, text in futures }
+                futures = ((future,) + lines[future] for future in as_completed(lines))
+            for future, number, text in futures:
+                try:
+                    _print({ "line": number, "query": text, "result": future.result() }, out)
+                except Exception as e:
+                    failures += 1
+                    _print({ "line": number, "query": text, "error": str(e) }, out)
+        return failures
+
+def main(argv=None):
+    parser = main_parser()
+    args = parser.parse_args(argv)
+    if not args.command and not args.batch:
+        parser.print_help()
+        return 2
+    try:
+        return 1 if run(args) else 0
+    except Exception as e:
+        _print({ "error": str(e) }, sys.stdout)
+        return 1
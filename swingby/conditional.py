@@ -0,0 +1,108 @@
+"""
+This module contains the validator store behind the conditional get requests of the transports
+"""
+
+import collections
+import threading
+
+def validator_key(endpoint, query, json):
+    """
+    Key of a get request, the endpoint url with its (sorted) query and response type
+    """
+    return (endpoint, tuple(sorted((k, str(v)) for k, v in query.items() if v is not None)), json)
+
+class Validated:
+    """
+    A remembered response: its validators as request headers and its decoded body
+    """
+
+    __slots__ = ("headers", "value")
+
+    def __init__(self, headers, value):
+        self.headers = headers
+        self.value = value
+
+class ValidatorCache:
+    """
+    ValidatorCache remembers the ETag / Last-Modified of get responses per url, together with the decoded body,
+    in a size bounded LRU. Transports created with conditional=True send them back as If-None-Match /
+    If-Modified-Since, and a 304 Not Modified answer returns the remembered body without downloading or
+    parsing it again. send_get_conditional returns whether each answer was new along with it, so pollers can
+    skip their recomputation. Remembered bodies are shared and must not be mutated. Example:
+
+    transport = HttpTransport(conditional=True)
+    while True:
+        status, modified = transport.send_get_conditional("https://testnet-node.swingby.network/api/v1/status")
+        if modified:
+            ...
+    """
+
+    def __init__(self, maxsize=1024, *args, **kwargs):
+        """
+        # Attributes
+        @param integer maxsize - Max number of remembered urls, least recently used are evicted first
+        """
+        self.maxsize = maxsize
+        self.modified = 0
+        self.not_modified_count = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """
+        Returns the remembered response of a request, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def not_modified(self, entry):
+        """
+        Counts a 304 answer and returns the remembered body
+        """
+        with self._lock:
+            self.not_modified_count += 1
+        return entry.value
+
+    def store(self, key, response_headers, value):
+        """
+        Remembers a response if it carries an ETag or a Last-Modified header
+        """
+        headers = {}
+        if response_headers.get("ETag"):
+            headers["If-None-Match"] = response_headers["ETag"]
+        if response_headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = response_headers["Last-Modified"]
+        with self._lock:
+            self.modified += 1
+            if not headers:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = Validated(headers, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forgets every remembered response
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Get the revalidation counters
+
+        # Returns
+        @return dict stats
+        @return integer stats.modified - Responses downloaded in full
+        @return integer stats.notModified - 304 answers served from the remembered body
+        @return integer stats.size
+        """
+        return { "modified": self.modified, "notModified": self.not_modified_count, "size": len(self._entries) }
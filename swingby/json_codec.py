@@ -0,0 +1,44 @@
+"""
+This module picks the fastest available JSON decoder. orjson is used when installed (pip install orjson),
+otherwise the standard library json module.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _orjson_loads(data):
+    return orjson.loads(data)
+
+def _json_loads(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+BACKENDS = {
+    "json": _json_loads,
+}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_loads
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+def get_loads(backend=None):
+    """
+    Returns the loads function of a backend (none provided = the fastest available)
+
+    # Attributes
+    @param string backend - orjson or json
+
+    # Returns
+    @return function loads - Decodes bytes or str
+    """
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise Exception("JSON backend {} is not available, install it with: pip install {}".format(backend, backend))
+    return BACKENDS[backend]
+
+loads = get_loads()
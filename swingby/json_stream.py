@@ -0,0 +1,225 @@
+"""
+This module contains an incremental parser for large top-level JSON objects and arrays
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = " \t\n\r"
+_STRING_STOP = re.compile(r'["\\]')
+# plain characters and complete strings inside a skipped array or object (an unrolled loop, so it never backtracks)
+_RUN = r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*'
+_NESTED_RUN = re.compile(_RUN, re.S)
+# a complete array or object holding no other array or object
+_FLAT = re.compile(r'\[' + _RUN + r'\]|\{' + _RUN + r'\}', re.S)
+
+class ObjectItemParser:
+    """
+    ObjectItemParser is fed a JSON object chunk by chunk and returns its (key, value) pairs as soon as each value
+    is complete, so only one value at a time is held in memory. The values of keys that are not wanted are
+    skipped without being decoded. A top-level array is also accepted and returns (index, value) pairs.
+    A JSON string holding an encoded object (as some debug endpoints return) is also accepted, but has to be
+    buffered whole. Example:
+
+    parser = ObjectItemParser()
+    for chunk in chunks:
+        for key, value in parser.feed(chunk):
+            ...
+    for key, value in parser.close():
+        ...
+    """
+
+    def __init__(self, keys=None):
+        """
+        # Attributes
+        @param array keys - Only return the pairs of these keys (none provided = every pair)
+        """
+        self.keys = None if keys is None else set(keys)
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._encoded = []
+        self._state = "start"
+        self._key = None
+        self._array = False
+        self._index = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._min_len = 0
+
+    def feed(self, chunk):
+        """
+        Feeds the next chunk (bytes or str) and returns the pairs it completed
+
+        # Returns
+        @return array pairs - (key, value)
+        """
+        text = self._utf8.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        if self._state == "encoded":
+            # the encoded object is only complete at the end of the input
+            self._encoded.append(text)
+            return []
+        self._buf += text
+        if len(self._buf) < self._min_len:
+            return []
+        return self._parse(final=False)
+
+    def close(self):
+        """
+        Signals the end of the input and returns the remaining pairs
+        """
+        self._buf += self._utf8.decode(b"", final=True)
+        if self._state == "encoded":
+            inner = json.loads(json.loads(self._buf + "".join(self._encoded)))
+            self._state = "done"
+            items = list(enumerate(inner)) if isinstance(inner, list) else list(inner.items())
+            return [item for item in items if self.keys is None or item[0] in self.keys]
+        items = self._parse(final=True)
+        if self._state != "done":
+            raise Exception("Unexpected end of JSON object")
+        return items
+
+    def _parse(self, final):
+        buf = self._buf
+        pos = 0
+        items = []
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buf) or self._state == "done":
+                break
+            c = buf[pos]
+            if self._state == "start":
+                if c == '"':
+                    self._state = "encoded"
+                    break
+                if c not in "{[":
+                    raise Exception("Expected a JSON object, got {!r}".format(c))
+                self._array = c == "["
+                self._state = "value" if self._array else "key"
+                pos += 1
+            elif self._state == "key":
+                if c == "}":
+                    self._state = "done"
+                    pos += 1
+                    continue
+                try:
+                    self._key, end = self._decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+                self._state = "colon"
+                pos = end
+            elif self._state == "colon":
+                if c != ":":
+                    raise Exception("Expected ':' in JSON object, got {!r}".format(c))
+                self._state = "value" if self.keys is None or self._key in self.keys else "skip"
+                pos += 1
+            elif self._state == "skip":
+                pos = self._skip(buf, pos)
+                if self._state == "skip":
+                    break
+            elif self._state == "value":
+                if self._array and c == "]":
+                    self._state = "done"
+                    pos += 1
+                    continue
+                try:
+                    value, end = self._decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+                if not final and (end >= len(buf) or buf[end] not in _WHITESPACE + ",}]"):
+                    # a number may continue in the next chunk
+                    break
+                if self._array:
+                    # only counted once complete, an element split across chunks is decoded again
+                    self._key = self._index
+                    self._index += 1
+                items.append((self._key, value))
+                self._state = "separator"
+                pos = end
+            elif self._state == "separator":
+                if c == ",":
+                    self._state = "value" if self._array else "key"
+                elif c == ("]" if self._array else "}"):
+                    self._state = "done"
+                else:
+                    raise Exception("Expected ',' or {!r} in JSON {}, got {!r}".format("]" if self._array else "}",
+                        "array" if self._array else "object", c))
+                pos += 1
+        self._buf = buf[pos:]
+        # an incomplete value is only re-scanned once the buffer doubled, keeping large values linear
+        self._min_len = 2 * len(self._buf) if self._state in ("key", "value") and self._buf else 0
+        return items
+
+    def _skip(self, buf, pos):
+        # scans over an unwanted value without decoding it, across as many chunks as it spans
+        end = len(buf)
+        while pos < end:
+            if self._in_string:
+                match = _STRING_STOP.search(buf, pos + 1 if self._escape else pos)
+                self._escape = False
+                if match is None:
+                    return end
+                pos = match.start()
+                if buf[pos] == "\\":
+                    if pos + 1 >= end:
+                        self._escape = True
+                        return end
+                    pos += 2
+                    continue
+                self._in_string = False
+                pos += 1
+                if self._depth == 0:
+                    self._state = "separator"
+                    return pos
+                continue
+            c = buf[pos]
+            if self._depth == 0 and c not in '"[{':
+                # a number, true, false or null
+                while pos < end and buf[pos] not in _WHITESPACE + ",}":
+                    pos += 1
+                if pos < end:
+                    self._state = "separator"
+                return pos
+            if c == '"':
+                self._in_string = True
+                pos += 1
+                continue
+            if c not in "[]{}":
+                pos = _NESTED_RUN.match(buf, pos).end()
+                continue
+            if c in "[{":
+                flat = _FLAT.match(buf, pos)
+                if flat is not None:
+                    pos = flat.end()
+                    if self._depth == 0:
+                        self._state = "separator"
+                        return pos
+                    pos = _NESTED_RUN.match(buf, pos).end()
+                    continue
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._state = "separator"
+                    return pos + 1
+            pos = _NESTED_RUN.match(buf, pos + 1).end()
+        return pos
+
+def iter_object_items(chunks, keys=None):
+    """
+    Lazily yields the (key, value) pairs of a JSON object (or the (index, value) pairs of a JSON array) read
+    from an iterable of chunks, optionally only those of the given keys
+    """
+    parser = ObjectItemParser(keys)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
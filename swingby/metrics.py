@@ -0,0 +1,216 @@
+"""
+This module contains opt-in per-endpoint request metrics for the Swingby transports
+"""
+
+import bisect
+import threading
+from urllib.parse import urlparse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def endpoint_name(endpoint):
+    """
+    Returns the path of an endpoint url (api/v1/status, v1/stakes/leaderboard ...), used as its metrics label
+    """
+    return urlparse(endpoint).path.strip("/")
+
+class EndpointMetrics:
+    """
+    Counters of one (method, endpoint) pair
+    """
+
+    __slots__ = ("requests", "latency_buckets", "latency_sum", "decode_seconds", "bytes_in", "bytes_out", "statuses")
+
+    def __init__(self, buckets):
+        self.requests = 0
+        self.latency_buckets = [0] * (len(buckets) + 1)
+        self.latency_sum = 0.0
+        self.decode_seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses = {}
+
+class Metrics:
+    """
+    Metrics records, per endpoint, a latency histogram, the bytes sent and received, the status codes,
+    the rate limit retries and the time spent decoding JSON apart from the time spent on the network,
+    plus the cache hits per client method.
+    Pass it to HttpTransport or AsyncHttpTransport (and optionally to RateLimitScheduler and ResponseCache).
+    Transports without metrics skip all timing. Example:
+
+    metrics = Metrics()
+    transport = HttpTransport(metrics=metrics, scheduler=RateLimitScheduler(metrics=metrics))
+    node = NodeHttpClient("https://testnet-node.swingby.network", transport.send_get, transport.send_post)
+    node.get_status()
+    print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, callbacks=None, *args, **kwargs):
+        """
+        # Attributes
+        @param array buckets - Upper bounds of the latency histogram buckets, in seconds
+        @param array callbacks - Functions called with a dict for every recorded request
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.callbacks = list(callbacks or [])
+        self.endpoints = {}
+        self.retries = {}
+        self.cache_hits = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """
+        Adds a callback exporter, called with a dict (method, endpoint, status, seconds, decodeSeconds,
+        bytesIn, bytesOut) for every recorded request
+        """
+        self.callbacks.append(callback)
+
+    def _endpoint(self, method, endpoint):
+        key = (method, endpoint_name(endpoint))
+        entry = self.endpoints.get(key)
+        if entry is None:
+            entry = self.endpoints[key] = EndpointMetrics(self.buckets)
+        return entry
+
+    def observe(self, method, endpoint, status, seconds, decode_seconds=0.0, bytes_in=0, bytes_out=0):
+        """
+        Records one request
+
+        # Attributes
+        @param string method - GET or POST
+        @param string endpoint - Url of the request
+        @param integer status - Status code of the response (error if none was received)
+        @param float seconds - Time spent on the network
+        @param float decode_seconds - Time spent decoding the response
+        @param integer bytes_in - Size of the response body
+        @param integer bytes_out - Size of the request body
+        """
+        with self._lock:
+            entry = self._endpoint(method, endpoint)
+            entry.requests += 1
+            entry.latency_buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+            entry.latency_sum += seconds
+            entry.decode_seconds += decode_seconds
+            entry.bytes_in += bytes_in
+            entry.bytes_out += bytes_out
+            entry.statuses[status] = entry.statuses.get(status, 0) + 1
+        if self.callbacks:
+            event = {
+                "method": method,
+                "endpoint": endpoint_name(endpoint),
+                "status": status,
+                "seconds": seconds,
+                "decodeSeconds": decode_seconds,
+                "bytesIn": bytes_in,
+                "bytesOut": bytes_out,
+            }
+            for callback in self.callbacks:
+                callback(event)
+
+    def retry(self, endpoint):
+        """
+        Records a rate limited request being retried
+        """
+        name = endpoint_name(endpoint)
+        with self._lock:
+            self.retries[name] = self.retries.get(name, 0) + 1
+
+    def cache_hit(self, name):
+        """
+        Records a response served by a ResponseCache, by client method name
+        """
+        with self._lock:
+            self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+
+    def percentile(self, method, endpoint, percentile):
+        """
+        Estimates a latency percentile of an endpoint from its histogram (upper bound of the matching bucket)
+
+        # Returns
+        @return float seconds - None if the endpoint has no requests
+        """
+        entry = self.endpoints.get((method, endpoint_name(endpoint)))
+        if entry is None or entry.requests == 0:
+            return None
+        rank = entry.requests * percentile / 100.0
+        seen = 0
+        for bound, count in zip(self.buckets, entry.latency_buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """
+        Get a copy of all the counters
+
+        # Returns
+        @return dict snapshot
+        @return dict snapshot.endpoints["METHOD endpoint"] - requests, latencySum, latencyBuckets, decodeSeconds, bytesIn, bytesOut, statuses
+        @return dict snapshot.retries - Rate limit retries by endpoint
+        @return dict snapshot.cacheHits - Cache hits by client method name
+        """
+        with self._lock:
+            endpoints = {}
+            for (method, endpoint), entry in self.endpoints.items():
+                endpoints["{} {}".format(method, endpoint)] = {
+                    "requests": entry.requests,
+                    "latencySum": entry.latency_sum,
+                    "latencyBuckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], entry.latency_buckets)),
+                    "decodeSeconds": entry.decode_seconds,
+                    "bytesIn": entry.bytes_in,
+                    "bytesOut": entry.bytes_out,
+                    "statuses": { str(k): v for k, v in entry.statuses.items() },
+                }
+            return { "endpoints": endpoints, "retries": dict(self.retries), "cacheHits": dict(self.cache_hits) }
+
+    def to_prometheus(self, prefix="swingby"):
+        """
+        Renders all the counters in the Prometheus text exposition format
+
+        # Returns
+        @return string text
+        """
+        lines = []
+        with self._lock:
+            def metric(name, kind, help_text):
+                lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+                lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+
+            metric("request_duration_seconds", "histogram", "Time spent on the network per request")
+            for (method, endpoint), entry in self.endpoints.items():
+                labels = 'method="{}",endpoint="{}"'.format(method, endpoint)
+                seen = 0
+                for bound, count in zip([str(b) for b in self.buckets] + ["+Inf"], entry.latency_buckets):
+                    seen += count
+                    lines.append('{}_request_duration_seconds_bucket{{{},le="{}"}} {}'.format(prefix, labels, bound, seen))
+                lines.append("{}_request_duration_seconds_sum{{{}}} {}".format(prefix, labels, entry.latency_sum))
+                lines.append("{}_request_duration_seconds_count{{{}}} {}".format(prefix, labels, entry.requests))
+            for name, attr, kind, help_text in (
+                ("decode_seconds_total", "decode_seconds", "counter", "Time spent decoding JSON responses"),
+                ("response_bytes_total", "bytes_in", "counter", "Bytes received in response bodies"),
+                ("request_bytes_total", "bytes_out", "counter", "Bytes sent in request bodies"),
+            ):
+                metric(name, kind, help_text)
+                for (method, endpoint), entry in self.endpoints.items():
+                    lines.append('{}_{}{{method="{}",endpoint="{}"}} {}'.format(prefix, name, method, endpoint, getattr(entry, attr)))
+            metric("responses_total", "counter", "Responses by status code")
+            for (method, endpoint), entry in self.endpoints.items():
+                for status, count in entry.statuses.items():
+                    lines.append('{}_responses_total{{method="{}",endpoint="{}",status="{}"}} {}'.format(prefix, method, endpoint, status, count))
+            metric("retries_total", "counter", "Rate limited requests that were retried")
+            for endpoint, count in self.retries.items():
+                lines.append('{}_retries_total{{endpoint="{}"}} {}'.format(prefix, endpoint, count))
+            metric("cache_hits_total", "counter", "Responses served by a ResponseCache")
+            for name, count in self.cache_hits.items():
+                lines.append('{}_cache_hits_total{{function="{}"}} {}'.format(prefix, name, count))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """
+        Clears all the counters
+        """
+        with self._lock:
+            self.endpoints = {}
+            self.retries = {}
+            self.cache_hits = {}
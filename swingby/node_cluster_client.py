@@ -0,0 +1,280 @@
+"""
+This module contains a NodeHttpClient that spreads requests over several Swingby nodes
+"""
+
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .node_http_client import NodeHttpClient
+from .utils import default_send_get, default_send_post, stream_func_for
+
+def default_peer_url(peer):
+    """
+    Maps an entry returned by get_peers to the REST url of that node, or None if it has none
+    """
+    if isinstance(peer, str):
+        return peer if peer.startswith("http") else None
+    for key in ("url", "restUrl", "restUri", "rpcUri"):
+        if peer.get(key):
+            return peer[key].rstrip("/")
+    return None
+
+class NodeStats:
+    """
+    Running latency and error statistics of one node
+    """
+
+    def __init__(self, url, alpha=0.2, window=100):
+        self.url = url
+        self.alpha = alpha
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.last_error = 0.0
+        self.samples = collections.deque(maxlen=window)
+
+    def record(self, latency, ok):
+        self.requests += 1
+        self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+        self.error_rate = (1 - self.alpha) * self.error_rate + (0 if ok else self.alpha)
+        if ok:
+            self.samples.append(latency)
+        else:
+            self.errors += 1
+            self.last_error = time.monotonic()
+
+    def percentile(self, p):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+class _PinnedSwap(NodeHttpClient):
+    """
+    One swap of a NodeClusterClient: calculate_swap fails over across the cluster and create_swap is sent to
+    the node that answered it
+    """
+
+    def __init__(self, cluster):
+        super().__init__(cluster.url, cluster.send_get, cluster.send_post)
+        self.cluster = cluster
+        self.node = None
+
+    def calculate_swap(self, *args, **kwargs):
+        self.node, calc = self.cluster._calculate(*args, **kwargs)
+        return calc
+
+    def create_swap(self, *args, **kwargs):
+        return self.cluster._create(self.node, *args, **kwargs)
+
+class NodeClusterClient(NodeHttpClient):
+    """
+    NodeClusterClient exposes the NodeHttpClient methods over several nodes. Reads go to the fastest healthy node
+    (by EWMA latency and error rate), a duplicate request is sent to the next node each time the last one sent
+    takes longer than that node's latency percentile, and failed reads fail over to the other nodes. create_swap
+    is pinned to the node that answered calculate_swap. Close the cluster (or use it as a context manager) to
+    stop its worker threads. Example:
+
+    with NodeClusterClient(["https://testnet-node.swingby.network", "https://testnet-node-2.swingby.network"]) as cluster:
+        cluster.discover()
+        status = cluster.get_status()
+    """
+
+    def __init__(self, urls, sendGetRequestFunc=default_send_get, sendPostRequestFunc=default_send_post,
+        sendStreamRequestFunc=None, hedge_percentile=95, hedge_delay=1.0, max_error_rate=0.5, cooldown=30, alpha=0.2,
+        max_workers=16, *args, **kwargs):
+        """
+        # Attributes
+        @param array urls - Node urls
+        @param function sendStreamRequestFunc - Stream request function (none provided = send_stream of their transport)
+        @param integer hedge_percentile - Latency percentile after which a read is duplicated to the next node
+        @param float hedge_delay - Seconds after which a read is duplicated while a node has no latency samples
+        @param float max_error_rate - EWMA error rate above which a node is considered unhealthy
+        @param float cooldown - Seconds after its last error before an unhealthy node is tried again
+        @param float alpha - EWMA smoothing factor
+        @param integer max_workers - Max number of reads in flight across the cluster
+        """
+        if not urls:
+            raise Exception("NodeClusterClient requires at least one node url.")
+        super().__init__(urls[0], self._routed_get, self._routed_post, self._routed_stream)
+        self.send_get = sendGetRequestFunc
+        self.send_post = sendPostRequestFunc
+        self.send_stream = sendStreamRequestFunc or stream_func_for(sendGetRequestFunc, sendPostRequestFunc)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.nodes = collections.OrderedDict()
+        self._pins = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        for url in urls:
+            self.add_node(url)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker threads, reads still in flight (e.g. the losers of a hedge) complete in the background
+        """
+        self._executor.shutdown(wait=False)
+
+    def _url(self, path):
+        return path.lstrip("/")
+
+    def add_node(self, url):
+        """
+        Adds a node to the cluster
+
+        # Attributes
+        @param string url - Node url
+        """
+        url = url.rstrip("/")
+        with self._lock:
+            if url not in self.nodes:
+                self.nodes[url] = NodeStats(url, alpha=self.alpha)
+
+    def remove_node(self, url):
+        """
+        Removes a node from the cluster
+
+        # Attributes
+        @param string url - Node url
+        """
+        with self._lock:
+            self.nodes.pop(url.rstrip("/"), None)
+
+    def discover(self, node_type="normal", peer_url=default_peer_url):
+        """
+        Adds the peers of the cluster's nodes to the cluster
+
+        # Attributes
+        @param string node_type - node type (signer | default: normal)
+        @param function peer_url - Maps a get_peers entry to a node url (or None to skip it)
+
+        # Returns
+        @return array urls - Urls of all nodes in the cluster
+        """
+        for peer in self.get_peers(node_type) or []:
+            url = peer_url(peer)
+            if url:
+                self.add_node(url)
+        return list(self.nodes)
+
+    def ranked_nodes(self):
+        """
+        Returns the nodes ordered from best to worst. Unhealthy nodes still in their cooldown come last.
+        """
+        now = time.monotonic()
+        with self._lock:
+            nodes = list(self.nodes.values())
+        if not nodes:
+            raise Exception("NodeClusterClient has no nodes.")
+        def score(node):
+            unhealthy = node.error_rate > self.max_error_rate and now - node.last_error < self.cooldown
+            return (unhealthy, node.latency or 0.0, node.error_rate)
+        return sorted(nodes, key=score)
+
+    def _timed(self, node, fn, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            res = fn(*args, **kwargs)
+        except Exception:
+            node.record(time.monotonic() - start, False)
+            raise
+        node.record(time.monotonic() - start, True)
+        return res
+
+    def _routed_get(self, path, query={}, json=True):
+        nodes = self.ranked_nodes()
+        error = None
+        i = 0
+        pending = set()
+        while i < len(nodes) or pending:
+            if i < len(nodes):
+                # the first read, or the next best node once the reads in flight are slow or failed
+                node = nodes[i]
+                i += 1
+                pending.add(self._executor.submit(self._timed, node, self.send_get,
+                    "{}/{}".format(node.url, path), query=query, json=json))
+                delay = node.percentile(self.hedge_percentile)
+                timeout = self.hedge_delay if delay is None else delay
+            done, pending = wait(pending, timeout=timeout if i < len(nodes) else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _routed_post(self, path, query={}, body={}):
+        node = self.ranked_nodes()[0]
+        return self._timed(node, self.send_post, "{}/{}".format(node.url, path), query=query, body=body)
+
+    def _routed_stream(self, path, query={}, chunk_size=65536):
+        node = self.ranked_nodes()[0]
+        return self.send_stream("{}/{}".format(node.url, path), query=query, chunk_size=chunk_size)
+
+    def _pin_key(self, address_to, currency_from, currency_to, nonce):
+        return (address_to, currency_from, currency_to, nonce)
+
+    def _calculate(self, address_to, amount, currency_from, currency_to, **kwargs):
+        # calculate_swap on the best node that answers, returns that node with the calculation
+        error = None
+        for node in self.ranked_nodes():
+            client = NodeHttpClient(node.url, self.send_get, self.send_post)
+            try:
+                return node, self._timed(node, client.calculate_swap, address_to, amount, currency_from, currency_to, **kwargs)
+            except Exception as e:
+                error = e
+        raise error
+
+    def _create(self, node, address_to, amount, currency_from, currency_to, nonce, **kwargs):
+        if node is None or node.url not in self.nodes:
+            node = self.ranked_nodes()[0]
+        client = NodeHttpClient(node.url, self.send_get, self.send_post)
+        return self._timed(node, client.create_swap, address_to, amount, currency_from, currency_to, nonce, **kwargs)
+
+    def calculate_swap(self, address_to, amount, currency_from, currency_to, **kwargs):
+        node, calc = self._calculate(address_to, amount, currency_from, currency_to, **kwargs)
+        with self._lock:
+            self._pins[self._pin_key(address_to, currency_from, currency_to, calc.get('nonce'))] = node.url
+            while len(self._pins) > 10000:
+                self._pins.popitem(last=False)
+        return calc
+    calculate_swap.__doc__ = NodeHttpClient.calculate_swap.__doc__
+
+    def create_swap(self, address_to, amount, currency_from, currency_to, nonce, **kwargs):
+        with self._lock:
+            url = self._pins.pop(self._pin_key(address_to, currency_from, currency_to, nonce), None)
+        node = self.nodes.get(url) if url else None
+        return self._create(node, address_to, amount, currency_from, currency_to, nonce, **kwargs)
+    create_swap.__doc__ = NodeHttpClient.create_swap.__doc__
+
+    def swap(self, address_to, amount, currency_from, currency_to, pow_solver=None, **kwargs):
+        # every swap carries its own pin, so concurrent swaps of the same address and pair (and locally
+        # solved nonces the node never saw) still create on the node that calculated them
+        return _PinnedSwap(self).swap(address_to, amount, currency_from, currency_to, pow_solver=pow_solver, **kwargs)
+    swap.__doc__ = NodeHttpClient.swap.__doc__
+
+    def stats(self):
+        """
+        Get the per node statistics
+
+        # Returns
+        @return array nodes
+        @return string nodes[n].url
+        @return float nodes[n].latency - EWMA latency in seconds
+        @return float nodes[n].errorRate - EWMA error rate
+        @return integer nodes[n].requests
+        @return integer nodes[n].errors
+        """
+        return [{ "url": n.url, "latency": n.latency, "errorRate": n.error_rate, "requests": n.requests,
+            "errors": n.errors } for n in self.ranked_nodes()]
@@ -4,8 +4,11 @@ This module contains classes for interacting with the Swingby network via REST
 
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-from .utils import default_send_get, default_send_post
+from .utils import default_send_get, default_send_post, stream_func_for
+from .pagination import iter_pages
+from .json_stream import iter_object_items
 
 class NodeHttpClient:
     """
@@ -15,10 +18,12 @@ class NodeHttpClient:
     node = NodeHttpClient("https://testnet-node.swingby.network")
     """
 
-    def __init__(self, url, sendGetRequestFunc=default_send_get, sendPostRequestFunc=default_send_post, *args, **kwargs):
+    def __init__(self, url, sendGetRequestFunc=default_send_get, sendPostRequestFunc=default_send_post,
+        sendStreamRequestFunc=None, *args, **kwargs):
         self.url = url
         self.get = sendGetRequestFunc
         self.post = sendPostRequestFunc
+        self.stream = sendStreamRequestFunc or stream_func_for(sendGetRequestFunc, sendPostRequestFunc)
 
     def _url(self, path):
         return "{}/{}".format(self.url, path)
@@ -168,15 +173,17 @@ class NodeHttpClient:
         }
         return self.post(self._url("api/v1/swaps/create"), query={}, body=body)
 
-    def swap(self, address_to, amount, currency_from, currency_to, **kwargs):
+    def swap(self, address_to, amount, currency_from, currency_to, pow_solver=None, **kwargs):
         """
-        Calculates PoW and creates a swap record
+        Calculates PoW and creates a swap record. With a pow_solver the nonce is found locally while the
+        fee calculation is fetched from the node in parallel.
 
         # Attributes
         @param address_to - Payout address
         @param amount - Amount of funds to swap
         @param currency_from - Currency from (BTC, BNB ...)
         @param currency_to - Currency to (BTC, BNB ...)
+        @param PowSolver pow_solver - Local nonce solver (none provided = use the nonce from calculate_swap)
 
         # Returns
         @return dict swap
@@ -188,10 +195,44 @@ class NodeHttpClient:
         @return integer swap.timestamp
         @return dict swap.calc - response from calculate_swap
         """
-        calc = self.calculate_swap(address_to, amount, currency_from, currency_to, **kwargs)
-        swap = self.create_swap(address_to, calc['send_amount'], currency_from, currency_to, calc['nonce'], **kwargs)
+        if pow_solver is None:
+            calc = self.calculate_swap(address_to, amount, currency_from, currency_to, **kwargs)
+            nonce = calc['nonce']
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = executor.submit(self.calculate_swap, address_to, amount, currency_from, currency_to, **kwargs)
+                nonce = pow_solver.solve(address_to, amount, currency_from, currency_to)
+                calc = pending.result()
+            # the nonce is solved over the exact amount string create_swap sends, "1" and "1.00000000" hash differently
+            if str(calc['send_amount']) != str(amount):
+                nonce = pow_solver.solve(address_to, calc['send_amount'], currency_from, currency_to)
+        swap = self.create_swap(address_to, calc['send_amount'], currency_from, currency_to, nonce, **kwargs)
         return { **swap, "calc": calc }
 
+    def swap_many(self, swaps, max_workers=8, pow_solver=None):
+        """
+        Creates many swaps concurrently. Each swap's create_swap is sent as soon as its own calculate_swap
+        returns, with at most max_workers swaps in flight. A failed swap does not abort the batch.
+
+        # Attributes
+        @param array swaps - Keyword arguments of each swap (address_to, amount, currency_from, currency_to ...)
+        @param integer max_workers - Max number of swaps in flight
+        @param PowSolver pow_solver - Local nonce solver (none provided = use the nonce from calculate_swap)
+
+        # Returns
+        @return array results - In the same order as swaps
+        @return dict results[n].swap - response from swap (None if it failed)
+        @return Exception results[n].error - Why the swap failed (None if it succeeded)
+        """
+        def create(kwargs):
+            try:
+                return { "swap": self.swap(pow_solver=pow_solver, **kwargs), "error": None }
+            except Exception as e:
+                return { "swap": None, "error": e }
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(create, swaps))
+
     def get_swap_fees(self):
         """
         Get the fees for performing a swap
@@ -259,6 +300,23 @@ class NodeHttpClient:
             params["OR_out_hash"] = OR_out_hash
         return self.get(self._url("api/v1/swaps/query"), query=params)
 
+    def iter_swaps(self, page_size=100, prefetch=4, **kwargs):
+        """
+        Lazily yields every swap matching the query. After the first page reveals the total, the remaining
+        pages are fetched concurrently, at most `prefetch` pages ahead, and yielded in page order.
+        Pass sort=1 (old - new) for a stable walk while new swaps are being created.
+
+        # Attributes
+        @param integer page_size - Number of swaps per request
+        @param integer prefetch - Max number of pages fetched ahead of the consumer
+        @param kwargs - Any query_swaps filter (status, in_address, from_chain, sort ...)
+
+        # Returns
+        @return iterator swaps
+        """
+        fetch_page = lambda page: self.query_swaps(page_size=page_size, page=page, **kwargs)
+        return iter_pages(fetch_page, page_size, first_page=0, prefetch=prefetch)
+
     def get_swap_stats(self):
         """
         Get performance statistics
@@ -295,5 +353,49 @@ class NodeHttpClient:
         # Returns
         @return dict kvstore
         """
-        kv_store = self.get(self._url("/api/v1/debug/kvstore"))
-        return json.loads(kv_store)
+        kv_store = self.get(self._url("api/v1/debug/kvstore"))
+        if isinstance(kv_store, str):
+            kv_store = json.loads(kv_store)
+        return kv_store
+
+    def iter_kv_store(self, prefix=None, chunk_size=65536):
+        """
+        Streams the nodes kv store, yielding its entries as they are read so memory stays constant however
+        large the store is. Only availbale if the node is in testnet mode. Example:
+
+        for key, value in node.iter_kv_store(prefix="swap/"):
+            print(key)
+
+        # Attributes
+        @param string prefix - Only yield the keys starting with this prefix
+        @param integer chunk_size - Bytes read from the response at a time
+
+        # Returns
+        @return iterator entries - (key, value)
+        """
+        for key, value in iter_object_items(self.stream(self._url("api/v1/debug/kvstore"), chunk_size=chunk_size)):
+            if prefix is None or key.startswith(prefix):
+                yield key, value
+
+    def dump_kv_store(self, path_or_file, prefix=None, chunk_size=65536):
+        """
+        Streams the nodes kv store into a JSON file without holding the store in memory
+
+        # Attributes
+        @param string path_or_file - Path of the file to write, or a writable text file
+        @param string prefix - Only write the keys starting with this prefix
+        @param integer chunk_size - Bytes read from the response at a time
+
+        # Returns
+        @return integer count - Number of entries written
+        """
+        if isinstance(path_or_file, str):
+            with open(path_or_file, "w") as f:
+                return self.dump_kv_store(f, prefix, chunk_size)
+        count = 0
+        path_or_file.write("{")
+        for key, value in self.iter_kv_store(prefix, chunk_size):
+            path_or_file.write("{}\n{}: {}".format("," if count else "", json.dumps(key), json.dumps(value)))
+            count += 1
+        path_or_file.write("\n}\n")
+        return count
@@ -0,0 +1,93 @@
+"""
+This module contains helpers for walking paginated Swingby endpoints
+"""
+
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+def page_count(first, page_size):
+    """
+    Number of pages of a paginated endpoint, from the `total` of its first page
+    """
+    total = first.get('total') or 0
+    return max(1, -(-total // page_size))
+
+def iter_pages(fetch_page, page_size, first_page=0, prefetch=4, start_page=None):
+    """
+    Lazily yields the items of a paginated endpoint. The first page is fetched on its own to learn `total`,
+    then the remaining pages are fetched concurrently, at most `prefetch` pages ahead of the consumer.
+    Items are yielded in page order.
+
+    # Attributes
+    @param function fetch_page - Called with a page number, returns a dict with `items` and `total`
+    @param integer page_size - Number of items per page requested by fetch_page
+    @param integer first_page - Number of the first page (0 or 1 depending on the endpoint)
+    @param integer prefetch - Max number of pages fetched ahead of the consumer
+    @param integer start_page - Page to start from (none provided = first_page)
+
+    # Returns
+    @return iterator items
+    """
+    start_page = first_page if start_page is None else start_page
+    first = fetch_page(start_page)
+    for item in first['items'] or []:
+        yield item
+    pages = range(start_page + 1, first_page + page_count(first, page_size))
+    if not pages:
+        return
+    pages = iter(pages)
+    window = collections.deque()
+    executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    try:
+        for page in pages:
+            window.append(executor.submit(fetch_page, page))
+            if len(window) >= prefetch:
+                break
+        while window:
+            res = window.popleft().result()
+            page = next(pages, None)
+            if page is not None:
+                window.append(executor.submit(fetch_page, page))
+            for item in res['items'] or []:
+                yield item
+    finally:
+        for future in window:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+async def aiter_pages(fetch_page, page_size, first_page=0, prefetch=4, start_page=None):
+    """
+    Async counterpart of iter_pages, fetch_page must be a coroutine function.
+
+    # Attributes
+    @param function fetch_page - Called with a page number, returns a dict with `items` and `total`
+    @param integer page_size - Number of items per page requested by fetch_page
+    @param integer first_page - Number of the first page (0 or 1 depending on the endpoint)
+    @param integer prefetch - Max number of pages fetched ahead of the consumer
+    @param integer start_page - Page to start from (none provided = first_page)
+
+    # Returns
+    @return async iterator items
+    """
+    start_page = first_page if start_page is None else start_page
+    first = await fetch_page(start_page)
+    for item in first['items'] or []:
+        yield item
+    pages = iter(range(start_page + 1, first_page + page_count(first, page_size)))
+    window = collections.deque()
+    try:
+        for page in pages:
+            window.append(asyncio.ensure_future(fetch_page(page)))
+            if len(window) >= prefetch:
+                break
+        while window:
+            res = await window.popleft()
+            page = next(pages, None)
+            if page is not None:
+                window.append(asyncio.ensure_future(fetch_page(page)))
+            for item in res['items'] or []:
+                yield item
+    finally:
+        for task in window:
+            task.cancel()
@@ -0,0 +1,204 @@
+"""
+This module contains a streaming computation of the weekly staking rewards payout
+"""
+
+from decimal import Decimal, ROUND_DOWN
+
+from .records import to_decimal
+
+BASES = ("quantity", "percentage")
+
+class PayoutPipeline:
+    """
+    PayoutPipeline computes the staking rewards payout of a weekly memo locally, instead of downloading the whole
+    get_payout transaction. The holders and stakes are streamed, every holder's share of the reward pool is
+    computed with exact Decimals as it is read, and the payout transactions are emitted in batches of batch_size,
+    so memory stays constant however many holders there are. Shares are rounded down to the precision, the
+    undistributed dust is reported as the remainder. Once every batch is consumed, cross_check compares the
+    totals with the estimatedPayout of the staking API.
+
+    The reward pool is assumed to be the sum of the reward_amount of the memo's stakes, shared among the holders
+    by quantity (or percentage). The staking API does not document how get_payout computes its amounts, pass
+    the pool to batches when it is known, and treat a cross_check mismatch as a sign that this assumption does
+    not hold. Example:
+
+    pipeline = PayoutPipeline(StakesHttpClient(None), memo="1234", batch_size=500)
+    for batch in pipeline.batches():
+        sign_and_send(batch)
+    print(pipeline.cross_check())
+    """
+
+    def __init__(self, stakes, memo=None, batch_size=100, precision=8, basis="quantity", min_amount=None,
+        chunk_size=65536, *args, **kwargs):
+        """
+        # Attributes
+        @param StakesHttpClient stakes - Client the holders, stakes and payout summary are streamed from
+        @param string memo - Weekly memo (none provided = current_memo, resolved once)
+        @param integer batch_size - Max number of transactions per batch
+        @param integer precision - Decimal places of the paid amounts (8 = satoshis)
+        @param string basis - Share of a holder: quantity (exact, reads the holders twice) | percentage (one pass)
+        @param string min_amount - Holders whose share is below this amount are not paid (none provided = above 0)
+        @param integer chunk_size - Bytes read from the responses at a time
+        """
+        if basis not in BASES:
+            raise Exception("Invalid basis {}, expected one of {}".format(basis, ", ".join(BASES)))
+        if batch_size < 1:
+            raise Exception("Invalid batch size {}".format(batch_size))
+        self.stakes = stakes
+        self.memo = memo
+        self.batch_size = batch_size
+        self.quantum = Decimal(1).scaleb(-precision)
+        self.basis = basis
+        self.min_amount = to_decimal(min_amount)
+        self.chunk_size = chunk_size
+        self.summary = None
+
+    def _memo(self):
+        if not self.memo:
+            self.memo = self.stakes.get_weekly_memo()
+        return self.memo
+
+    def reward_pool(self):
+        """
+        Sums the reward_amount of every stake of the memo
+
+        # Returns
+        @return Decimal pool
+        """
+        pool = Decimal(0)
+        for stake in self.stakes.iter_stakes(memo=self._memo(), chunk_size=self.chunk_size):
+            pool += to_decimal(stake.get('reward_amount')) or 0
+        return pool
+
+    def total_quantity(self):
+        """
+        Sums the token quantity of every holder of the memo
+
+        # Returns
+        @return Decimal quantity
+        """
+        total = Decimal(0)
+        for _, holder in self.stakes.iter_holders(memo=self._memo(), chunk_size=self.chunk_size):
+            total += to_decimal(holder.get('quantity')) or 0
+        return total
+
+    def holder_payouts(self, pool=None):
+        """
+        Lazily yields the share of the reward pool of every holder, in the order of get_holders
+
+        # Attributes
+        @param string pool - Reward pool to distribute (none provided = reward_pool)
+
+        # Returns
+        @return iterator payouts - (address, Decimal amount), amounts rounded down to the precision
+        """
+        pool = self.reward_pool() if pool is None else to_decimal(pool)
+        if pool is None:
+            raise Exception("Invalid reward pool")
+        key, divisor = ('quantity', self.total_quantity()) if self.basis == "quantity" else ('percentage', 100)
+        if not divisor:
+            return
+        for address, holder in self.stakes.iter_holders(memo=self._memo(), chunk_size=self.chunk_size):
+            share = to_decimal(holder.get(key)) or Decimal(0)
+            amount = (share * pool / divisor).quantize(self.quantum, rounding=ROUND_DOWN)
+            if amount > 0 and (self.min_amount is None or amount >= self.min_amount):
+                yield address, amount
+
+    def stake_payouts(self):
+        """
+        Lazily yields the reward_amount of every stake of the memo, as computed by the staking API
+
+        # Returns
+        @return iterator payouts - (address, Decimal amount)
+        """
+        for stake in self.stakes.iter_stakes(memo=self._memo(), chunk_size=self.chunk_size):
+            amount = to_decimal(stake.get('reward_amount'))
+            if amount and amount > 0 and (self.min_amount is None or amount >= self.min_amount):
+                yield stake['address'], amount.quantize(self.quantum, rounding=ROUND_DOWN)
+
+    def batches(self, payouts=None, pool=None):
+        """
+        Lazily yields the payout transactions in batches. The running totals are kept in summary, which is
+        complete once the last batch is consumed.
+
+        # Attributes
+        @param iterable payouts - (address, amount) pairs (none provided = holder_payouts)
+        @param string pool - Reward pool of holder_payouts (none provided = reward_pool)
+
+        # Returns
+        @return iterator batches - arrays of at most batch_size { address, amount } transactions
+        """
+        if payouts is None:
+            pool = self.reward_pool() if pool is None else to_decimal(pool)
+            payouts = self.holder_payouts(pool)
+        self.summary = summary = { "memo": self.memo, "pool": pool, "total": Decimal(0), "transactions": 0,
+            "batches": 0, "complete": False }
+        batch = []
+        for address, amount in payouts:
+            batch.append({ "address": address, "amount": amount })
+            summary['total'] += amount
+            summary['transactions'] += 1
+            if len(batch) >= self.batch_size:
+                summary['batches'] += 1
+                yield batch
+                batch = []
+        if batch:
+            summary['batches'] += 1
+            yield batch
+        summary['memo'] = self.memo
+        summary['complete'] = True
+
+    def run(self, callback=None, payouts=None, pool=None):
+        """
+        Consumes every batch, passing each one to the callback, then cross checks the totals
+
+        # Returns
+        @return dict check - see cross_check
+        """
+        for batch in self.batches(payouts, pool):
+            if callback is not None:
+                callback(batch)
+        return self.cross_check()
+
+    def cross_check(self, estimated=None, tolerance=None):
+        """
+        Compares the totals of the consumed batches with the estimatedPayout of the staking API
+
+        # Attributes
+        @param string estimated - Expected total (none provided = estimatedPayout of get_payout_summary)
+        @param string tolerance - Max absolute difference (none provided = one quantum per transaction)
+
+        # Returns
+        @return dict check
+        @return Decimal check.total - Sum of the paid amounts
+        @return integer check.transactions
+        @return integer check.batches
+        @return Decimal check.remainder - Pool left undistributed by the rounding (None without a pool)
+        @return Decimal check.estimatedPayout
+        @return integer check.totalTransactions - As reported by the staking API (None if unknown)
+        @return Decimal check.difference - total - estimatedPayout
+        @return boolean check.matches
+        """
+        summary = self.summary
+        if summary is None or not summary['complete']:
+            raise Exception("Consume every batch before cross checking the payout")
+        total_transactions = None
+        if estimated is None:
+            res = self.stakes.get_payout_summary(memo=self._memo(), chunk_size=self.chunk_size)
+            estimated, total_transactions = res.get('estimatedPayout'), res.get('totalTransactions')
+        estimated = to_decimal(estimated)
+        if estimated is None:
+            raise Exception("No estimated payout to cross check against for memo {}".format(self.memo))
+        tolerance = self.quantum * max(summary['transactions'], 1) if tolerance is None else to_decimal(tolerance)
+        difference = summary['total'] - estimated
+        return {
+            "memo": self.memo,
+            "total": summary['total'],
+            "transactions": summary['transactions'],
+            "batches": summary['batches'],
+            "remainder": None if summary['pool'] is None else summary['pool'] - summary['total'],
+            "estimatedPayout": estimated,
+            "totalTransactions": total_transactions,
+            "difference": difference,
+            "matches": abs(difference) <= tolerance,
+        }
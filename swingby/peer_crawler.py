@@ -0,0 +1,269 @@
+"""
+This module contains a concurrent crawler of the Swingby peer graph
+"""
+
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .node_http_client import NodeHttpClient
+from .node_cluster_client import default_peer_url
+from .utils import default_send_get
+
+NODE_TYPES = ("normal", "signer")
+
+_ID_KEYS = ("id", "nodeId", "p2pId")
+
+def default_node_id(status):
+    """
+    Returns the identity of a node from its get_status response, or None if it reports none
+    """
+    info = (status or {}).get('nodeInfo') or {}
+    for key in _ID_KEYS:
+        if info.get(key):
+            return str(info[key])
+    return None
+
+def _peer_id(peer, url):
+    if isinstance(peer, dict):
+        for key in _ID_KEYS:
+            if peer.get(key):
+                return str(peer[key])
+    return url
+
+class TopologySnapshot:
+    """
+    The peer graph found by one PeerCrawler run. Nodes are keyed by identity, the adjacency maps every
+    crawled node to the identities of its peers. Snapshots can be saved with to_dict and diffed run over run.
+    """
+
+    __slots__ = ("taken_at", "nodes", "adjacency")
+
+    def __init__(self, nodes, adjacency, taken_at=None):
+        """
+        # Attributes
+        @param dict nodes - Node info by identity (url, moniker, version, latency, types, reachable, error, depth)
+        @param dict adjacency - Sorted peer identities by identity
+        @param float taken_at - Epoch seconds of the crawl (none provided = now)
+        """
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.nodes = nodes
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['nodes'], d['adjacency'], d.get('takenAt'))
+
+    def to_dict(self):
+        """
+        JSON serializable form of the snapshot
+        """
+        return { "takenAt": self.taken_at, "nodes": self.nodes, "adjacency": self.adjacency }
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def edges(self):
+        """
+        Every (node, peer) pair, each undirected edge once
+        """
+        return set(tuple(sorted((a, b))) for a, peers in self.adjacency.items() for b in peers if a != b)
+
+    def fastest(self, n=5, node_type=None):
+        """
+        The reachable nodes with the lowest get_status latency
+
+        # Attributes
+        @param integer n - Number of nodes
+        @param string node_type - Only nodes listed as this type by their peers (signer | normal)
+
+        # Returns
+        @return array nodes - Node infos, fastest first
+        """
+        nodes = [node for node in self.nodes.values() if node['reachable'] and node['latency'] is not None
+            and (node_type is None or node_type in node['types'])]
+        return sorted(nodes, key=lambda node: node['latency'])[:n]
+
+    def diff(self, previous, fields=("url", "version", "reachable", "types")):
+        """
+        Changes since a previous snapshot
+
+        # Attributes
+        @param TopologySnapshot previous - Earlier snapshot (or its to_dict form)
+        @param array fields - Node fields compared between the snapshots
+
+        # Returns
+        @return dict diff
+        @return array diff.added - Identities of the new nodes
+        @return array diff.removed - Identities of the nodes gone
+        @return dict diff.changed[identity][field] - (old value, new value)
+        @return array diff.edgesAdded - New (node, peer) pairs
+        @return array diff.edgesRemoved - Vanished (node, peer) pairs
+        """
+        if isinstance(previous, dict):
+            previous = TopologySnapshot.from_dict(previous)
+        changed = {}
+        for identity in set(self.nodes) & set(previous.nodes):
+            now, before = self.nodes[identity], previous.nodes[identity]
+            fields_changed = { f: (before.get(f), now.get(f)) for f in fields if before.get(f) != now.get(f) }
+            if fields_changed:
+                changed[identity] = fields_changed
+        edges, previous_edges = self.edges(), previous.edges()
+        return {
+            "added": sorted(set(self.nodes) - set(previous.nodes)),
+            "removed": sorted(set(previous.nodes) - set(self.nodes)),
+            "changed": changed,
+            "edgesAdded": sorted(edges - previous_edges),
+            "edgesRemoved": sorted(previous_edges - edges),
+        }
+
+class PeerCrawler:
+    """
+    PeerCrawler walks the peer graph breadth first from a few seed nodes. Every reachable node is asked for its
+    status (timed, for its latency and version) and for its normal and signer peers, with at most max_workers
+    nodes queried at once. Nodes are deduplicated by the identity reported in their status (or by the id
+    their peers list them with), so a node reached through several urls is crawled once. Example:
+
+    crawler = PeerCrawler(["https://testnet-node.swingby.network"])
+    snapshot = crawler.crawl()
+    signers = snapshot.fastest(5, node_type="signer")
+    print(snapshot.diff(previous_snapshot))
+    """
+
+    def __init__(self, seeds, sendGetRequestFunc=default_send_get, node_types=NODE_TYPES, max_workers=16,
+        max_nodes=1000, max_depth=None, peer_url=default_peer_url, node_id=default_node_id, *args, **kwargs):
+        """
+        # Attributes
+        @param array seeds - Urls of the nodes to start from
+        @param function sendGetRequestFunc - Get request function shared by every node client
+        @param array node_types - Peer lists to follow (signer | normal)
+        @param integer max_workers - Max number of nodes queried at once
+        @param integer max_nodes - Max number of urls crawled
+        @param integer max_depth - Max number of hops from the seeds (none provided = unbounded)
+        @param function peer_url - Maps a get_peers entry to a node url (or None if it has none)
+        @param function node_id - Maps a get_status response to a node identity (or None if it has none)
+        """
+        self.seeds = [url.rstrip("/") for url in seeds]
+        self.get = sendGetRequestFunc
+        self.node_types = tuple(node_types)
+        self.max_workers = max_workers
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.peer_url = peer_url
+        self.node_id = node_id
+
+    def _visit(self, url):
+        client = NodeHttpClient(url, self.get)
+        start = time.perf_counter()
+        status = client.get_status()
+        latency = time.perf_counter() - start
+        peers = {}
+        for node_type in self.node_types:
+            try:
+                peers[node_type] = client.get_peers(node_type) or []
+            except Exception:
+                peers[node_type] = []
+        return status, latency, peers
+
+    def crawl(self):
+        """
+        Crawls the peer graph
+
+        # Returns
+        @return TopologySnapshot snapshot
+        """
+        nodes = {}
+        adjacency = collections.defaultdict(set)
+        identities = {}
+        aliases = {}
+        seen = set()
+        queue = collections.deque()
+        for url in self.seeds:
+            if url not in seen:
+                seen.add(url)
+                queue.append((url, None, 0))
+
+        def node(identity, url=None):
+            entry = nodes.get(identity)
+            if entry is None:
+                entry = nodes[identity] = { "id": identity, "url": url, "moniker": None, "version": None,
+                    "latency": None, "types": [], "reachable": False, "error": None, "depth": None }
+            if url and not entry['url']:
+                entry['url'] = url
+            return entry
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            while queue or pending:
+                while queue and len(pending) < self.max_workers:
+                    url, hint, depth = queue.popleft()
+                    pending[executor.submit(self._visit, url)] = (url, hint, depth)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, hint, depth = pending.pop(future)
+                    try:
+                        status, latency, peers = future.result()
+                    except Exception as e:
+                        entry = node(identities.get(url) or hint or url, url)
+                        if not entry['reachable']:
+                            entry['error'] = str(e)
+                        continue
+                    identity = self.node_id(status) or hint or url
+                    identities[url] = identity
+                    if hint is not None and hint != identity:
+                        aliases[hint] = identity
+                    entry = node(identity, url)
+                    if entry['reachable']:
+                        # the same node, reached through another url
+                        continue
+                    info = status.get('nodeInfo') or {}
+                    entry.update({ "url": url, "moniker": info.get('moniker'), "version": info.get('version'),
+                        "latency": latency, "reachable": True, "error": None, "depth": depth })
+                    for node_type, entries in peers.items():
+                        for peer in entries:
+                            peer_url = self.peer_url(peer)
+                            peer_identity = _peer_id(peer, peer_url)
+                            if peer_url in identities:
+                                if identities[peer_url] == peer_url and peer_identity != peer_url:
+                                    # a crawled node that reported no identity of its own
+                                    aliases[peer_url] = peer_identity
+                                else:
+                                    peer_identity = identities[peer_url]
+                            if peer_identity is None:
+                                continue
+                            adjacency[identity].add(peer_identity)
+                            peer_entry = node(peer_identity, peer_url)
+                            if node_type not in peer_entry['types']:
+                                peer_entry['types'].append(node_type)
+                            if isinstance(peer, dict) and peer.get('moniker') and not peer_entry['moniker']:
+                                peer_entry['moniker'] = peer['moniker']
+                            if (peer_url and peer_url not in seen and len(seen) < self.max_nodes
+                                and (self.max_depth is None or depth < self.max_depth)):
+                                seen.add(peer_url)
+                                queue.append((peer_url, peer_identity, depth + 1))
+        return self._merge(nodes, adjacency, aliases)
+
+    def _merge(self, nodes, adjacency, aliases):
+        # peers may list a node under another id than the one its own status reports
+        merged = {}
+        for identity, entry in nodes.items():
+            identity = aliases.get(identity, identity)
+            if identity in merged:
+                # keep the crawled record, completed with what the other one knows
+                kept, other = merged[identity], entry
+                if entry['reachable'] and not kept['reachable']:
+                    kept, other = entry, kept
+                for field, value in other.items():
+                    if kept.get(field) is None:
+                        kept[field] = value
+                kept['id'] = identity
+                kept['types'] = sorted(set(kept['types']) | set(other['types']))
+                merged[identity] = kept
+                continue
+            entry['id'] = identity
+            entry['types'] = sorted(entry['types'])
+            merged[identity] = entry
+        merged_adjacency = collections.defaultdict(set)
+        for identity, peers in adjacency.items():
+            merged_adjacency[aliases.get(identity, identity)].update(aliases.get(peer, peer) for peer in peers)
+        return TopologySnapshot(merged, { k: sorted(v) for k, v in merged_adjacency.items() })
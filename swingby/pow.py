@@ -0,0 +1,128 @@
+"""
+This module contains a local proof-of-work nonce solver for swaps
+"""
+
+import hashlib
+import multiprocessing
+import os
+import queue
+import time
+
+def default_payload(address_to, amount, currency_from, currency_to):
+    """
+    Builds the bytes that are hashed together with the nonce
+    """
+    return "{}{}{}{}".format(address_to, amount, currency_from, currency_to).encode()
+
+def _leading_zero_bits(digest):
+    bits = 0
+    for byte in digest:
+        if byte:
+            return bits + 8 - byte.bit_length()
+        bits += 8
+    return bits
+
+def check_nonce(payload, nonce, difficulty, hash_name="sha256"):
+    """
+    Returns True if hash(payload + nonce) starts with `difficulty` zero bits
+    """
+    digest = hashlib.new(hash_name, payload + str(nonce).encode()).digest()
+    return _leading_zero_bits(digest) >= difficulty
+
+def _search(payload, difficulty, hash_name, start, step, stop, results, chunk=4096):
+    target = 1 << (256 - difficulty)
+    nonce = start
+    tries = 0
+    found = None
+    while found is None and not stop.is_set():
+        for _ in range(chunk):
+            digest = hashlib.new(hash_name, payload + str(nonce).encode()).digest()
+            if int.from_bytes(digest[:32], "big") < target:
+                found = nonce
+                break
+            nonce += step
+        tries += chunk
+    results.put((found, tries))
+
+class PowSolver:
+    """
+    PowSolver finds swap PoW nonces locally, spreading the search over a pool of processes and stopping all of
+    them as soon as one finds a solution. The scheme (hash, payload and difficulty) must match the one the node
+    verifies in create_swap. Example:
+
+    solver = PowSolver(difficulty=20, workers=4)
+    sr = node.swap(address_to=addr_to, amount="1.1", currency_from="BTC", currency_to="BTC.B", pow_solver=solver)
+    """
+
+    def __init__(self, difficulty=20, workers=None, hash_name="sha256", payload_func=default_payload, *args, **kwargs):
+        """
+        # Attributes
+        @param integer difficulty - Required number of leading zero bits
+        @param integer workers - Number of processes (none provided = number of cores)
+        @param string hash_name - hashlib algorithm name, must produce a 256 bit digest
+        @param function payload_func - Builds the hashed bytes from (address_to, amount, currency_from, currency_to)
+        """
+        self.difficulty = difficulty
+        self.workers = workers or os.cpu_count() or 1
+        self.hash_name = hash_name
+        self.payload_func = payload_func
+        self.last_tries = 0
+        self.last_duration = 0.0
+
+    def solve(self, address_to, amount, currency_from, currency_to, timeout=None):
+        """
+        Finds a nonce for the given swap
+
+        # Attributes
+        @param string address_to - Payout address
+        @param string amount - Amount of funds to swap
+        @param string currency_from - Currency from (BTC, BNB ...)
+        @param string currency_to - Currency to (BTC, BNB ...)
+        @param float timeout - Max seconds to search (none provided = no limit)
+
+        # Returns
+        @return integer nonce
+        """
+        payload = self.payload_func(address_to, amount, currency_from, currency_to)
+        ctx = multiprocessing.get_context()
+        stop = ctx.Event()
+        results = ctx.Queue()
+        procs = [ctx.Process(target=_search, args=(payload, self.difficulty, self.hash_name, i, self.workers, stop, results),
+            daemon=True) for i in range(self.workers)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        nonce = None
+        tries = 0
+        reported = 0
+        try:
+            while reported < len(procs):
+                if stop.is_set():
+                    wait = 5
+                else:
+                    wait = None if timeout is None else max(0.0, start + timeout - time.perf_counter())
+                found, count = results.get(timeout=wait)
+                reported += 1
+                tries += count
+                if found is not None and nonce is None:
+                    nonce = found
+                    stop.set()
+        except queue.Empty:
+            pass
+        finally:
+            stop.set()
+            for p in procs:
+                p.join(1)
+                if p.is_alive():
+                    p.terminate()
+        self.last_tries = tries
+        self.last_duration = time.perf_counter() - start
+        if nonce is None:
+            raise Exception("PoW nonce not found within {} seconds.".format(timeout))
+        return nonce
+
+    def hashrate(self):
+        """
+        Returns the nonces per second tried by the last solve
+        """
+        return self.last_tries / self.last_duration if self.last_duration else 0.0
@@ -0,0 +1,159 @@
+"""
+This module contains a local swap quote engine working from cached fees and floats
+"""
+
+import threading
+import time
+from decimal import Decimal, ROUND_UP, ROUND_DOWN
+
+from .records import Fee, to_decimal
+
+class QuoteEngine:
+    """
+    QuoteEngine computes calculate_swap style quotes in-process from the node's get_swap_fees and the staking
+    API's get_floats, refreshed in the background, instead of sending one calculate_swap per quote. Amounts are
+    Decimals, so quotes are exact. The fee of a swap is the bridge fee percent of the amount plus the miner fee
+    of the currency received, and a quote is only liquid if the float of that currency is known and covers its
+    receive amount. The node is still asked (through calculate_swap and create_swap) when a swap is actually
+    created. Example:
+
+    engine = QuoteEngine(NodeHttpClient("https://testnet-node.swingby.network"), StakesHttpClient(None))
+    engine.start()
+    quote = engine.quote("0.5", "BTC", "BTC.B")
+    quotes = engine.quote_many(["0.01", "0.1", "1"], "BTC", "BTC.B")
+    """
+
+    def __init__(self, node, stakes=None, refresh_interval=30, precision=8, *args, **kwargs):
+        """
+        # Attributes
+        @param NodeHttpClient node - Client the fees are fetched from and swaps are created with
+        @param StakesHttpClient stakes - Client the floats are fetched from (none provided = no liquidity check)
+        @param float refresh_interval - Seconds between two background refreshes
+        @param integer precision - Decimal places of the quoted amounts (8 = satoshis)
+        """
+        self.node = node
+        self.stakes = stakes
+        self.refresh_interval = refresh_interval
+        self.quantum = Decimal(1).scaleb(-precision)
+        self.fees = {}
+        self.floats = {}
+        self.refreshed_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """
+        Fetches the current fees and floats. On failure the previous values are kept and the error is
+        stored in last_error.
+        """
+        try:
+            fees = { fee.currency: fee for fee in Fee.from_list(self.node.get_swap_fees()) }
+            floats = {}
+            if self.stakes is not None:
+                floats = { currency: to_decimal(balance) for currency, balance in self.stakes.get_floats().items() }
+        except Exception as e:
+            self.last_error = e
+            return False
+        with self._lock:
+            self.fees = fees
+            self.floats = floats
+            self.refreshed_at = time.time()
+            self.last_error = None
+        return True
+
+    def start(self):
+        """
+        Refreshes once, then keeps refreshing every refresh_interval seconds in a daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def stop(self):
+        """
+        Stops the background refresh
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _pair(self, currency_to):
+        if self.refreshed_at is None:
+            self.refresh()
+        with self._lock:
+            fee = self.fees.get(currency_to)
+            balance = self.floats.get(currency_to) if self.stakes is not None else None
+        if fee is None:
+            raise Exception("No swap fees known for {}".format(currency_to))
+        rate = (fee.bridge_fee_percent or Decimal(0)) / 100
+        return rate, fee.miner_fee or Decimal(0), balance
+
+    def _quote(self, amount, currency_from, currency_to, rate, miner_fee, balance):
+        amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        fee = (amount * rate + miner_fee).quantize(self.quantum, rounding=ROUND_UP)
+        receive_amount = max(amount - fee, Decimal(0)).quantize(self.quantum, rounding=ROUND_DOWN)
+        return {
+            "currency_from": currency_from,
+            "currency_to": currency_to,
+            "send_amount": amount,
+            "fee": fee,
+            "receive_amount": receive_amount,
+            "float": balance,
+            # with a stakes client an unknown (missing or malformed) float fails closed
+            "liquid": self.stakes is None or (balance is not None and receive_amount <= balance),
+        }
+
+    def quote(self, amount, currency_from, currency_to):
+        """
+        Quotes a swap locally, without a request
+
+        # Attributes
+        @param string amount - Amount of funds to swap (string, int or Decimal)
+        @param string currency_from - Currency from (BTC, BTC.B ...)
+        @param string currency_to - Currency to (BTC, BTC.B ...)
+
+        # Returns
+        @return dict quote
+        @return string quote.currency_from
+        @return string quote.currency_to
+        @return Decimal quote.send_amount
+        @return Decimal quote.fee - rounded up to the precision
+        @return Decimal quote.receive_amount - rounded down to the precision, never negative
+        @return Decimal quote.float - Float of currency_to (None if unknown or without a stakes client)
+        @return boolean quote.liquid - False if the float of currency_to is unknown or can not cover receive_amount
+        """
+        return self._quote(amount, currency_from, currency_to, *self._pair(currency_to))
+
+    def quote_many(self, amounts, currency_from, currency_to):
+        """
+        Quotes many amounts of the same currency pair at once. The fees and float are looked up once for
+        the whole batch.
+
+        # Returns
+        @return array quotes - In the same order as amounts
+        """
+        rate, miner_fee, balance = self._pair(currency_to)
+        return [self._quote(amount, currency_from, currency_to, rate, miner_fee, balance) for amount in amounts]
+
+    def swap(self, address_to, amount, currency_from, currency_to, **kwargs):
+        """
+        Checks the liquidity locally, then creates the swap with the node (calculate_swap and create_swap)
+
+        # Returns
+        @return dict swap - response from NodeHttpClient.swap
+        """
+        quote = self.quote(amount, currency_from, currency_to)
+        if not quote['liquid']:
+            reason = "Unknown" if quote['float'] is None else "Insufficient"
+            raise Exception("{} {} float for a swap of {} {}".format(reason, currency_to, amount, currency_from))
+        return self.node.swap(address_to, amount, currency_from, currency_to, **kwargs)
@@ -0,0 +1,245 @@
+"""
+This module contains the client side rate limiter shared by the Swingby HTTP transports
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_RATES = {
+    "swaps": 5,
+    "stakes": 10,
+    "status": 20,
+    "default": 10,
+}
+
+class RateLimitException(Exception):
+    """
+    Raised when a Swingby endpoint answers with 429 Too Many Requests
+
+    # Attributes
+    @param float retry_after - Seconds the server asked us to wait (None if it did not say)
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header (delay in seconds or HTTP date) into seconds, or None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def endpoint_family(endpoint):
+    """
+    Maps an endpoint url to its rate limit family (swaps, stakes, status or default)
+    """
+    path = urlparse(endpoint).path
+    if "/swaps" in path:
+        return "swaps"
+    if "/stakes" in path:
+        return "stakes"
+    if path.endswith("/status") or path.endswith("/platform_status"):
+        return "status"
+    return "default"
+
+class TokenBucket:
+    """
+    Thread safe token bucket. Callers reserve a token and are told how long to wait for it, so the same bucket
+    can pace both threads (time.sleep) and tasks (asyncio.sleep). The rate backs off on 429 responses and
+    recovers on successful ones.
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=0.1):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(min_rate, self.rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token and returns the seconds to wait before using it
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(delay, self.blocked_until - now)
+
+    def throttle(self, retry_after):
+        """
+        Blocks the bucket for retry_after seconds and halves the rate, once per blocked window so that a burst
+        of concurrent 429 responses only backs off once
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now >= self.blocked_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def recover(self):
+        """
+        Raises the rate back towards its configured maximum
+        """
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+class RateLimitScheduler:
+    """
+    RateLimitScheduler paces requests with one token bucket per host and endpoint family, honors Retry-After,
+    and retries rate limited requests with jittered exponential backoff. Pass it to HttpTransport or
+    AsyncHttpTransport to put it under every client using that transport. Example:
+
+    scheduler = RateLimitScheduler(rates={ "swaps": 2, "stakes": 10, "status": 20, "default": 5 })
+    transport = HttpTransport(scheduler=scheduler)
+    node = NodeHttpClient("https://testnet-node.swingby.network", transport.send_get, transport.send_post)
+    """
+
+    def __init__(self, rates=None, burst=None, max_retries=5, base_delay=0.5, max_delay=30, metrics=None, *args, **kwargs):
+        """
+        # Attributes
+        @param dict rates - Requests per second by endpoint family (swaps, stakes, status, default)
+        @param integer burst - Max number of requests sent back to back (none provided = one second worth)
+        @param integer max_retries - Max number of retries of a rate limited request
+        @param float base_delay - First backoff delay in seconds, doubled on every retry
+        @param float max_delay - Max backoff delay in seconds
+        @param Metrics metrics - Records the retries per endpoint (none provided = disabled)
+        """
+        self.metrics = metrics
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint):
+        """
+        Returns the token bucket pacing the given endpoint url
+        """
+        family = endpoint_family(endpoint)
+        key = (urlparse(endpoint).netloc, family)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    rate = self.rates.get(family, self.rates.get("default", DEFAULT_RATES["default"]))
+                    bucket = self.buckets[key] = TokenBucket(rate, self.burst)
+        return bucket
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Returns the seconds to wait before retry number `attempt`
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+        return max(delay, retry_after or 0.0)
+
+    def run(self, endpoint, fn, *args, **kwargs):
+        """
+        Calls fn(endpoint, ...) once a token is available, retrying on RateLimitException
+        """
+        bucket = self.bucket(endpoint)
+        attempt = 0
+        while True:
+            delay = bucket.reserve()
+            if delay > 0:
+                bucket.waiting += 1
+                try:
+                    time.sleep(delay)
+                finally:
+                    bucket.waiting -= 1
+            try:
+                res = fn(endpoint, *args, **kwargs)
+            except RateLimitException as e:
+                delay = self._throttled(bucket, attempt, e)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                if self.metrics is not None:
+                    self.metrics.retry(endpoint)
+                time.sleep(delay)
+                continue
+            bucket.recover()
+            return res
+
+    async def run_async(self, endpoint, fn, *args, **kwargs):
+        """
+        Async counterpart of run, fn must be a coroutine function
+        """
+        bucket = self.bucket(endpoint)
+        attempt = 0
+        while True:
+            delay = bucket.reserve()
+            if delay > 0:
+                bucket.waiting += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    bucket.waiting -= 1
+            try:
+                res = await fn(endpoint, *args, **kwargs)
+            except RateLimitException as e:
+                delay = self._throttled(bucket, attempt, e)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                if self.metrics is not None:
+                    self.metrics.retry(endpoint)
+                await asyncio.sleep(delay)
+                continue
+            bucket.recover()
+            return res
+
+    def _throttled(self, bucket, attempt, e):
+        delay = self.backoff(attempt, e.retry_after)
+        bucket.throttle(delay)
+        self.throttled += 1
+        return delay
+
+    def stats(self):
+        """
+        Get the scheduler metrics
+
+        # Returns
+        @return dict stats
+        @return integer stats.retries - Rate limited requests that were retried
+        @return integer stats.throttled - 429 responses received
+        @return integer stats.queueDepth - Requests currently waiting for a token
+        @return dict stats.buckets[host/family].rate - Current requests per second
+        @return dict stats.buckets[host/family].queueDepth - Requests waiting on this bucket
+        """
+        buckets = { "{}/{}".format(*key): { "rate": b.rate, "queueDepth": b.waiting } for key, b in self.buckets.items() }
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "queueDepth": sum(b["queueDepth"] for b in buckets.values()),
+            "buckets": buckets,
+        }
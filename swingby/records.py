@@ -0,0 +1,103 @@
+"""
+This module contains compact typed records for the most common Swingby responses. Records are namedtuples
+(no per-instance __dict__) and amounts are parsed into Decimal.
+"""
+
+import collections
+import sys
+from decimal import Decimal, InvalidOperation
+
+def to_decimal(value):
+    """
+    Parses an amount (string or number) into a Decimal, or None if it is missing or malformed
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _parsers(cls):
+    parsers = cls.__dict__.get("_parsers")
+    if parsers is None:
+        parsers = cls._parsers = tuple((key, to_decimal if field in cls._amounts else _intern if field in cls._interned
+            else None) for field, key in zip(cls._fields, cls._keys))
+    return parsers
+
+class _Record:
+    __slots__ = ()
+    _keys = ()
+    _amounts = ()
+    _interned = ()
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Builds a record from a response dict
+        """
+        return tuple.__new__(cls, [d.get(key) if parse is None else parse(d.get(key)) for key, parse in _parsers(cls)])
+
+    @classmethod
+    def from_list(cls, items):
+        """
+        Builds a list of records from a list of response dicts (or a page with `items`)
+        """
+        if isinstance(items, dict):
+            items = items.get('items') or []
+        return [cls.from_dict(d) for d in items]
+
+class Swap(_Record, collections.namedtuple("Swap", ("hash", "status", "address_in", "address_out", "amount_in",
+    "amount_out", "currency_in", "currency_out", "fee", "tx_id_in", "tx_id_out", "timestamp"))):
+    """
+    A swap returned by NodeHttpClient.query_swaps
+    """
+    __slots__ = ()
+    _keys = ("hash", "status", "addressIn", "addressOut", "amountIn", "amountOut", "currencyIn", "currencyOut",
+        "fee", "txIdIn", "txIdOut", "timestamp")
+    _amounts = ("amount_in", "amount_out", "fee")
+    _interned = ("status", "currency_in", "currency_out")
+
+class Stake(_Record, collections.namedtuple("Stake", ("address", "staked_amount", "reward_amount", "weekly_memo"))):
+    """
+    A stake returned by StakesHttpClient.get_stakes
+    """
+    __slots__ = ()
+    _keys = ("address", "staked_amount", "reward_amount", "weekly_memo")
+    _amounts = ("staked_amount", "reward_amount")
+    _interned = ("weekly_memo",)
+
+class LeaderboardEntry(_Record, collections.namedtuple("LeaderboardEntry", ("address", "stake", "reward"))):
+    """
+    An entry of StakesHttpClient.get_leaderboard or get_rewards_leaderboard
+    """
+    __slots__ = ()
+    _keys = ("address", "stake", "reward")
+    _amounts = ("stake", "reward")
+
+class Fee(_Record, collections.namedtuple("Fee", ("currency", "bridge_fee_percent", "miner_fee"))):
+    """
+    A fee returned by NodeHttpClient.get_swap_fees
+    """
+    __slots__ = ()
+    _keys = ("currency", "bridgeFeePercent", "minerFee")
+    _amounts = ("bridge_fee_percent", "miner_fee")
+    _interned = ("currency",)
+
+class Holder(_Record, collections.namedtuple("Holder", ("address", "quantity", "percentage"))):
+    """
+    A holder returned by StakesHttpClient.get_holders
+    """
+    __slots__ = ()
+    _keys = ("address", "quantity", "percentage")
+    _amounts = ("quantity", "percentage")
+
+    @classmethod
+    def from_holders(cls, holders):
+        """
+        Builds a list of records from the address keyed dict returned by get_holders
+        """
+        return [cls(address, to_decimal(h.get('quantity')), to_decimal(h.get('percentage'))) for address, h in holders.items()]
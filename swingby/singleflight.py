@@ -0,0 +1,105 @@
+"""
+This module contains request coalescing (single-flight) for the Swingby clients
+"""
+
+import asyncio
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+def _key(endpoint, query, json):
+    return ("GET", endpoint, tuple(sorted((k, repr(v)) for k, v in query.items())), json)
+
+class SingleFlight:
+    """
+    SingleFlight wraps a get request function so that concurrent identical requests (same method, url and query)
+    share one network call and one decoded result. Sync functions are coalesced across threads, coroutine functions
+    across tasks. Only GET requests are coalesced, posts such as create_swap always go out. Example:
+
+    flight = SingleFlight()
+    node = NodeHttpClient(url, flight.wrap(transport.send_get), transport.send_post)
+    anode = AsyncNodeHttpClient(url, flight.wrap(async_transport.send_get), transport=async_transport)
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._async_inflight = {}
+
+    def wrap(self, send_get):
+        """
+        Returns a coalescing version of a get request function
+
+        # Attributes
+        @param function send_get - Get request function, sync or async
+
+        # Returns
+        @return function send_get
+        """
+        if asyncio.iscoroutinefunction(send_get):
+            async def coalesced_async_get(endpoint, query={}, json=True):
+                return await self._async_get(send_get, endpoint, query, json)
+            return coalesced_async_get
+
+        def coalesced_get(endpoint, query={}, json=True):
+            return self._get(send_get, endpoint, query, json)
+        return coalesced_get
+
+    def _get(self, send_get, endpoint, query, json):
+        key = _key(endpoint, query, json)
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = send_get(endpoint, query=query, json=json)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+    async def _async_get(self, send_get, endpoint, query, json):
+        key = _key(endpoint, query, json)
+        future = self._async_inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(send_get(endpoint, query=query, json=json))
+            self._async_inflight[key] = future
+
+            def forget(f):
+                if self._async_inflight.get(key) is f:
+                    del self._async_inflight[key]
+            future.add_done_callback(forget)
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def stats(self):
+        """
+        Get the coalescing counters
+
+        # Returns
+        @return dict stats
+        @return integer stats.calls - Requests that went out to the network
+        @return integer stats.coalesced - Requests served by an identical in-flight request
+        """
+        return { "calls": self.calls, "coalesced": self.coalesced }
@@ -0,0 +1,209 @@
+"""
+This module contains columnar (NumPy) analytics over StakesHttpClient holders, stakes and leaderboards.
+Requires numpy (pip install numpy).
+"""
+
+from .utils import import_numpy
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+class StakeTable:
+    """
+    StakeTable holds one row per address, sorted by address, with one float64 array per numeric column.
+    Rows of the same address are summed. Tables of different weekly memos can be joined and compared
+    without Python loops. Example:
+
+    now = StakeTable.from_holders(api.get_holders(memo), memo=memo)
+    before = StakeTable.from_holders(api.get_holders(previous_memo), memo=previous_memo)
+    print(now.gini("quantity"), now.top_share("quantity", 10))
+    addresses, delta = now.delta(before, "quantity")
+    """
+
+    __slots__ = ("memo", "addresses", "columns")
+
+    def __init__(self, addresses, columns, memo=None):
+        """
+        # Attributes
+        @param array addresses - Address of every row
+        @param dict columns - Values of every row, by column name
+        @param string memo - Weekly memo the rows belong to
+        """
+        np = import_numpy()
+        addresses = np.asarray(addresses, dtype=str)
+        unique, inverse = np.unique(addresses, return_inverse=True)
+        self.memo = memo
+        self.addresses = unique
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype="float64")
+            if len(unique) == len(addresses):
+                out = np.empty(len(unique), dtype="float64")
+                out[inverse] = values
+                self.columns[name] = out
+            else:
+                self.columns[name] = np.bincount(inverse, weights=values, minlength=len(unique))
+
+    @classmethod
+    def from_records(cls, records, columns, memo=None, address_key="address"):
+        """
+        Builds a table from a list of dicts
+
+        # Attributes
+        @param array records - Dicts holding an address and the numeric columns (numbers or strings)
+        @param array columns - Names of the columns to load
+        @param string memo - Weekly memo the records belong to
+        @param string address_key - Key of the address in every record
+
+        # Returns
+        @return StakeTable table
+        """
+        records = list(records)
+        return cls([r[address_key] for r in records], { c: [_float(r.get(c)) for r in records] for c in columns }, memo)
+
+    @classmethod
+    def from_holders(cls, holders, memo=None):
+        """
+        Builds a table (quantity, percentage) from the response of get_holders
+        """
+        return cls(list(holders.keys()), {
+            "quantity": [_float(h.get('quantity')) for h in holders.values()],
+            "percentage": [_float(h.get('percentage')) for h in holders.values()],
+        }, memo)
+
+    @classmethod
+    def from_stakes(cls, stakes, memo=None):
+        """
+        Builds a table (staked_amount, reward_amount) from the response of get_stakes
+        """
+        return cls.from_records(stakes, ("staked_amount", "reward_amount"), memo)
+
+    @classmethod
+    def from_leaderboard(cls, leaderboard, columns=("stake",), memo=None):
+        """
+        Builds a table from a get_leaderboard or get_rewards_leaderboard page (or a list of their items)
+        """
+        items = leaderboard['items'] if isinstance(leaderboard, dict) else leaderboard
+        return cls.from_records(items, columns, memo)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def nbytes(self):
+        return self.addresses.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def total(self, column):
+        return float(self.columns[column].sum())
+
+    def shares(self, column):
+        """
+        Share of the column's total held by every address (e.g. reward share)
+
+        # Returns
+        @return ndarray shares
+        """
+        np = import_numpy()
+        values = self.columns[column]
+        total = values.sum()
+        return values / total if total else np.zeros(len(values))
+
+    def gini(self, column):
+        """
+        Gini coefficient of the column (0 = perfectly even, 1 = one address holds everything)
+        """
+        np = import_numpy()
+        values = np.sort(self.columns[column])
+        n = len(values)
+        total = values.sum()
+        if n == 0 or total == 0:
+            return 0.0
+        ranks = np.arange(1, n + 1)
+        return float((2 * (ranks * values).sum()) / (n * total) - (n + 1.0) / n)
+
+    def top(self, column, n=10):
+        """
+        The n addresses with the largest values
+
+        # Returns
+        @return ndarray addresses
+        @return ndarray values
+        """
+        np = import_numpy()
+        values = self.columns[column]
+        n = min(n, len(values))
+        idx = np.argpartition(-values, n - 1)[:n] if n else np.array([], dtype=int)
+        idx = idx[np.argsort(-values[idx], kind="stable")]
+        return self.addresses[idx], values[idx]
+
+    def top_share(self, column, n=10):
+        """
+        Share of the column's total held by the n largest addresses
+        """
+        total = self.total(column)
+        return float(self.top(column, n)[1].sum() / total) if total else 0.0
+
+    def align(self, addresses, column):
+        """
+        Values of the column for the given sorted addresses, 0 where an address has no row
+        """
+        np = import_numpy()
+        out = np.zeros(len(addresses), dtype="float64")
+        if len(self.addresses) == 0:
+            return out
+        idx = np.searchsorted(self.addresses, addresses)
+        idx = np.minimum(idx, len(self.addresses) - 1)
+        found = self.addresses[idx] == addresses
+        out[found] = self.columns[column][idx[found]]
+        return out
+
+    def join(self, other, column, other_column=None):
+        """
+        Outer join with another table on address
+
+        # Returns
+        @return ndarray addresses - Union of both tables' addresses, sorted
+        @return ndarray values - This table's column, 0 where missing
+        @return ndarray other_values - The other table's column, 0 where missing
+        """
+        np = import_numpy()
+        addresses = np.union1d(self.addresses, other.addresses)
+        return addresses, self.align(addresses, column), other.align(addresses, other_column or column)
+
+    def delta(self, previous, column):
+        """
+        Change of the column since a previous table (e.g. week over week)
+
+        # Returns
+        @return ndarray addresses
+        @return ndarray deltas
+        """
+        addresses, now, before = self.join(previous, column)
+        return addresses, now - before
+
+def memo_matrix(tables, column):
+    """
+    Aligns the column of several weekly tables into one matrix, one row per address and one column per table
+
+    # Attributes
+    @param array tables - StakeTables, oldest first
+    @param string column - Column to align
+
+    # Returns
+    @return ndarray addresses
+    @return ndarray matrix - shape (addresses, tables)
+    """
+    np = import_numpy()
+    addresses = np.array([], dtype=str)
+    for table in tables:
+        addresses = np.union1d(addresses, table.addresses)
+    matrix = np.zeros((len(addresses), len(tables)), dtype="float64")
+    for i, table in enumerate(tables):
+        matrix[:, i] = table.align(addresses, column)
+    return addresses, matrix
@@ -5,7 +5,10 @@ Which helps to deliver useful insights on the pre-staking system.
 
 import time
 import json
-from .utils import default_send_get, default_send_post
+from .utils import default_send_get, default_send_post, stream_func_for
+from .pagination import iter_pages
+from .bulk import imap_unordered
+from .json_stream import iter_object_items
 
 class StakesHttpClient:
     """
@@ -15,12 +18,14 @@ class StakesHttpClient:
     node = StakesHttpClient("https://staking-api.swingby.network")
     """
 
-    def __init__(self, url, sendGetRequestFunc=default_send_get, sendPostRequestFunc=default_send_post, *args, **kwargs):
+    def __init__(self, url, sendGetRequestFunc=default_send_get, sendPostRequestFunc=default_send_post,
+        sendStreamRequestFunc=None, *args, **kwargs):
         if not url:
             url = "https://staking-api.swingby.network"
         self.url = url
         self.get = sendGetRequestFunc
         self.post = sendPostRequestFunc
+        self.stream = sendStreamRequestFunc or stream_func_for(sendGetRequestFunc, sendPostRequestFunc)
 
     def _url(self, path):
         return "{}/{}".format(self.url, path)
@@ -49,6 +54,52 @@ class StakesHttpClient:
             query["memo"] = memo
         return self.get(self._url("v1/stakes/leaderboard"), query=query)
 
+    def iter_leaderboard(self, memo=None, page_size=100, prefetch=4, rewards=False):
+        """
+        Lazily yields every entry of a weekly leaderboard. The memo is resolved once, then after the first page
+        reveals the total the remaining pages are fetched concurrently, at most `prefetch` pages ahead.
+
+        # Attributes
+        @param string memo - Weekly memo (none provided = current_memo)
+        @param integer page_size - Number of items per request
+        @param integer prefetch - Max number of pages fetched ahead of the consumer
+        @param boolean rewards - Walk the rewards leaderboard instead of the staking leaderboard
+
+        # Returns
+        @return iterator items
+        """
+        memo = memo or self.get_weekly_memo()
+        get_page = self.get_rewards_leaderboard if rewards else self.get_leaderboard
+        fetch_page = lambda page: get_page(memo=memo, page=page, page_size=page_size)
+        return iter_pages(fetch_page, page_size, first_page=1, prefetch=prefetch)
+
+    def fetch_full_leaderboard(self, memo=None, page_size=100, prefetch=4, rewards=False):
+        """
+        Fetches every page of a weekly leaderboard concurrently and merges them
+
+        # Attributes
+        @param string memo - Weekly memo (none provided = current_memo)
+        @param integer page_size - Number of items per request
+        @param integer prefetch - Max number of pages fetched concurrently
+        @param boolean rewards - Fetch the rewards leaderboard instead of the staking leaderboard
+
+        # Returns
+        @return dict leaderboard - first page fields (total, totalStaked ...) with the merged items
+        @return string leaderboard.memo
+        @return array leaderboard.items
+        @return integer leaderboard.itemCount
+        """
+        memo = memo or self.get_weekly_memo()
+        get_page = self.get_rewards_leaderboard if rewards else self.get_leaderboard
+        first = {}
+        def fetch_page(page):
+            res = get_page(memo=memo, page=page, page_size=page_size)
+            if page == 1:
+                first.update(res)
+            return res
+        items = list(iter_pages(fetch_page, page_size, first_page=1, prefetch=prefetch))
+        return { **first, "memo": memo, "items": items, "itemCount": len(items) }
+
     def get_floats(self):
         """
         Get network floats
@@ -107,10 +158,30 @@ class StakesHttpClient:
         @return float holders[address].percentage
         """
         query = {}
-        if not memo:
+        if memo:
             query['memo'] = memo
         return self.get(self._url("v1/stakes/holders"), query=query)
 
+    def iter_holders(self, memo=None, chunk_size=65536):
+        """
+        Streams the holders of a weekly memo, yielding them as they are read so memory stays constant however
+        many holders there are. Example:
+
+        for address, holder in api.iter_holders(memo):
+            print(address, holder['percentage'])
+
+        # Attributes
+        @param string memo - Weekly memo (none provided = current_memo)
+        @param integer chunk_size - Bytes read from the response at a time
+
+        # Returns
+        @return iterator holders - (address, holder) with holder.quantity and holder.percentage
+        """
+        query = {}
+        if memo:
+            query['memo'] = memo
+        return iter_object_items(self.stream(self._url("v1/stakes/holders"), query=query, chunk_size=chunk_size))
+
     def get_payout(self, memo=None):
         """
         Generate the staking rewards payout transaction (un-signed)
@@ -125,9 +196,9 @@ class StakesHttpClient:
         @return array payout.holders
         """
         query = {}
-        if not memo:
+        if memo:
             query['memo'] = memo
-        return self.get(self._url("v1/stakes/holders"), query=query)
+        return self.get(self._url("v1/stakes/payout"), query=query)
 
     def get_rewards_history(self, address):
         """
@@ -171,6 +242,47 @@ class StakesHttpClient:
             query['memo'] = memo
         return self.get(self._url("v1/stakes"), query=query)
 
+    def iter_stakes(self, address=None, memo=None, chunk_size=65536):
+        """
+        Streams the network stakes, yielding them as they are read so memory stays constant however many
+        stakes there are
+
+        # Attributes
+        @param string address - Only the stakes of this address
+        @param string memo - Weekly memo
+        @param integer chunk_size - Bytes read from the response at a time
+
+        # Returns
+        @return iterator stakes - dicts with address, staked_amount, reward_amount and weekly_memo
+        """
+        query = {}
+        if address:
+            query['address'] = address
+        if memo:
+            query['memo'] = memo
+        for _, stake in iter_object_items(self.stream(self._url("v1/stakes"), query=query, chunk_size=chunk_size)):
+            yield stake
+
+    def get_payout_summary(self, memo=None, chunk_size=65536):
+        """
+        Streams the payout transaction of get_payout for its totals only, skipping its holders array without
+        decoding or holding it
+
+        # Attributes
+        @param string memo - Weekly memo (none provided = current_memo)
+        @param integer chunk_size - Bytes read from the response at a time
+
+        # Returns
+        @return dict summary
+        @return integer summary.totalTransactions
+        @return string summary.estimatedPayout
+        """
+        query = {}
+        if memo:
+            query['memo'] = memo
+        chunks = self.stream(self._url("v1/stakes/payout"), query=query, chunk_size=chunk_size)
+        return dict(iter_object_items(chunks, keys=("totalTransactions", "estimatedPayout")))
+
     def get_token_info(self):
         """
         Get token info
@@ -191,3 +303,47 @@ class StakesHttpClient:
             "address": address
         }
         return self.get(self._url("v1/chain/asset"), query=query)
+
+    def bulk_rewards_history(self, addresses, max_workers=8, retries=3):
+        """
+        Gets the rewards history of many addresses concurrently, see get_rewards_history
+
+        # Attributes
+        @param iterable addresses - Addresses to query
+        @param integer max_workers - Max number of requests in flight
+        @param integer retries - Max number of retries of a failed address
+
+        # Returns
+        @return iterator pairs - (address, result) as they complete, result is the Exception if all retries failed
+        """
+        return imap_unordered(self.get_rewards_history, addresses, max_workers=max_workers, retries=retries)
+
+    def bulk_token_balance(self, addresses, max_workers=8, retries=3):
+        """
+        Gets the token balance of many addresses concurrently, see get_token_balance
+
+        # Attributes
+        @param iterable addresses - Addresses to query
+        @param integer max_workers - Max number of requests in flight
+        @param integer retries - Max number of retries of a failed address
+
+        # Returns
+        @return iterator pairs - (address, result) as they complete, result is the Exception if all retries failed
+        """
+        return imap_unordered(self.get_token_balance, addresses, max_workers=max_workers, retries=retries)
+
+    def bulk_stakes(self, addresses, memo=None, max_workers=8, retries=3):
+        """
+        Gets the stakes of many addresses concurrently, see get_stakes
+
+        # Attributes
+        @param iterable addresses - Addresses to query
+        @param string memo - Weekly memo
+        @param integer max_workers - Max number of requests in flight
+        @param integer retries - Max number of retries of a failed address
+
+        # Returns
+        @return iterator pairs - (address, result) as they complete, result is the Exception if all retries failed
+        """
+        fn = lambda address: self.get_stakes(address=address, memo=memo)
+        return imap_unordered(fn, addresses, max_workers=max_workers, retries=retries)
@@ -0,0 +1,194 @@
+"""
+This module contains a local SQLite index of swaps, kept up to date with incremental syncs
+"""
+
+import json
+import sqlite3
+import threading
+
+from .pagination import iter_pages
+from .swap_watcher import TERMINAL_STATUSES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS swaps (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    in_address TEXT,
+    out_address TEXT,
+    in_hash TEXT,
+    out_hash TEXT,
+    currency_in TEXT,
+    currency_out TEXT,
+    status TEXT,
+    timestamp INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS swaps_position ON swaps (position);
+CREATE INDEX IF NOT EXISTS swaps_in_address ON swaps (in_address);
+CREATE INDEX IF NOT EXISTS swaps_out_address ON swaps (out_address);
+CREATE INDEX IF NOT EXISTS swaps_in_hash ON swaps (in_hash);
+CREATE INDEX IF NOT EXISTS swaps_out_hash ON swaps (out_hash);
+CREATE INDEX IF NOT EXISTS swaps_currency_in ON swaps (currency_in);
+CREATE INDEX IF NOT EXISTS swaps_currency_out ON swaps (currency_out);
+CREATE INDEX IF NOT EXISTS swaps_status ON swaps (status);
+CREATE INDEX IF NOT EXISTS swaps_timestamp ON swaps (timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def fallback_id(item):
+    """
+    Returns the identifier of a swap the node reports no hash for yet, from its deposit address and creation time
+    """
+    return "{}:{}".format(item.get('addressIn'), item.get('timestamp'))
+
+def swap_id(item):
+    """
+    Returns the identifier a swap is stored under
+    """
+    return item.get('hash') or item.get('txIdIn') or fallback_id(item)
+
+class SwapIndex:
+    """
+    SwapIndex mirrors the node's swaps into a local SQLite database. sync() walks query_swaps oldest first
+    (sort=1) and only fetches from the page holding the oldest swap that is not in a terminal status, or the
+    high-water mark when every stored swap is final, so each sync downloads new swaps plus the few still
+    pending. Lookups by address, hash, chain, status and time are then answered locally. Example:
+
+    index = SwapIndex(node, "swaps.db")
+    index.sync()
+    swaps = index.by_address("tbnb1z20t7rn6urh46m2tavny3ap9n0pvkf47mynuza")
+    """
+
+    def __init__(self, client, path=":memory:", page_size=100, prefetch=4, *args, **kwargs):
+        """
+        # Attributes
+        @param NodeHttpClient client - Client used to query swaps
+        @param string path - SQLite database file (default: in memory)
+        @param integer page_size - Number of swaps per request
+        @param integer prefetch - Max number of pages fetched ahead during a sync
+        """
+        self.client = client
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM swaps").fetchone()[0]
+
+    @property
+    def high_water_mark(self):
+        """
+        Number of swaps synced so far, in oldest first order
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'high_water_mark'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _resume_position(self):
+        placeholders = ",".join("?" * len(TERMINAL_STATUSES))
+        with self._lock:
+            row = self.conn.execute("SELECT MIN(position) FROM swaps WHERE status IS NULL OR status NOT IN ({})"
+                .format(placeholders), TERMINAL_STATUSES).fetchone()
+        pending = row[0]
+        high_water_mark = self.high_water_mark
+        return high_water_mark if pending is None else min(pending, high_water_mark)
+
+    def sync(self, **kwargs):
+        """
+        Fetches new swaps and re-checks the ones not yet in a terminal status
+
+        # Attributes
+        @param kwargs - Extra query_swaps filters applied to the whole index (from_chain, to_chain ...)
+
+        # Returns
+        @return integer updated - Number of swaps inserted or updated
+        """
+        start_page = self._resume_position() // self.page_size
+        fetch_page = lambda page: self.client.query_swaps(page_size=self.page_size, page=page, sort=1, **kwargs)
+        position = start_page * self.page_size
+        rows = []
+        stale = []
+        for item in iter_pages(fetch_page, self.page_size, first_page=0, prefetch=self.prefetch, start_page=start_page):
+            key = swap_id(item)
+            if key != fallback_id(item):
+                # replaces the row stored before the node reported its hash
+                stale.append((fallback_id(item),))
+            rows.append((key, position, item.get('addressIn'), item.get('addressOut'),
+                item.get('txIdIn') or item.get('hash'), item.get('txIdOut'), item.get('currencyIn'),
+                item.get('currencyOut'), item.get('status'), item.get('timestamp'), json.dumps(item)))
+            position += 1
+            if len(rows) >= 1000:
+                self._upsert(rows, stale)
+                rows = []
+                stale = []
+        self._upsert(rows, stale)
+        high_water_mark = max(position, self.high_water_mark)
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('high_water_mark', ?)",
+                (str(high_water_mark),))
+        return position - start_page * self.page_size
+
+    def _upsert(self, rows, stale=()):
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM swaps WHERE id = ?", stale)
+            self.conn.executemany("INSERT OR REPLACE INTO swaps (id, position, in_address, out_address, in_hash, "
+                "out_hash, currency_in, currency_out, status, timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _select(self, where, params, limit=None):
+        sql = "SELECT data FROM swaps WHERE {} ORDER BY position DESC".format(where)
+        if limit:
+            sql += " LIMIT {}".format(int(limit))
+        with self._lock:
+            return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def by_address(self, address, limit=None):
+        """
+        Get the swaps sent from or paid out to an address, newest first
+
+        # Returns
+        @return array swaps
+        """
+        return self._select("in_address = ? OR out_address = ?", (address, address), limit)
+
+    def by_hash(self, tx_hash):
+        """
+        Get the swaps with the given inbound or outbound transaction hash
+
+        # Returns
+        @return array swaps
+        """
+        return self._select("id = ? OR in_hash = ? OR out_hash = ?", (tx_hash, tx_hash, tx_hash))
+
+    def query(self, currency_in=None, currency_out=None, status=None, since=None, until=None, limit=None):
+        """
+        Query the stored swaps, newest first
+
+        # Attributes
+        @param string currency_in - Currency from (BTC, BNB ...)
+        @param string currency_out - Currency to (BTC, BNB ...)
+        @param string status - Status of the swap
+        @param integer since - Min timestamp
+        @param integer until - Max timestamp
+        @param integer limit - Max number of swaps returned
+
+        # Returns
+        @return array swaps
+        """
+        where = ["1 = 1"]
+        params = []
+        for column, op, value in (("currency_in", "=", currency_in), ("currency_out", "=", currency_out),
+            ("status", "=", status), ("timestamp", ">=", since), ("timestamp", "<=", until)):
+            if value is not None:
+                where.append("{} {} ?".format(column, op))
+                params.append(value)
+        return self._select(" AND ".join(where), params, limit)
@@ -0,0 +1,161 @@
+"""
+This module contains a columnar (NumPy) view of NodeHttpClient.get_swap_stats.
+Requires numpy (pip install numpy).
+"""
+
+import calendar
+import time
+
+from .utils import import_numpy
+
+SERIES_24HR = (
+    "network24hrSwaps",
+    "network24hrSwapsVolume",
+    "networkRewards24hrVolume",
+    "participated24hrSwaps",
+    "participated24hrSwapsVolume",
+    "rewards24hrVolume",
+)
+
+SERIES_1M = (
+    "network1mSwaps",
+    "network1mSwapsVolume",
+    "networkRewards1mVolume",
+    "participated1mSwaps",
+    "participated1mSwapsVolume",
+    "rewards1mVolume",
+)
+
+STEPS = {
+    "24hr": 3600,
+    "1m": 86400,
+}
+
+_TIME_KEYS = ("at", "time", "timestamp", "date")
+_VALUE_KEYS = ("count", "amount", "volume", "value")
+
+def _first(point, keys):
+    for key in keys:
+        if key in point:
+            return point[key]
+    return None
+
+class SwapStats:
+    """
+    SwapStats decodes the parallel arrays of get_swap_stats into NumPy arrays with aligned timestamps, and offers
+    vectorized rolling sums, rates and node versus network participation ratios. A snapshot holds only its arrays
+    so many of them can be retained cheaply. Example:
+
+    stats = SwapStats.fetch(node)
+    ratio = stats.participation("24hr", volume=True)
+    hourly = stats.rate("network24hrSwaps")
+    """
+
+    __slots__ = ("fetched_at", "series", "timestamps", "totals")
+
+    def __init__(self, stats, fetched_at=None, dtype="float64"):
+        """
+        # Attributes
+        @param dict stats - Response of get_swap_stats
+        @param float fetched_at - Epoch seconds the stats were fetched at (none provided = now)
+        @param string dtype - NumPy dtype of the decoded series (float32 halves the memory)
+        """
+        np = import_numpy()
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.series = {}
+        self.timestamps = {}
+        self.totals = { k: float(v) for k, v in stats.items() if isinstance(v, (int, float)) and not isinstance(v, bool) }
+        for window, names in (("24hr", SERIES_24HR), ("1m", SERIES_1M)):
+            times = None
+            for name in names:
+                points = stats.get(name) or []
+                if points and isinstance(points[0], dict):
+                    values = [_first(p, _VALUE_KEYS) for p in points]
+                    stamps = [_first(p, _TIME_KEYS) for p in points]
+                    if times is None and all(s is not None for s in stamps):
+                        times = np.array([_epoch(s) for s in stamps], dtype="float64")
+                else:
+                    values = points
+                self.series[name] = np.array([float(v or 0) for v in values], dtype=dtype)
+            length = max(len(self.series[name]) for name in names)
+            if times is None or len(times) != length:
+                # plain lists are ordered oldest first and end at the time of the request
+                times = self.fetched_at - STEPS[window] * np.arange(length - 1, -1, -1, dtype="float64")
+            self.timestamps[window] = times
+
+    @classmethod
+    def fetch(cls, client, dtype="float64"):
+        """
+        Fetches get_swap_stats from a NodeHttpClient and decodes it
+
+        # Returns
+        @return SwapStats stats
+        """
+        return cls(client.get_swap_stats(), dtype=dtype)
+
+    def __getitem__(self, name):
+        return self.series[name]
+
+    @property
+    def nbytes(self):
+        """
+        Memory held by the decoded arrays, in bytes
+        """
+        return sum(a.nbytes for a in self.series.values()) + sum(a.nbytes for a in self.timestamps.values())
+
+    def rolling_sum(self, name, window):
+        """
+        Sum over the last `window` points at every point of a series (shorter at the start of the series)
+
+        # Returns
+        @return ndarray sums
+        """
+        np = import_numpy()
+        cumsum = np.cumsum(self.series[name], dtype="float64")
+        out = cumsum.copy()
+        if 0 < window < len(cumsum):
+            out[window:] = cumsum[window:] - cumsum[:-window]
+        return out
+
+    def rate(self, name):
+        """
+        Per second rate of a series, each point divided by the time it covers
+
+        # Returns
+        @return ndarray rates
+        """
+        np = import_numpy()
+        times = self.timestamps["24hr" if name in SERIES_24HR else "1m"]
+        if len(times) < 2:
+            return self.series[name] / STEPS["24hr" if name in SERIES_24HR else "1m"]
+        steps = np.diff(times, prepend=times[0] - (times[1] - times[0]))
+        return self.series[name] / steps
+
+    def participation(self, window="24hr", volume=False, rewards=False):
+        """
+        Ratio of the node's participated swaps (or volume, or rewards) to the network's at every point
+
+        # Attributes
+        @param string window - 24hr or 1m
+        @param boolean volume - Compare swap volumes instead of swap counts
+        @param boolean rewards - Compare rewards volumes instead of swap counts
+
+        # Returns
+        @return ndarray ratios - 0 where the network had nothing
+        """
+        np = import_numpy()
+        if rewards:
+            node, network = "rewards{}Volume", "networkRewards{}Volume"
+        elif volume:
+            node, network = "participated{}SwapsVolume", "network{}SwapsVolume"
+        else:
+            node, network = "participated{}Swaps", "network{}Swaps"
+        node, network = self.series[node.format(window)], self.series[network.format(window)]
+        length = min(len(node), len(network))
+        node, network = node[len(node) - length:], network[len(network) - length:]
+        return np.divide(node, network, out=np.zeros(length, dtype=node.dtype), where=network != 0)
+
+def _epoch(stamp):
+    if isinstance(stamp, (int, float)):
+        return stamp / 1000.0 if stamp > 1e11 else float(stamp)
+    return float(calendar.timegm(time.strptime(str(stamp)[:19], "%Y-%m-%dT%H:%M:%S")))
@@ -0,0 +1,211 @@
+"""
+This module contains a watcher that follows the status of many swaps at once
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("COMPLETED", "REFUNDED", "EXPIRED")
+
+class WatchedSwap:
+    """
+    A swap followed by a SwapWatcher
+    """
+
+    def __init__(self, key, in_address=None, in_hash=None, callback=None):
+        self.key = key
+        self.in_address = in_address
+        self.in_hash = in_hash
+        self.callback = callback
+        self.status = None
+        self.item = None
+        self.changed = time.monotonic()
+        self.next_check = 0.0
+
+    def matches(self, item):
+        if self.in_hash and self.in_hash in (item.get('hash'), item.get('txIdIn')):
+            return True
+        return bool(self.in_address) and self.in_address == item.get('addressIn')
+
+class SwapWatcher:
+    """
+    SwapWatcher follows many swaps with a few batched queries. Each poll scans the newest swaps page by page and
+    matches them against every watched swap, so the number of requests grows with the recent activity on the network
+    (up to max_pages pages) rather than with the number of swaps watched. Swaps whose status has not changed for a
+    while are checked less often, and swaps that fall outside the scanned pages are looked up on their own, at most
+    max_lookups of them per poll (the longest waiting first, the others stay due for the next poll).
+    Callbacks fire on every status change and swaps are dropped once they reach a terminal status. Example:
+
+    watcher = SwapWatcher(node)
+    sr = node.swap(address_to=addr_to, amount="1.1", currency_from="BTC", currency_to="BTC.B")
+    watcher.watch(in_address=sr['addressIn'], callback=lambda swap, old, new: print(swap.key, old, "->", new))
+    watcher.run()
+    """
+
+    def __init__(self, client, page_size=100, max_pages=10, min_interval=5, max_interval=300, backoff=0.1,
+        max_lookups=20, *args, **kwargs):
+        """
+        # Attributes
+        @param NodeHttpClient client - Client used to query swaps
+        @param integer page_size - Number of swaps per scanned page
+        @param integer max_pages - Max number of pages scanned per poll
+        @param float min_interval - Seconds between checks of a swap whose status just changed
+        @param float max_interval - Max seconds between checks of a swap
+        @param float backoff - Fraction of the time since the last status change added to the check interval
+        @param integer max_lookups - Max number of swaps outside the scanned pages looked up on their own per poll
+        """
+        self.client = client
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_lookups = max_lookups
+        self.swaps = {}
+        self.callbacks = []
+        self.requests = 0
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self.swaps)
+
+    def watch(self, in_address=None, in_hash=None, callback=None, key=None):
+        """
+        Starts following a swap
+
+        # Attributes
+        @param string in_address - Swap inbound address (addressIn returned by swap)
+        @param string in_hash - Hash of the inbound transaction
+        @param function callback - Called with (swap, old_status, new_status) on every status change of this swap
+        @param string key - Identifier of the swap (none provided = in_hash or in_address)
+
+        # Returns
+        @return string key
+        """
+        if not in_address and not in_hash:
+            raise Exception("SwapWatcher.watch requires an in_address or an in_hash.")
+        key = key or in_hash or in_address or str(next(self._ids))
+        with self._lock:
+            self.swaps[key] = WatchedSwap(key, in_address, in_hash, callback)
+        return key
+
+    def unwatch(self, key):
+        """
+        Stops following a swap
+        """
+        with self._lock:
+            self.swaps.pop(key, None)
+
+    def on_change(self, callback):
+        """
+        Registers a callback called with (swap, old_status, new_status) on every status change of any swap
+        """
+        self.callbacks.append(callback)
+
+    def _interval(self, swap, now):
+        return min(self.max_interval, max(self.min_interval, (now - swap.changed) * self.backoff))
+
+    def poll(self):
+        """
+        Checks every due swap once
+
+        # Returns
+        @return array events - (swap, old_status, new_status) of every status change
+        """
+        now = time.monotonic()
+        with self._lock:
+            pending = list(self.swaps.values())
+        if not any(s.next_check <= now for s in pending):
+            return []
+        found = {}
+        for page in range(self.max_pages):
+            res = self.client.query_swaps(page_size=self.page_size, page=page)
+            self.requests += 1
+            items = res.get('items') or []
+            for item in items:
+                for swap in pending:
+                    if swap.key not in found and swap.matches(item):
+                        found[swap.key] = item
+            if len(found) == len(pending) or len(items) < self.page_size:
+                break
+        missing = sorted((swap for swap in pending if swap.key not in found and swap.next_check <= now),
+            key=lambda swap: swap.next_check)
+        deferred = set(swap.key for swap in missing[self.max_lookups:])
+        for swap in missing[:self.max_lookups]:
+            # fell out of the scanned pages, look it up on its own
+            query = { "in_hash": swap.in_hash } if swap.in_hash else { "in_address": swap.in_address }
+            res = self.client.query_swaps(page_size=1, **query)
+            self.requests += 1
+            items = [item for item in res.get('items') or [] if swap.matches(item)]
+            if items:
+                found[swap.key] = items[0]
+        events = []
+        now = time.monotonic()
+        for swap in pending:
+            if swap.key in deferred:
+                continue
+            item = found.get(swap.key)
+            if item is not None and item.get('status') != swap.status:
+                events.append((swap, swap.status, item.get('status')))
+                swap.status = item.get('status')
+                swap.changed = now
+            if item is not None:
+                swap.item = item
+            swap.next_check = now + self._interval(swap, now)
+            if swap.status in TERMINAL_STATUSES:
+                self.unwatch(swap.key)
+        for swap, old, new in events:
+            for callback in ([swap.callback] if swap.callback else []) + self.callbacks:
+                try:
+                    callback(swap, old, new)
+                except Exception:
+                    logger.exception("SwapWatcher callback failed on swap {} ({} -> {})".format(swap.key, old, new))
+        return events
+
+    def _next_due(self):
+        with self._lock:
+            if not self.swaps:
+                return self.min_interval
+            return max(0.0, min(s.next_check for s in self.swaps.values()) - time.monotonic())
+
+    def run(self, until_empty=True):
+        """
+        Polls until stop() is called, or until every swap reached a terminal status
+
+        # Attributes
+        @param boolean until_empty - Return once no swaps are left to watch
+        """
+        self._stop.clear()
+        while not self._stop.is_set():
+            self.poll()
+            if until_empty and not self.swaps:
+                return
+            self._stop.wait(self._next_due())
+
+    def stop(self):
+        """
+        Stops run()
+        """
+        self._stop.set()
+
+    async def events(self, until_empty=True):
+        """
+        Async iterator over (swap, old_status, new_status) status changes. Polls run in the default executor.
+
+        # Attributes
+        @param boolean until_empty - Stop once no swaps are left to watch
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
+            if until_empty and not self.swaps:
+                return
+            await asyncio.sleep(self._next_due())
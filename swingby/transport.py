@@ -0,0 +1,201 @@
+"""
+This module contains the pooled HTTP transport shared by the Swingby clients
+"""
+
+import time
+
+from .ratelimit import RateLimitException, parse_retry_after
+from .json_codec import get_loads
+from .conditional import ValidatorCache, validator_key
+
+class HttpTransport:
+    """
+    HttpTransport holds a pooled, keep-alive requests.Session that can be shared between any number of
+    NodeHttpClient and StakesHttpClient instances. Its send_get and send_post methods plug straight into
+    the sendGetRequestFunc and sendPostRequestFunc hooks of the clients. Example:
+
+    transport = HttpTransport(pool_maxsize=32)
+    node = NodeHttpClient("https://testnet-node.swingby.network", transport.send_get, transport.send_post)
+    api = StakesHttpClient("https://staking-api.swingby.network", transport.send_get, transport.send_post)
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, connect_timeout=5,
+        read_timeout=30, keep_alive=True, gzip=True, headers=None, scheduler=None, json_backend=None, metrics=None,
+        conditional=False, validators_maxsize=1024, *args, **kwargs):
+        """
+        # Attributes
+        @param integer pool_connections - Number of per-host connection pools to keep
+        @param integer pool_maxsize - Max number of kept-alive connections per host
+        @param boolean pool_block - Block when a host's pool is exhausted instead of opening extra connections
+        @param float connect_timeout - Seconds to wait for a connection to be established
+        @param float read_timeout - Seconds to wait for the server to send a response
+        @param boolean keep_alive - Re-use connections between requests
+        @param boolean gzip - Ask the server for gzip/deflate encoded responses
+        @param dict headers - Extra headers sent with every request
+        @param RateLimitScheduler scheduler - Paces and retries requests to stay under the rate limits
+        @param string json_backend - JSON decoder, orjson or json (none provided = the fastest available)
+        @param Metrics metrics - Records per-endpoint latency, sizes and status codes (none provided = disabled)
+        @param boolean conditional - Revalidate get requests with ETag / Last-Modified, see ValidatorCache
+        @param integer validators_maxsize - Max number of urls whose validators and responses are remembered
+        """
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.validators = ValidatorCache(validators_maxsize) if conditional else None
+        self.loads = get_loads(json_backend)
+        self.timeout = (connect_timeout, read_timeout)
+        # imported here so that importing swingby (and its command line) stays fast
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate" if gzip else "identity"
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        if headers:
+            self.session.headers.update(headers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Close all pooled connections
+        """
+        self.session.close()
+
+    def send_get(self, endpoint, query={}, json=True):
+        """
+        Sends a get request over the pooled session
+        """
+        return self.send_get_conditional(endpoint, query, json)[0]
+
+    def send_get_conditional(self, endpoint, query={}, json=True):
+        """
+        Sends a get request over the pooled session and tells whether its answer is new, see ValidatorCache
+
+        # Returns
+        @return tuple (value, modified) - The response, and False if it is the remembered body of a 304
+        Not Modified answer, True otherwise
+        """
+        if self.scheduler is not None:
+            return self.scheduler.run(endpoint, self._send_get, query, json)
+        return self._send_get(endpoint, query, json)
+
+    def send_post(self, endpoint, query={}, body={}):
+        """
+        Sends a post request in application/json format over the pooled session
+        """
+        if self.scheduler is not None:
+            return self.scheduler.run(endpoint, self._send_post, query, body)
+        return self._send_post(endpoint, query, body)
+
+    def send_stream(self, endpoint, query={}, chunk_size=65536):
+        """
+        Sends a get request over the pooled session and lazily yields the raw response body in chunks,
+        so large responses are never held in memory whole
+        """
+        start = time.perf_counter() if self.metrics is not None else None
+        if self.scheduler is not None:
+            r = self.scheduler.run(endpoint, self._open_stream, query)
+        else:
+            r = self._open_stream(endpoint, query)
+        size = 0
+        try:
+            for chunk in r.iter_content(chunk_size):
+                size += len(chunk)
+                yield chunk
+        finally:
+            r.close()
+            if start is not None:
+                self.metrics.observe("GET", endpoint, r.status_code, time.perf_counter() - start, bytes_in=size)
+
+    def _open_stream(self, endpoint, query):
+        r = self.session.get(endpoint, params=query, timeout=self.timeout, stream=True)
+        if r.status_code == 429:
+            r.close()
+            raise RateLimitException("GET {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status_code),
+                parse_retry_after(r.headers.get("Retry-After")))
+        if r.status_code < 200 or r.status_code > 299:
+            raise Exception("GET {} failed with status code {} - Err: {}".format(endpoint, r.status_code, r.text))
+        return r
+
+    def _send_get(self, endpoint, query, json):
+        if self.metrics is not None:
+            return self._instrumented("GET", endpoint, query, json)
+        r, key, entry = self._get_response(endpoint, query, json)
+        return self._get_result(endpoint, r, json, self.loads, key, entry)
+
+    def _send_post(self, endpoint, query, body):
+        if self.metrics is not None:
+            return self._instrumented("POST", endpoint, query, body)
+        return self._post_result(endpoint, self.session.post(endpoint, params=query, json=body, timeout=self.timeout), self.loads)
+
+    def _instrumented(self, method, endpoint, query, arg):
+        decode_seconds = [0.0]
+
+        def loads(data):
+            start = time.perf_counter()
+            try:
+                return self.loads(data)
+            finally:
+                decode_seconds[0] += time.perf_counter() - start
+
+        r = None
+        start = time.perf_counter()
+        try:
+            if method == "GET":
+                r, key, entry = self._get_response(endpoint, query, arg)
+                return self._get_result(endpoint, r, arg, loads, key, entry)
+            r = self.session.post(endpoint, params=query, json=arg, timeout=self.timeout)
+            return self._post_result(endpoint, r, loads)
+        finally:
+            seconds = time.perf_counter() - start - decode_seconds[0]
+            if r is None:
+                self.metrics.observe(method, endpoint, "error", seconds)
+            else:
+                self.metrics.observe(method, endpoint, r.status_code, seconds, decode_seconds[0], len(r.content),
+                    len(r.request.body or b""))
+
+    def _get_response(self, endpoint, query, json):
+        if self.validators is None:
+            return self.session.get(endpoint, params=query, timeout=self.timeout), None, None
+        key = validator_key(endpoint, query, json)
+        entry = self.validators.lookup(key)
+        headers = entry.headers if entry is not None else None
+        return self.session.get(endpoint, params=query, timeout=self.timeout, headers=headers), key, entry
+
+    def _get_result(self, endpoint, r, json, loads, key=None, entry=None):
+        if r.status_code == 304 and entry is not None:
+            return self.validators.not_modified(entry), False
+        if r.status_code == 429:
+            raise RateLimitException("GET {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status_code),
+                parse_retry_after(r.headers.get("Retry-After")))
+        if r.status_code < 200 or r.status_code > 299:
+            raise Exception("GET {} failed with status code {} - Err: {}".format(endpoint, r.status_code, r.text))
+        res = loads(r.content) if json else r.text
+        if key is not None:
+            self.validators.store(key, r.headers, res)
+        return res, True
+
+    def _post_result(self, endpoint, r, loads):
+        if r.status_code == 429:
+            raise RateLimitException("POST {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status_code),
+                parse_retry_after(r.headers.get("Retry-After")))
+        if r.status_code < 200 or r.status_code > 299:
+            try:
+                res = loads(r.content)
+            except ValueError:
+                res = { "message": r.text }
+            message = res.get('message', 'unknown') if isinstance(res, dict) else res
+            raise Exception("POST {} failed with status code {} - Err: {}".format(endpoint, r.status_code, message))
+        try:
+            return loads(r.content)
+        except ValueError:
+            # e.g. the html page of a proxy, never a successful result
+            raise Exception("POST {} answered status code {} with an invalid JSON body - Err: {}".format(endpoint,
+                r.status_code, r.text))
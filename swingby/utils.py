@@ -1,26 +1,57 @@
-import requests
+from .transport import HttpTransport
+
+_default_transport = None
+
+def import_numpy():
+    """
+    Imports numpy, which only the columnar analytics helpers require
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise Exception("This feature requires numpy, install it with: pip install numpy")
+    return numpy
+
+def get_default_transport():
+    """
+    Returns the pooled transport shared by every client created without its own request functions
+    """
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = HttpTransport()
+    return _default_transport
 
 def default_send_get(endpoint, query={}, json=True):
     """
     Sends a get request
     """
-    r = requests.get(url=endpoint, params=query)
-    if r.status_code is 429:
-        raise Exception("GET {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status_code))
-    if r.status_code < 200 or r.status_code > 299:
-        raise Exception("GET {} failed with status code {} - Err: {}".format(endpoint, r.status_code, r.text))
-    if json:
-        return r.json()
-    return r.text
+    return get_default_transport().send_get(endpoint, query=query, json=json)
 
 def default_send_post(endpoint, query={}, body={}):
     """
     Sends a post request in application/json format
     """
-    r = requests.post(endpoint, params=query, json=body)
-    res = r.json()
-    if r.status_code is 429:
-        raise Exception("GET {} failed with status code {} - Err: rate limit exception".format(endpoint, r.status_code))
-    if r.status_code < 200 or r.status_code > 299:
-        raise Exception("GET {} failed with status code {} - Err: {}".format(endpoint, r.status_code, res.get('message', 'unknown')))
-    return res
+    return get_default_transport().send_post(endpoint, query=query, body=body)
+
+def default_send_stream(endpoint, query={}, chunk_size=65536):
+    """
+    Sends a get request and lazily yields the response body in chunks
+    """
+    return get_default_transport().send_stream(endpoint, query=query, chunk_size=chunk_size)
+
+def _no_send_stream(endpoint, query={}, chunk_size=65536):
+    raise Exception("Streaming {} requires a sendStreamRequestFunc when custom request functions are used".format(endpoint))
+
+def stream_func_for(*funcs):
+    """
+    Returns the stream function matching the request functions of a client: the send_stream of the transport
+    they are bound to, or default_send_stream for the default functions. Other functions have no stream
+    function to match, streaming then raises until one is passed explicitly.
+    """
+    for func in funcs:
+        send_stream = getattr(getattr(func, "__self__", None), "send_stream", None)
+        if callable(send_stream):
+            return send_stream
+    if all(func in (default_send_get, default_send_post) for func in funcs):
+        return default_send_stream
+    return _no_send_stream
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from stub_server import StubServer
+from swingby import HttpTransport, NodeHttpClient, StakesHttpClient
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+@pytest.fixture
+def serve(stub):
+    # serves a canned payload on a path of the stub, returns the list of the query / body of its requests
+    def serve(path, payload, status=200):
+        calls = []
+        def route(query, body):
+            calls.append(query if body is None else body)
+            return status, payload
+        stub.routes[path] = route
+        return calls
+    return serve
+
+@pytest.fixture
+def transport():
+    with HttpTransport() as t:
+        yield t
+
+@pytest.fixture
+def node(stub, transport):
+    return NodeHttpClient(stub.url, transport.send_get, transport.send_post, transport.send_stream)
+
+@pytest.fixture
+def api(stub, transport):
+    return StakesHttpClient(stub.url, transport.send_get, transport.send_post, transport.send_stream)
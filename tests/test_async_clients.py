@@ -0,0 +1,104 @@
+import asyncio
+import gc
+import logging
+import warnings
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from stub_server import MEMO
+from swingby import AsyncNodeHttpClient, AsyncStakesHttpClient, AsyncHttpTransport
+
+def test_requests(stub, serve):
+    serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    serve("/v1/floats", { "balances": { "BTC": "12.5", "BTC.B": "10.25" } })
+    serve("/v1/stakes/weekly_memo", "2020_10_01")
+    serve("/api/v1/swaps/calculate", { "send_amount": "0.1", "nonce": 7 })
+    created = serve("/api/v1/swaps/create", { "amount_in": "0.1" })
+    async def run():
+        async with AsyncHttpTransport(max_concurrency=4) as transport:
+            node = AsyncNodeHttpClient(stub.url, transport=transport)
+            api = AsyncStakesHttpClient(stub.url, transport=transport)
+            status, floats, memo = await node.gather(node.get_status(), api.get_floats(), api.get_weekly_memo())
+            swap = await node.swap("tbnb1x", "0.1", "BTC", "BTC.B")
+            return status, floats, memo, swap
+    status, floats, memo, swap = asyncio.run(run())
+    assert status["nodeInfo"]["moniker"] == "stub"
+    assert floats == { "BTC": "12.5", "BTC.B": "10.25" }
+    assert memo == "2020_10_01"
+    assert swap["calc"]["send_amount"] == "0.1" and created[0]["nonce"] == 7
+
+def test_streams(stub):
+    stub.routes["/api/v1/debug/kvstore"] = lambda query, body: (200, { "a": 1, "swap/b": [2] })
+    async def run():
+        async with AsyncHttpTransport() as transport:
+            node = AsyncNodeHttpClient(stub.url, transport=transport)
+            api = AsyncStakesHttpClient(stub.url, transport=transport)
+            kv = [item async for item in node.iter_kv_store(prefix="swap/", chunk_size=4)]
+            holders = [item async for item in api.iter_holders(memo=MEMO, chunk_size=256)]
+            stakes = [stake async for stake in api.iter_stakes(chunk_size=256)]
+            summary = await api.get_payout_summary(memo=MEMO)
+            return kv, holders, stakes, summary, await api.get_payout(memo=MEMO)
+    kv, holders, stakes, summary, payout = asyncio.run(run())
+    assert kv == [("swap/b", [2])]
+    assert [address for address, _ in holders] == [s["address"] for s in stub.stakers]
+    assert stakes == stub.stakers[:10]
+    assert summary == { "totalTransactions": payout["totalTransactions"], "estimatedPayout": payout["estimatedPayout"] }
+
+def test_clients_share_the_default_transport(stub):
+    assert AsyncNodeHttpClient(stub.url).transport is AsyncStakesHttpClient(stub.url).transport
+
+def test_each_event_loop_closes_its_session(stub, caplog):
+    transport = AsyncHttpTransport()
+    node = AsyncNodeHttpClient(stub.url, transport=transport)
+    sessions = []
+
+    async def run():
+        status = await node.get_status()
+        sessions.append(transport.session)
+        return status
+
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        for _ in range(3):
+            assert asyncio.run(run())["nodeInfo"]["moniker"] == "stub"
+            assert sessions[-1].closed and transport.session is None
+        assert sessions[0] is not sessions[1] is not sessions[2]
+        del sessions[:]
+        gc.collect()
+    assert "Unclosed" not in caplog.text
+
+def test_the_default_transport_leaks_no_socket_across_event_loops(stub):
+    node = AsyncNodeHttpClient(stub.url)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        for _ in range(3):
+            assert asyncio.run(node.get_status())["nodeInfo"]["moniker"] == "stub"
+        gc.collect()
+    assert [str(w.message) for w in caught if issubclass(w.category, ResourceWarning)] == []
+
+def test_a_manually_run_loop_closes_its_session_with_the_transport(stub):
+    transport = AsyncHttpTransport()
+    node = AsyncNodeHttpClient(stub.url, transport=transport)
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(node.get_status())["nodeInfo"]["moniker"] == "stub"
+        session = transport.session
+        loop.run_until_complete(transport.close())
+        assert session.closed and transport.session is None
+    finally:
+        loop.close()
+
+def test_a_successful_post_with_an_invalid_body_raises(stub):
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: (200, "<html>gateway</html>")
+
+    async def run():
+        transport = AsyncHttpTransport()
+        try:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            await node.create_swap("tbnb1to", "1", "BTC", "BTC.B", 0)
+        finally:
+            await transport.close()
+
+    with pytest.raises(Exception, match="status code 200 with an invalid JSON body - Err: <html>gateway</html>"):
+        asyncio.run(run())
@@ -0,0 +1,42 @@
+import argparse
+
+import requests
+
+import suite
+from stub_server import StubServer
+
+def _args(**kwargs):
+    args = dict(latency=0.0, rate_limit_ratio=0.2, swaps=50, stakers=50, padding=16, calls=5, crawls=2, page_size=20,
+        prefetch=2, startup_runs=1)
+    args.update(kwargs)
+    return argparse.Namespace(**args)
+
+def test_the_suite_measures_every_operation():
+    report = suite.run(_args())
+    assert sorted(report["results"]) == ["iter_swaps_crawl", "leaderboard_crawl", "query_swaps_page", "startup_cli_help",
+        "startup_import", "startup_python", "status_polling", "status_polling_conditional", "swap"]
+    for result in report["results"].values():
+        assert result["opsPerSecond"] > 0 and result["p50"] <= result["p99"]
+    assert report["results"]["iter_swaps_crawl"]["itemsPerSecond"] > 0
+    assert report["config"]["rateLimited"] > 0
+
+def test_compare_flags_regressions(capsys):
+    baseline = { "results": { "a": { "opsPerSecond": 100, "p99": 0.01 }, "b": { "opsPerSecond": 100, "p99": 0.01 } } }
+    report = { "results": { "a": { "opsPerSecond": 95, "p99": 0.011 }, "b": { "opsPerSecond": 50, "p99": 0.01 },
+        "c": { "opsPerSecond": 1, "p99": 1 } } }
+    assert suite.compare(report, baseline, 0.2) == ["b"]
+    assert "REGRESSION" in capsys.readouterr().out
+    assert suite.percentile([3, 1, 2], 50) == 2 and suite.percentile([], 99) is None
+
+def test_the_stub_injects_reproducible_rate_limits_and_revalidates():
+    statuses = []
+    for _ in range(2):
+        with StubServer(rate_limit_ratio=0.3, retry_after=2, seed=7) as stub, requests.Session() as session:
+            responses = [session.get("{}/api/v1/status".format(stub.url)) for _ in range(20)]
+            statuses.append([r.status_code for r in responses])
+    assert statuses[0] == statuses[1] and 429 in statuses[0]
+    assert next(r for r in responses if r.status_code == 429).headers["Retry-After"] == "2"
+    with StubServer() as stub, requests.Session() as session:
+        etag = session.get("{}/v1/floats".format(stub.url)).headers["ETag"]
+        assert session.get("{}/v1/floats".format(stub.url), headers={ "If-None-Match": etag }).status_code == 304
+        assert session.get("{}/v1/missing".format(stub.url)).status_code == 404
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from swingby import RateLimitException
+from swingby.bulk import imap_unordered
+
+ADDRESSES = ["tbnb1{:038x}".format(i) for i in range(50)]
+
+def _counted(stub, path, answer):
+    # serves answer(query) on a path of the stub, returns the list of the addresses it was asked for
+    asked = []
+    lock = threading.Lock()
+    def route(query, body):
+        with lock:
+            asked.append(query["address"])
+        return answer(query)
+    stub.routes[path] = route
+    return asked
+
+def test_bulk_token_balance_covers_every_address(stub, api):
+    asked = _counted(stub, "/v1/chain/asset", lambda query: (200, { "address": query["address"], "balance": "1.5" }))
+    addresses = ADDRESSES
+    pairs = dict(api.bulk_token_balance(addresses, max_workers=8))
+    assert sorted(pairs) == sorted(addresses)
+    assert all(pairs[address] == { "address": address, "balance": "1.5" } for address in addresses)
+    assert sorted(asked) == sorted(addresses)
+
+def test_bulk_stakes_retries_a_failed_address(stub, api):
+    failed = set()
+
+    def flaky(query):
+        if query["address"] not in failed:
+            failed.add(query["address"])
+            return 500, { "message": "busy" }
+        return 200, [{ "address": query["address"], "staked_amount": "1.0" }]
+
+    asked = _counted(stub, "/v1/stakes", flaky)
+    addresses = ADDRESSES[:4]
+    pairs = dict(api.bulk_stakes(addresses, memo="2020_10_01", retries=1))
+    assert { address: pairs[address][0]["address"] for address in addresses } == { a: a for a in addresses }
+    assert sorted(asked) == sorted(addresses * 2)
+
+def test_exhausted_retries_yield_the_exception():
+    calls = []
+
+    def fn(item):
+        calls.append(item)
+        if item == 3:
+            raise RateLimitException("slow down", retry_after=0)
+        return item * 2
+
+    pairs = dict(imap_unordered(fn, iter(range(10)), max_workers=3, retries=2, base_delay=0.001))
+    assert isinstance(pairs.pop(3), RateLimitException)
+    assert pairs == { i: i * 2 for i in range(10) if i != 3 }
+    assert calls.count(3) == 3
+
+def test_lazy_items_are_bounded_by_max_workers():
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fn(item):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return item
+
+    assert sorted(result for _, result in imap_unordered(fn, (i for i in range(40)), max_workers=4)) == list(range(40))
+    assert in_flight[1] <= 4
+
+def test_async_bulk_rewards_history(stub):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncStakesHttpClient
+    stub.routes["/v1/stakes/rewards_history"] = lambda query, body: (200, { "address": query["address"], "rewards": [] })
+
+    async def run():
+        transport = AsyncHttpTransport()
+        try:
+            api = AsyncStakesHttpClient(stub.url, transport.send_get, transport.send_post)
+            return [pair async for pair in api.bulk_rewards_history(["a", "b", "c"], max_workers=2)]
+        finally:
+            await transport.close()
+
+    assert sorted(asyncio.run(run()), key=lambda pair: pair[0]) == [(a, { "address": a, "rewards": [] }) for a in "abc"]
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from swingby import ResponseCache
+
+def test_wrapped_methods_are_served_from_the_cache(serve, node, api):
+    fees = serve("/api/v1/swaps/fees", [{ "currency": "BTC", "minerFee": "0.0001" }])
+    memos = serve("/v1/stakes/weekly_memo", "2020_10_01")
+    peers = serve("/api/v1/peers", [{ "id": "peer0" }])
+    cache = ResponseCache()
+    cache.wrap(node)
+    cache.wrap(api)
+    assert node.get_swap_fees() == node.get_swap_fees()
+    assert api.get_weekly_memo() == api.get_weekly_memo()
+    assert len(fees) == len(memos) == 1
+    node.get_peers()
+    node.get_peers()
+    assert len(peers) == 2
+    assert cache.stats() == { "hits": 2, "misses": 2, "evictions": 0, "size": 2 }
+
+def test_arguments_are_part_of_the_key(stub, api):
+    queries = []
+    def stakes(query, body):
+        queries.append(query)
+        return 200, [{ "address": query["address"] }]
+    stub.routes["/v1/stakes"] = stakes
+    ResponseCache(ttls={ "get_stakes": 60 }).wrap(api)
+    first = api.get_stakes(address="tbnb1a")
+    assert api.get_stakes(address="tbnb1b") != first
+    assert api.get_stakes(address="tbnb1a") == first
+    assert len(queries) == 2
+
+def test_entries_expire_and_can_be_invalidated(serve, node):
+    status = serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    fees = serve("/api/v1/swaps/fees", [])
+    cache = ResponseCache(ttls={ "get_status": 0.05, "get_swap_fees": 60 })
+    cache.wrap(node)
+    node.get_status()
+    node.get_swap_fees()
+    time.sleep(0.06)
+    node.get_status()
+    assert len(status) == 2 and len(fees) == 1
+    cache.invalidate(name="get_swap_fees", url="http://elsewhere")
+    node.get_swap_fees()
+    assert len(fees) == 1
+    cache.invalidate(name="get_swap_fees", url=node.url)
+    node.get_swap_fees()
+    assert len(fees) == 2
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.store("a", 1, 60)
+    cache.store("b", 2, 60)
+    assert cache.lookup("a") == (True, 1)
+    cache.store("c", 3, 60)
+    assert cache.lookup("b") == (False, None)
+    assert cache.lookup("a") == (True, 1)
+    assert cache.stats()['evictions'] == 1
+
+def test_async_clients_are_cached(stub, serve):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncStakesHttpClient
+
+    memos = serve("/v1/stakes/weekly_memo", "2020_10_01")
+
+    async def get_memos():
+        transport = AsyncHttpTransport()
+        try:
+            api = ResponseCache().wrap(AsyncStakesHttpClient(stub.url, transport.send_get, transport.send_post))
+            return [await api.get_weekly_memo() for _ in range(3)]
+        finally:
+            await transport.close()
+
+    assert asyncio.run(get_memos()) == ["2020_10_01"] * 3
+    assert len(memos) == 1
@@ -0,0 +1,44 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+from stub_server import MEMO
+from swingby.cli import QueryError, main_parser, parse_batch, run
+
+def _run(stub, argv):
+    args = main_parser().parse_args(["--node", stub.url, "--stakes", stub.url] + argv)
+    out = io.StringIO()
+    failures = run(args, out=out)
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_single_query(stub):
+    failures, records = _run(stub, ["fees"])
+    assert failures == 0
+    assert len(records) == 1 and isinstance(records[0], list)
+
+def test_batch_reports_invalid_lines_and_continues(stub, tmp_path):
+    batch = tmp_path / "queries.txt"
+    batch.write_text("status\n\n# comment\nno-such-command\nswaps --page-size x\nweekly-memo\npeers --type 'open\n")
+    failures, records = _run(stub, ["--batch", str(batch), "--ordered"])
+    assert failures == 3
+    assert [record['line'] for record in records] == [1, 4, 5, 6, 7]
+    assert "result" in records[0]
+    assert records[3]['result'] == MEMO
+    for record in (records[1], records[2], records[4]):
+        assert record['error'].startswith("Invalid query on line {}".format(record['line']))
+        assert "result" not in record
+
+def test_parse_batch_keeps_the_errors_in_place():
+    queries = parse_batch(["status", "leaderboard --page nope", "", "floats"])
+    assert [number for number, _, _ in queries] == [1, 2, 4]
+    assert isinstance(queries[1][2], QueryError)
+    assert queries[2][2].command == "floats"
+
+def test_the_command_line_imports_lazily():
+    code = ("import sys, swingby, swingby.cli; swingby.cli.main_parser(); "
+        "print(sorted(m for m in ('requests', 'numpy', 'aiohttp', 'swingby.transport') if m in sys.modules))")
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, check=True, stdout=subprocess.PIPE).stdout
+    assert out.decode().strip() == "[]"
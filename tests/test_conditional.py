@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from swingby import HttpTransport, NodeHttpClient
+from swingby.conditional import ValidatorCache
+
+def test_send_get_conditional_tells_new_bodies_from_not_modified(stub):
+    with HttpTransport(conditional=True) as transport:
+        url = "{}/api/v1/status".format(stub.url)
+        first, modified = transport.send_get_conditional(url)
+        assert modified is True
+        assert transport.send_get_conditional(url) == (first, False)
+        stub.routes["/api/v1/status"] = lambda query, body: (200, dict(first, changed=True))
+        value, modified = transport.send_get_conditional(url)
+        assert value["changed"] is True and modified is True
+        assert transport.validators.stats() == { "modified": 2, "notModified": 1, "size": 1 }
+
+def test_clients_share_the_remembered_bodies(stub):
+    with HttpTransport(conditional=True) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post)
+        peers = node.get_peers("normal")
+        assert transport.send_get_conditional(node.url + "/api/v1/peers", { "type": "normal" }) == (peers, False)
+        assert transport.send_get_conditional(node.url + "/api/v1/peers", { "type": "btc" })[1] is True
+
+def test_concurrent_pollers_each_get_their_own_flag(stub):
+    with HttpTransport(conditional=True, pool_maxsize=8) as transport:
+        url = "{}/api/v1/status".format(stub.url)
+        transport.send_get_conditional(url)
+        with ThreadPoolExecutor(8) as pool:
+            flags = [modified for _, modified in pool.map(lambda _: transport.send_get_conditional(url), range(16))]
+        assert flags == [False] * 16
+
+def test_without_validators_every_answer_is_modified(stub):
+    with HttpTransport() as transport:
+        url = "{}/api/v1/status".format(stub.url)
+        assert transport.send_get_conditional(url)[1] is True
+        assert transport.send_get_conditional(url)[1] is True
+
+def test_async_send_get_conditional(stub):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+
+    async def poll():
+        async with AsyncHttpTransport(conditional=True) as transport:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            status = await node.get_status()
+            url = "{}/api/v1/status".format(stub.url)
+            return status, await asyncio.gather(*[transport.send_get_conditional(url) for _ in range(4)])
+
+    status, answers = asyncio.run(poll())
+    assert answers == [(status, False)] * 4
+
+def test_responses_without_validators_are_forgotten():
+    cache = ValidatorCache(maxsize=1)
+    cache.store(("a", (), True), {}, 1)
+    assert cache.lookup(("a", (), True)) is None
+    cache.store(("a", (), True), { "ETag": '"1"' }, 1)
+    cache.store(("b", (), True), { "ETag": '"2"' }, 2)
+    assert cache.lookup(("a", (), True)) is None
+    assert cache.lookup(("b", (), True)).headers == { "If-None-Match": '"2"' }
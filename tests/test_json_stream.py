@@ -0,0 +1,80 @@
+import json
+import random
+
+import pytest
+
+from swingby.json_stream import ObjectItemParser, iter_object_items
+
+def _value(rng, depth=0):
+    r = rng.random()
+    if depth > 3 or r < 0.3:
+        return rng.choice([1, -2.5e10, 12345678901234567890, True, False, None, "", "é ü", 'q\\"{[', "]}", "\\\\"])
+    if r < 0.6:
+        return [_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return { "k{}\"}}".format(i): _value(rng, depth + 1) for i in range(rng.randint(0, 4)) }
+
+def _chunks(data, rng):
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, 24)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+def _cases(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        doc = { "key{}".format(i): _value(rng) for i in range(rng.randint(0, 6)) }
+        if rng.random() < 0.5:
+            doc = list(doc.values())
+        text = json.dumps(doc, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+        yield doc, _chunks(text.encode(), rng)
+
+def test_object_random_chunks():
+    for doc, chunks in _cases(2000, 1):
+        expected = list(enumerate(doc)) if isinstance(doc, list) else list(doc.items())
+        assert list(iter_object_items(chunks)) == expected
+
+def test_array_indices_across_chunk_boundaries():
+    assert list(iter_object_items([b'[{"a": 1', b'}, {"b"', b': 2}]'])) == [(0, { "a": 1 }), (1, { "b": 2 })]
+    assert list(iter_object_items([b'[1', b'2, 3', b'4]'])) == [(0, 12), (1, 34)]
+    for size in range(1, 12):
+        data = json.dumps([{ "a": i, "b": [i, "x" * i] } for i in range(20)]).encode()
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        assert [index for index, _ in iter_object_items(chunks)] == list(range(20))
+
+def test_keys_filter_random_chunks():
+    rng = random.Random(2)
+    for doc, chunks in _cases(1000, 3):
+        if isinstance(doc, list):
+            continue
+        keys = set(k for k in doc if rng.random() < 0.5)
+        assert list(iter_object_items(chunks, keys=keys)) == [(k, v) for k, v in doc.items() if k in keys]
+
+def test_split_utf8_and_escapes():
+    data = json.dumps({ "é": "ü\\\"€", "b": [" "] }, ensure_ascii=False).encode()
+    for size in range(1, 6):
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        assert dict(iter_object_items(chunks)) == { "é": "ü\\\"€", "b": [" "] }
+        assert dict(iter_object_items(chunks, keys=["b"])) == { "b": [" "] }
+
+def test_encoded_object():
+    encoded = json.dumps(json.dumps({ "a": 1, "b": [2] })).encode()
+    assert list(iter_object_items([encoded[:5], encoded[5:]])) == [("a", 1), ("b", [2])]
+
+def test_empty():
+    assert list(iter_object_items([b"{}"])) == []
+    assert list(iter_object_items([b" [ ", b"] "])) == []
+
+@pytest.mark.parametrize("data", [b'{"a": 1', b'{"a" 1}', b'[1 2]', b'5'])
+def test_invalid(data):
+    with pytest.raises(Exception):
+        list(iter_object_items([data]))
+
+def test_feed_returns_complete_pairs_only():
+    parser = ObjectItemParser()
+    assert parser.feed(b'{"a": [1, 2') == []
+    assert parser.feed(b'], "b": 3') == [("a", [1, 2])]
+    assert parser.feed(b'}') == [("b", 3)]
+    assert parser.close() == []
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+STAKERS = [{ "address": "tbnb1{:038x}".format(i), "stake": "{}.5".format(1000 + i) } for i in range(1000)]
+
+def _addresses(items):
+    return [item["address"] for item in items]
+
+@pytest.fixture
+def pages(stub, serve):
+    # serves STAKERS on both leaderboards, returns the (memo, page) of every page request
+    pages = []
+    def leaderboard(query, body):
+        pages.append((query["memo"], int(query["page"])))
+        page, page_size = int(query["page"]), int(query["page_size"])
+        return 200, { "items": STAKERS[(page - 1) * page_size:page * page_size], "total": len(STAKERS),
+            "totalStaked": 1000.0 }
+    serve("/v1/stakes/weekly_memo", "2020_10_01")
+    stub.routes["/v1/stakes/leaderboard"] = leaderboard
+    stub.routes["/v1/stakes/rewards_leaderboard"] = leaderboard
+    return pages
+
+def test_full_leaderboard_merges_every_page(pages, api):
+    leaderboard = api.fetch_full_leaderboard(page_size=64, prefetch=4)
+    assert leaderboard["memo"] == "2020_10_01"
+    assert leaderboard["itemCount"] == leaderboard["total"] == 1000
+    assert leaderboard["totalStaked"] == 1000.0
+    assert _addresses(leaderboard["items"]) == _addresses(STAKERS)
+    assert sorted(pages) == [("2020_10_01", page) for page in range(1, 17)]
+
+def test_iter_leaderboard_walks_the_rewards_of_a_memo(pages, api):
+    items = list(api.iter_leaderboard(memo="2020_09_24", page_size=300, rewards=True))
+    assert _addresses(items) == _addresses(STAKERS)
+    assert sorted(pages) == [("2020_09_24", page) for page in (1, 2, 3, 4)]
+
+def test_async_full_leaderboard(stub, pages):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncStakesHttpClient
+
+    async def crawl():
+        transport = AsyncHttpTransport()
+        try:
+            api = AsyncStakesHttpClient(stub.url, transport.send_get, transport.send_post)
+            full = await api.fetch_full_leaderboard(page_size=100, prefetch=3)
+            walked = [item async for item in api.iter_leaderboard(page_size=250)]
+            return full, walked
+        finally:
+            await transport.close()
+
+    full, walked = asyncio.run(crawl())
+    assert _addresses(full["items"]) == _addresses(walked) == _addresses(STAKERS)
+    assert full["itemCount"] == 1000
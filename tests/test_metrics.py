@@ -0,0 +1,83 @@
+import asyncio
+import random
+
+import pytest
+
+from swingby import HttpTransport, Metrics, NodeHttpClient, RateLimitScheduler, ResponseCache, StakesHttpClient
+
+def test_requests_are_recorded_per_endpoint(stub, serve):
+    serve("/api/v1/swaps/calculate", { "send_amount": "1", "nonce": 7 })
+    serve("/api/v1/peers", [{ "id": "peer{}".format(i) } for i in range(8)])
+    events = []
+    metrics = Metrics(callbacks=[events.append])
+    with HttpTransport(metrics=metrics) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post, transport.send_stream)
+        node.get_status()
+        node.get_status()
+        node.calculate_swap("tbnb1to", "1", "BTC", "BTC.B")
+        peers = b"".join(transport.send_stream("{}/api/v1/peers".format(stub.url)))
+        with pytest.raises(Exception):
+            node.get_kv_store()
+    snapshot = metrics.snapshot()["endpoints"]
+    assert sorted(snapshot) == ["GET api/v1/debug/kvstore", "GET api/v1/peers", "GET api/v1/status",
+        "POST api/v1/swaps/calculate"]
+    status = snapshot["GET api/v1/status"]
+    assert status["requests"] == 2 and status["statuses"] == { "200": 2 }
+    assert status["bytesIn"] > 0 and status["latencySum"] > 0 and sum(status["latencyBuckets"].values()) == 2
+    assert snapshot["POST api/v1/swaps/calculate"]["bytesOut"] > 0
+    assert snapshot["GET api/v1/peers"]["bytesIn"] == len(peers)
+    assert snapshot["GET api/v1/debug/kvstore"]["statuses"] == { "404": 1 }
+    assert [event["endpoint"] for event in events][:3] == ["api/v1/status", "api/v1/status", "api/v1/swaps/calculate"]
+    assert metrics.percentile("GET", "api/v1/status", 50) <= 10.0
+    assert metrics.percentile("GET", "api/v1/missing", 50) is None
+
+def test_retries_and_cache_hits_are_exported(stub, serve):
+    serve("/v1/stakes/weekly_memo", "2020_10_01")
+    rng = random.Random(3)
+    rate_limited = []
+    def floats(query, body):
+        if rng.random() < 0.5:
+            rate_limited.append(query)
+            return 429, { "message": "rate limit exceeded" }
+        return 200, { "balances": { "BTC": "12.5" } }
+    stub.routes["/v1/floats"] = floats
+    metrics = Metrics()
+    scheduler = RateLimitScheduler(rates={ "default": 1000 }, base_delay=0.001, max_delay=0.001, max_retries=30,
+        metrics=metrics)
+    with HttpTransport(metrics=metrics, scheduler=scheduler) as transport:
+        api = StakesHttpClient(stub.url, transport.send_get, transport.send_post)
+        ResponseCache(metrics=metrics).wrap(api)
+        for _ in range(5):
+            api.get_weekly_memo()
+        for _ in range(10):
+            api.get_floats()
+    snapshot = metrics.snapshot()
+    assert snapshot["cacheHits"] == { "get_weekly_memo": 4 }
+    assert sum(snapshot["retries"].values()) == len(rate_limited) > 0
+    text = metrics.to_prometheus()
+    assert 'swingby_cache_hits_total{function="get_weekly_memo"} 4' in text
+    assert 'swingby_responses_total{method="GET",endpoint="v1/floats",status="429"}' in text
+    assert 'swingby_request_duration_seconds_count{method="GET",endpoint="v1/floats"}' in text
+    metrics.reset()
+    assert metrics.snapshot() == { "endpoints": {}, "retries": {}, "cacheHits": {} }
+
+def test_async_transport_records_requests(stub, serve):
+    pytest.importorskip("aiohttp")
+    serve("/api/v1/swaps/fees", [{ "currency": "BTC", "bridgeFeePercent": "0.2", "minerFee": "0.0001" }])
+    serve("/api/v1/swaps/calculate", { "send_amount": "1", "nonce": 7 })
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+    metrics = Metrics()
+
+    async def run():
+        transport = AsyncHttpTransport(metrics=metrics)
+        try:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            await node.get_swap_fees()
+            await node.calculate_swap("tbnb1to", "1", "BTC", "BTC.B")
+        finally:
+            await transport.close()
+
+    asyncio.run(run())
+    endpoints = metrics.snapshot()["endpoints"]
+    assert endpoints["GET api/v1/swaps/fees"]["statuses"] == { "200": 1 }
+    assert endpoints["POST api/v1/swaps/calculate"]["requests"] == 1
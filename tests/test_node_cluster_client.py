@@ -0,0 +1,184 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from stub_server import StubServer
+from swingby import NodeClusterClient, HttpTransport, PowSolver
+from swingby.pow import check_nonce, default_payload
+
+PEERS = [{ "id": "peer{}".format(i) } for i in range(8)]
+
+def _counted(server, path="/api/v1/status"):
+    # the requests a stub node has answered on a path, counted once its latency has passed
+    calls = []
+    route = server.routes[path]
+    def counted(query, body):
+        calls.append(query)
+        return route(query, body)
+    server.routes[path] = counted
+    return calls
+
+class _Node:
+    """
+    A stub node that hands out its own nonces and only accepts creates carrying one of them, or with a
+    difficulty, a nonce solved over the exact amount sent
+    """
+
+    def __init__(self, name, fail_every=0, latency=0.0, difficulty=None):
+        self.name = name
+        self.fail_every = fail_every
+        self.difficulty = difficulty
+        self.nonces = set()
+        self.calculated = 0
+        self.created = 0
+        self.rejected = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.stub = StubServer(latency=latency)
+        self.stub.routes["/api/v1/swaps/calculate"] = self.calculate
+        self.stub.routes["/api/v1/swaps/create"] = self.create
+
+    def calculate(self, query, body):
+        # slow calculations, so concurrent swaps overlap
+        time.sleep(0.02)
+        with self._lock:
+            n = next(self._counter)
+            if self.fail_every and n % self.fail_every == 0:
+                return 500, { "message": "busy" }
+            self.calculated += 1
+            nonce = "{}-{}".format(self.name, n)
+            self.nonces.add(nonce)
+        return 200, { "send_amount": "{:.8f}".format(float(body["amount"])), "nonce": nonce, "fee": "0" }
+
+    def create(self, query, body):
+        if self.difficulty is not None:
+            payload = default_payload(body["address_to"], body["amount"], body["currency_from"], body["currency_to"])
+            valid = check_nonce(payload, body["nonce"], self.difficulty)
+        else:
+            valid = body["nonce"] in self.nonces
+        with self._lock:
+            if not valid:
+                self.rejected += 1
+                return 400, { "message": "unknown calculation" }
+            self.created += 1
+        return 200, { "address_out": body["address_to"], "amount_in": body["amount"], "node": self.name }
+
+@pytest.fixture
+def nodes():
+    # a is the fastest node but fails every other calculation, which then fails over to b
+    a, b = _Node("a", fail_every=2), _Node("b", latency=0.01)
+    with a.stub, b.stub:
+        yield a, b
+
+def test_concurrent_swaps_create_on_the_calculating_node(nodes):
+    a, b = nodes
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([a.stub.url, b.stub.url], transport.send_get, transport.send_post)
+        swaps = [{ "address_to": "tbnb1same", "amount": "1", "currency_from": "BTC", "currency_to": "BTC.B" }] * 40
+        results = cluster.swap_many(swaps, max_workers=8)
+    assert [r["error"] for r in results] == [None] * 40
+    assert a.rejected == b.rejected == 0
+    assert a.created == a.calculated and b.created == b.calculated
+    assert a.calculated and b.calculated
+
+def test_local_nonce_stays_pinned_and_matches_the_sent_amount():
+    # a is the fastest node but fails every other calculation, both verify the PoW of the amount sent
+    a, b = _Node("a", fail_every=2, difficulty=8), _Node("b", latency=0.01, difficulty=8)
+    with a.stub, b.stub, HttpTransport() as transport:
+        cluster = NodeClusterClient([a.stub.url, b.stub.url], transport.send_get, transport.send_post)
+        for _ in range(6):
+            # the nodes answer "1.00000000", which hashes differently from "1"
+            swap = cluster.swap("tbnb1same", "1", "BTC", "BTC.B", pow_solver=PowSolver(difficulty=8, workers=1))
+            node = a if swap["node"] == "a" else b
+            assert swap["calc"]["nonce"] in node.nonces
+            assert swap["amount_in"] == "1.00000000"
+    assert a.rejected == b.rejected == 0
+    assert a.created + b.created == 6
+
+def test_manual_calculate_then_create_is_pinned(nodes):
+    a, b = nodes
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([a.stub.url, b.stub.url], transport.send_get, transport.send_post)
+        calcs = [cluster.calculate_swap("tbnb1same", "1", "BTC", "BTC.B") for _ in range(6)]
+        for calc in reversed(calcs):
+            cluster.create_swap("tbnb1same", calc["send_amount"], "BTC", "BTC.B", calc["nonce"])
+    assert a.rejected == b.rejected == 0
+
+@pytest.fixture
+def fast_slow():
+    with StubServer() as fast, StubServer(latency=0.05) as slow:
+        yield fast, slow
+
+def test_reads_go_to_the_fastest_node(fast_slow):
+    fast, slow = fast_slow
+    fast_calls, slow_calls = _counted(fast), _counted(slow)
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([slow.url, fast.url], transport.send_get, transport.send_post, hedge_delay=10)
+        for _ in range(10):
+            cluster.get_status()
+        assert cluster.ranked_nodes()[0].url == fast.url
+    assert len(fast_calls) >= 8 and len(slow_calls) <= 2
+
+def test_slow_reads_are_hedged_on_the_next_node(fast_slow):
+    fast, slow = fast_slow
+    fast_calls, slow_calls = _counted(fast), _counted(slow)
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([slow.url, fast.url], transport.send_get, transport.send_post, hedge_delay=0.01)
+        start = time.monotonic()
+        assert cluster.get_status()["nodeInfo"]["moniker"] == "stub"
+        assert time.monotonic() - start < 0.05
+    time.sleep(0.1)
+    assert len(slow_calls) == len(fast_calls) == 1
+
+def test_hedging_goes_on_to_a_third_node():
+    with StubServer(latency=0.3) as a, StubServer(latency=0.3) as b, StubServer() as c:
+        a_calls, b_calls, c_calls = _counted(a), _counted(b), _counted(c)
+        with HttpTransport() as transport, NodeClusterClient([a.url, b.url, c.url], transport.send_get,
+            transport.send_post, hedge_delay=0.02) as cluster:
+            start = time.monotonic()
+            assert cluster.get_status()["nodeInfo"]["moniker"] == "stub"
+            assert time.monotonic() - start < 0.2
+            assert len(c_calls) == 1
+        time.sleep(0.4)
+        assert len(a_calls) == len(b_calls) == 1
+
+def test_close_stops_the_worker_threads(fast_slow):
+    fast, slow = fast_slow
+    with HttpTransport() as transport:
+        with NodeClusterClient([fast.url], transport.send_get, transport.send_post) as cluster:
+            assert cluster.get_status()
+        with pytest.raises(RuntimeError):
+            cluster.get_status()
+
+def test_failed_reads_fail_over_and_demote_the_node(fast_slow):
+    fast, slow = fast_slow
+    fast.routes["/api/v1/peers"] = lambda query, body: (500, { "message": "down" })
+    slow.routes["/api/v1/peers"] = lambda query, body: (200, PEERS)
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([fast.url, slow.url], transport.send_get, transport.send_post, hedge_delay=10)
+        for _ in range(5):
+            assert len(cluster.get_peers()) == 8
+        stats = { node["url"]: node for node in cluster.stats() }
+    assert stats[fast.url]["errors"] >= 1 and stats[fast.url]["errorRate"] > 0
+    assert [node["url"] for node in cluster.stats()] == [slow.url, fast.url]
+
+def test_every_node_failing_raises(fast_slow):
+    fast, slow = fast_slow
+    for stub in fast_slow:
+        stub.routes["/api/v1/status"] = lambda query, body: (500, { "message": "down" })
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([fast.url, slow.url], transport.send_get, transport.send_post, hedge_delay=10)
+        with pytest.raises(Exception, match="status code 500"):
+            cluster.get_status()
+
+def test_discover_adds_the_peer_urls(fast_slow):
+    fast, slow = fast_slow
+    fast.routes["/api/v1/peers"] = lambda query, body: (200, [{ "id": "x", "restUrl": slow.url + "/" }, { "id": "y" }])
+    slow_calls = _counted(slow)
+    with HttpTransport() as transport:
+        cluster = NodeClusterClient([fast.url], transport.send_get, transport.send_post)
+        assert cluster.discover() == [fast.url, slow.url]
+        cluster.remove_node(fast.url)
+        assert cluster.get_status() and len(slow_calls) == 1
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from swingby.pagination import iter_pages, page_count
+
+SWAPS = [{ "hash": "{:064x}".format(i), "addressIn": "tb1q{:038x}".format(i) } for i in range(1000)]
+
+def _serve_swaps(stub):
+    queries = []
+    def route(query, body):
+        queries.append(query)
+        swaps = [s for s in SWAPS if query.get("in_address") in (None, s["addressIn"])]
+        page_size, page = int(query["page_size"]), int(query.get("page") or 0)
+        return 200, { "items": swaps[page * page_size:(page + 1) * page_size], "total": len(swaps) }
+    stub.routes["/api/v1/swaps/query"] = route
+    return queries
+
+def test_iter_swaps_walks_every_page_in_order(stub, node):
+    queries = _serve_swaps(stub)
+    assert list(node.iter_swaps(page_size=30, prefetch=3)) == SWAPS
+    assert sorted(int(query.get("page") or 0) for query in queries) == list(range(page_count({ "total": len(SWAPS) }, 30)))
+    assert len(queries) == 34
+
+def test_iter_swaps_keeps_the_filters(stub, node):
+    queries = _serve_swaps(stub)
+    swaps = list(node.iter_swaps(page_size=10, in_address=SWAPS[7]['addressIn']))
+    assert swaps == [SWAPS[7]]
+    assert [query["in_address"] for query in queries] == [SWAPS[7]['addressIn']]
+
+def test_prefetch_bounds_the_pages_in_flight():
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fetch_page(page):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return { "items": list(range(page * 5, page * 5 + 5)), "total": 100 }
+
+    assert list(iter_pages(fetch_page, 5, prefetch=3)) == list(range(100))
+    assert in_flight[1] <= 3
+
+def test_pages_can_start_later_and_be_empty():
+    fetch_page = lambda page: { "items": [page] if page < 4 else [], "total": 4 }
+    assert list(iter_pages(fetch_page, 1, start_page=2)) == [2, 3]
+    assert list(iter_pages(lambda page: { "items": None, "total": 0 }, 10)) == []
+
+def test_closing_the_iterator_stops_fetching():
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return { "items": [page], "total": 1000 }
+
+    pages = iter_pages(fetch_page, 1, prefetch=2)
+    assert [next(pages) for _ in range(3)] == [0, 1, 2]
+    pages.close()
+    time.sleep(0.05)
+    assert len(fetched) <= 5
+
+def test_async_iter_swaps(stub):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+
+    _serve_swaps(stub)
+
+    async def walk():
+        transport = AsyncHttpTransport()
+        try:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            return [swap async for swap in node.iter_swaps(page_size=64, prefetch=4)]
+        finally:
+            await transport.close()
+
+    assert asyncio.run(walk()) == SWAPS
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import pytest
+
+from stub_server import MEMO, PAYOUT
+from swingby import PayoutPipeline
+
+HOLDERS = {
+    "tbnb1a": { "quantity": "50", "percentage": "50" },
+    "tbnb1b": { "quantity": "30", "percentage": "30" },
+    "tbnb1c": { "quantity": "20", "percentage": "20" },
+}
+
+STAKES = [
+    { "address": "tbnb1a", "staked_amount": "50", "reward_amount": "0.5", "weekly_memo": MEMO },
+    { "address": "tbnb1b", "staked_amount": "30", "reward_amount": "0.16666667", "weekly_memo": MEMO },
+]
+
+# worked out by hand: pool = 0.5 + 0.16666667 = 0.66666667, shared 50 / 30 / 20 and rounded down to 8 places
+# a = 0.333333335 -> 0.33333333, b = 0.200000001 -> 0.20000000, c = 0.133333334 -> 0.13333333
+EXPECTED = { "tbnb1a": Decimal("0.33333333"), "tbnb1b": Decimal("0.20000000"), "tbnb1c": Decimal("0.13333333") }
+
+FIXTURE_PAYOUT = {
+    "totalTransactions": 3,
+    "holders": [{ "address": "tbnb1a", "amount": "0.33333333" }, { "address": "tbnb1b", "amount": "0.2" },
+        { "address": "tbnb1c", "amount": "0.13333333" }],
+    "estimatedPayout": "0.66666666",
+}
+
+@pytest.fixture
+def weekly(stub):
+    stub.routes["/v1/stakes/holders"] = lambda query, body: (200, HOLDERS)
+    stub.routes["/v1/stakes"] = lambda query, body: (200, STAKES)
+    stub.routes["/v1/stakes/payout"] = lambda query, body: (200, FIXTURE_PAYOUT)
+    return stub
+
+def test_get_payout_summary_skips_holders(api):
+    summary = api.get_payout_summary(memo=MEMO, chunk_size=16)
+    assert summary == { "totalTransactions": PAYOUT['totalTransactions'], "estimatedPayout": PAYOUT['estimatedPayout'] }
+
+def test_pipeline_matches_the_hand_computed_payout(weekly, api):
+    pipeline = PayoutPipeline(api, memo=MEMO, batch_size=2, chunk_size=8)
+    batches = list(pipeline.batches())
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert { tx['address']: tx['amount'] for batch in batches for tx in batch } == EXPECTED
+    check = pipeline.cross_check()
+    assert check['matches']
+    assert check['total'] == check['estimatedPayout'] == Decimal("0.66666666")
+    assert check['difference'] == 0
+    assert check['remainder'] == Decimal("0.00000001")
+    assert check['transactions'] == check['totalTransactions'] == 3
+    assert check['batches'] == 2
+
+def test_percentage_basis_reads_the_holders_once(weekly, api):
+    paid = dict(PayoutPipeline(api, memo=MEMO, basis="percentage").holder_payouts())
+    assert paid == EXPECTED
+
+def test_min_amount_and_stake_payouts(weekly, api):
+    pipeline = PayoutPipeline(api, memo=MEMO, min_amount="0.2")
+    assert dict(pipeline.holder_payouts()) == { "tbnb1a": EXPECTED["tbnb1a"], "tbnb1b": EXPECTED["tbnb1b"] }
+    assert dict(PayoutPipeline(api, memo=MEMO).stake_payouts()) == { "tbnb1a": Decimal("0.5"),
+        "tbnb1b": Decimal("0.16666667") }
+
+def test_cross_check_catches_a_different_payout_model(weekly, api):
+    # the staking API paying 1% of the staked amounts to the stakers only
+    weekly.routes["/v1/stakes/payout"] = lambda query, body: (200, { "totalTransactions": 2,
+        "holders": [{ "address": "tbnb1a", "amount": "0.5" }, { "address": "tbnb1b", "amount": "0.3" }],
+        "estimatedPayout": "0.8" })
+    check = PayoutPipeline(api, memo=MEMO).run()
+    assert not check['matches']
+    assert check['difference'] == Decimal("-0.13333334") and check['totalTransactions'] == 2
+
+def test_cross_check_mismatch(weekly, api):
+    pipeline = PayoutPipeline(api, memo=MEMO)
+    for _ in pipeline.batches(pool="10"):
+        pass
+    check = pipeline.cross_check()
+    assert not check['matches']
+    assert check['difference'] > 0
+
+def test_run_passes_every_batch(weekly, api):
+    seen = []
+    check = PayoutPipeline(api, memo=MEMO, batch_size=1).run(seen.append)
+    assert check['matches']
+    assert [len(batch) for batch in seen] == [1, 1, 1]
+
+def test_cross_check_requires_consumed_batches(weekly, api):
+    pipeline = PayoutPipeline(api, memo=MEMO)
+    with pytest.raises(Exception):
+        pipeline.cross_check()
+    batches = pipeline.batches()
+    next(batches)
+    with pytest.raises(Exception):
+        pipeline.cross_check()
+
+def test_memo_resolved_once(weekly, api):
+    pipeline = PayoutPipeline(api)
+    assert pipeline.run()['memo'] == MEMO
+    assert weekly.requests == 5
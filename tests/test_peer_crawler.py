@@ -0,0 +1,75 @@
+import pytest
+
+from stub_server import StubServer
+from swingby import PeerCrawler, TopologySnapshot
+from swingby.peer_crawler import default_node_id
+
+@pytest.fixture
+def network():
+    """
+    Three stub nodes: a lists b as a signer, b lists a and c, c lists a peer that is down
+    """
+    stubs = [StubServer() for _ in range(3)]
+    a, b, c = stubs
+    statuses = { "a": a, "b": b, "c": c }
+    peers = {
+        "a": { "signer": [{ "id": "b", "url": b.url }], "normal": [] },
+        "b": { "signer": [], "normal": [{ "id": "a", "url": a.url }, { "id": "c", "url": c.url }] },
+        "c": { "signer": [], "normal": [{ "id": "down", "url": "http://127.0.0.1:9", "moniker": "down" }] },
+    }
+    for name, stub in statuses.items():
+        status = { "nodeInfo": { "id": name, "moniker": "node-" + name, "version": "1.0" } }
+        stub.routes["/api/v1/status"] = lambda query, body, status=status: (200, status)
+        stub.routes["/api/v1/peers"] = lambda query, body, name=name: (200, peers[name][query.get("type", "normal")])
+        stub.start()
+    yield stubs
+    for stub in stubs:
+        stub.stop()
+
+def test_crawl(network):
+    a, b, c = network
+    snapshot = PeerCrawler([a.url], max_workers=4).crawl()
+    assert sorted(snapshot.nodes) == ["a", "b", "c", "down"]
+    assert snapshot.adjacency == { "a": ["b"], "b": ["a", "c"], "c": ["down"] }
+    assert snapshot.edges() == { ("a", "b"), ("b", "c"), ("c", "down") }
+    assert snapshot.nodes["b"]["types"] == ["signer"]
+    assert snapshot.nodes["b"]["depth"] == 1 and snapshot.nodes["c"]["depth"] == 2
+    assert snapshot.nodes["down"]["reachable"] is False and snapshot.nodes["down"]["error"]
+    assert snapshot.nodes["down"]["moniker"] == "down"
+    assert [node["id"] for node in snapshot.fastest(5, node_type="signer")] == ["b"]
+    assert all(identity == node["id"] for identity, node in snapshot.nodes.items())
+
+def test_max_depth(network):
+    snapshot = PeerCrawler([network[0].url], max_depth=1).crawl()
+    assert sorted(snapshot.nodes) == ["a", "b", "c"]
+    assert not snapshot.nodes["c"]["reachable"] and snapshot.nodes["c"]["error"] is None
+
+def test_snapshot_round_trip_and_diff(network):
+    a, b, c = network
+    before = PeerCrawler([a.url]).crawl()
+    restored = TopologySnapshot.from_dict(before.to_dict())
+    assert restored.nodes == before.nodes and restored.adjacency == before.adjacency
+    c.routes["/api/v1/peers"] = lambda query, body: (200, [])
+    after = PeerCrawler([a.url]).crawl()
+    diff = after.diff(before.to_dict())
+    assert diff["removed"] == ["down"] and diff["added"] == []
+    assert diff["edgesRemoved"] == [("c", "down")]
+
+def test_merged_alias_keeps_the_canonical_id():
+    crawler = PeerCrawler([])
+    listed = { "id": "alias", "url": "http://b", "moniker": "bee", "version": None, "latency": None,
+        "types": ["signer"], "reachable": False, "error": None, "depth": None }
+    crawled = { "id": "http://b", "url": "http://b", "moniker": None, "version": "1.0", "latency": 0.1,
+        "types": ["normal"], "reachable": True, "error": None, "depth": 0 }
+    snapshot = crawler._merge({ "alias": listed, "http://b": crawled }, { "http://b": {"alias"} },
+        { "http://b": "alias" })
+    node = snapshot.nodes["alias"]
+    assert node["id"] == "alias"
+    assert node["reachable"] and node["version"] == "1.0" and node["moniker"] == "bee"
+    assert node["types"] == ["normal", "signer"]
+    assert snapshot.adjacency == { "alias": ["alias"] }
+
+def test_default_node_id():
+    assert default_node_id({ "nodeInfo": { "nodeId": 7 } }) == "7"
+    assert default_node_id({ "nodeInfo": {} }) is None
+    assert default_node_id(None) is None
@@ -0,0 +1,61 @@
+import pytest
+
+from swingby import PowSolver
+from swingby.pow import check_nonce, default_payload
+
+def test_solved_nonces_check():
+    solver = PowSolver(difficulty=10, workers=2)
+    nonce = solver.solve("tbnb1to", "1.5", "BTC", "BTC.B")
+    assert check_nonce(default_payload("tbnb1to", "1.5", "BTC", "BTC.B"), nonce, 10)
+    assert not check_nonce(default_payload("tbnb1to", "1.5", "BTC", "BTC.B"), nonce, 256)
+    assert solver.last_tries > 0 and solver.hashrate() > 0
+
+def test_custom_hash_and_payload():
+    payload = lambda address_to, amount, currency_from, currency_to: amount.encode()
+    nonce = PowSolver(difficulty=6, workers=1, hash_name="sha3_256", payload_func=payload).solve("a", "2", "BTC", "BTC.B")
+    assert check_nonce(b"2", nonce, 6, hash_name="sha3_256")
+
+def test_gives_up_after_the_timeout():
+    with pytest.raises(Exception, match="PoW nonce not found within 0.2 seconds"):
+        PowSolver(difficulty=64, workers=2).solve("tbnb1to", "1", "BTC", "BTC.B", timeout=0.2)
+
+def test_swap_creates_with_the_local_nonce(serve, node):
+    serve("/api/v1/swaps/calculate", { "send_amount": "1.00000000", "nonce": 0 })
+    created = serve("/api/v1/swaps/create", { "amount_in": "1.00000000" })
+    node.swap("tbnb1to", "1.00000000", "BTC", "BTC.B", pow_solver=PowSolver(difficulty=8, workers=2))
+    assert len(created) == 1
+    assert check_nonce(default_payload("tbnb1to", "1.00000000", "BTC", "BTC.B"), created[0]["nonce"], 8)
+
+def test_nonce_is_solved_again_when_the_amount_changes(serve, node):
+    class Solver:
+        amounts = []
+
+        def solve(self, address_to, amount, currency_from, currency_to):
+            Solver.amounts.append(amount)
+            return 0
+
+    serve("/api/v1/swaps/calculate", { "send_amount": "0.5", "nonce": 0 })
+    serve("/api/v1/swaps/create", {})
+    node.swap("tbnb1x", "1.0", "BTC", "BTC.B", pow_solver=Solver())
+    assert Solver.amounts == ["1.0", "0.5"]
+
+def test_nonce_is_solved_again_for_the_amount_string_the_node_returns(stub):
+    pytest.importorskip("aiohttp")
+    import asyncio
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+    created = []
+    calculate, create = stub.routes["/api/v1/swaps/calculate"], stub.routes["/api/v1/swaps/create"]
+    stub.routes["/api/v1/swaps/calculate"] = lambda query, body: calculate(query, dict(body, amount="1.00000000"))
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: created.append(body) or create(query, body)
+
+    async def run():
+        transport = AsyncHttpTransport()
+        try:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            await node.swap("tbnb1to", "1", "BTC", "BTC.B", pow_solver=PowSolver(difficulty=12, workers=1))
+        finally:
+            await transport.close()
+
+    asyncio.run(run())
+    assert created[0]["amount"] == "1.00000000"
+    assert check_nonce(default_payload("tbnb1to", "1.00000000", "BTC", "BTC.B"), created[0]["nonce"], 12)
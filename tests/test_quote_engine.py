@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import pytest
+
+from swingby import QuoteEngine
+
+def test_quote(node, api):
+    engine = QuoteEngine(node, api)
+    quote = engine.quote("1", "BTC.B", "BTC")
+    assert quote["fee"] == Decimal("0.00210000")
+    assert quote["receive_amount"] == Decimal("0.99790000")
+    assert quote["float"] == Decimal("12.5")
+    assert quote["liquid"]
+    assert not engine.quote("13", "BTC.B", "BTC")["liquid"]
+
+def test_quote_many_matches_quote(node, api):
+    engine = QuoteEngine(node, api)
+    amounts = ["0.01", "0.1", "1", Decimal("2.5")]
+    assert engine.quote_many(amounts, "BTC", "BTC.B") == [engine.quote(a, "BTC", "BTC.B") for a in amounts]
+
+def test_rounding(node):
+    quote = QuoteEngine(node, precision=8).quote("0.123456789", "BTC", "BTC.B")
+    # fee rounded up, receive amount rounded down
+    assert quote["fee"] == Decimal("0.00024693")
+    assert quote["receive_amount"] == Decimal("0.12320985")
+
+def test_without_stakes_client_liquidity_is_not_checked(node):
+    quote = QuoteEngine(node).quote("1000", "BTC", "BTC.B")
+    assert quote["float"] is None and quote["liquid"]
+
+@pytest.mark.parametrize("balances", [{ "BTC": "12.5" }, { "BTC": "12.5", "BTC.B": "n/a" }])
+def test_unknown_float_fails_closed(stub, node, api, balances):
+    stub.routes["/v1/floats"] = lambda query, body: (200, { "balances": balances })
+    engine = QuoteEngine(node, api)
+    quote = engine.quote("0.1", "BTC", "BTC.B")
+    assert quote["float"] is None and not quote["liquid"]
+    with pytest.raises(Exception, match="Unknown BTC.B float"):
+        engine.swap("tbnb1x", "0.1", "BTC", "BTC.B")
+
+def test_swap_checks_liquidity(node, api):
+    engine = QuoteEngine(node, api)
+    with pytest.raises(Exception, match="Insufficient BTC float"):
+        engine.swap("tb1x", "20", "BTC.B", "BTC")
+    assert engine.swap("tbnb1x", "0.1", "BTC", "BTC.B")["calc"]["send_amount"] == "0.1"
+
+def test_refresh_keeps_previous_values_on_failure(stub, node, api):
+    engine = QuoteEngine(node, api)
+    assert engine.refresh()
+    stub.routes["/v1/floats"] = lambda query, body: (500, { "message": "down" })
+    assert not engine.refresh()
+    assert engine.last_error is not None
+    assert engine.quote("1", "BTC.B", "BTC")["float"] == Decimal("12.5")
+
+def test_unknown_currency(node):
+    with pytest.raises(Exception, match="No swap fees known"):
+        QuoteEngine(node).quote("1", "BTC", "ETH")
@@ -0,0 +1,74 @@
+import random
+import time
+
+import pytest
+
+from swingby import HttpTransport, NodeHttpClient, RateLimitException, RateLimitScheduler
+from swingby.ratelimit import TokenBucket, endpoint_family, parse_retry_after
+
+def _rate_limited(stub, path, payload, ratio, seed=1):
+    # answers a seeded share of the requests on a path with a 429
+    rng = random.Random(seed)
+    counts = { "requests": 0, "rateLimited": 0 }
+    def route(query, body):
+        counts["requests"] += 1
+        if rng.random() < ratio:
+            counts["rateLimited"] += 1
+            return 429, { "message": "rate limit exceeded" }
+        return 200, payload
+    stub.routes[path] = route
+    return counts
+
+def test_rate_limited_requests_are_retried(stub):
+    counts = _rate_limited(stub, "/api/v1/peers", [{ "id": "peer{}".format(i) } for i in range(8)], 0.3)
+    scheduler = RateLimitScheduler(rates={ "default": 1000 }, base_delay=0.001, max_delay=0.01, max_retries=20)
+    with HttpTransport(scheduler=scheduler) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post)
+        for _ in range(30):
+            assert len(node.get_peers()) == 8
+    assert counts["rateLimited"] > 0
+    assert scheduler.stats()["retries"] == scheduler.stats()["throttled"] == counts["rateLimited"]
+    assert counts["requests"] == 30 + counts["rateLimited"]
+
+def test_the_last_429_is_raised_once_retries_run_out(stub):
+    counts = _rate_limited(stub, "/api/v1/status", {}, 1.0)
+    scheduler = RateLimitScheduler(base_delay=0.001, max_delay=0.001, max_retries=2)
+    with HttpTransport(scheduler=scheduler) as transport:
+        with pytest.raises(RateLimitException) as e:
+            transport.send_get("{}/api/v1/status".format(stub.url))
+    assert e.value.retry_after == 0
+    assert counts["requests"] == 3
+
+def test_requests_are_paced_per_family(stub, serve):
+    serve("/api/v1/swaps/fees", [])
+    scheduler = RateLimitScheduler(rates={ "swaps": 50, "status": 1000, "default": 1000 }, burst=1)
+    with HttpTransport(scheduler=scheduler) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post)
+        start = time.monotonic()
+        for _ in range(6):
+            node.get_swap_fees()
+        assert time.monotonic() - start >= 0.09
+        start = time.monotonic()
+        for _ in range(6):
+            node.get_status()
+        assert time.monotonic() - start < 0.09
+    assert sorted(key.split("/")[-1] for key in scheduler.stats()["buckets"]) == ["status", "swaps"]
+
+def test_throttle_backs_off_once_per_window_and_recovers():
+    bucket = TokenBucket(10)
+    bucket.throttle(0.2)
+    bucket.throttle(0.2)
+    assert bucket.rate == 5
+    assert bucket.reserve() > 0.1
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 10
+
+def test_helpers():
+    assert endpoint_family("https://node/api/v1/swaps/query") == "swaps"
+    assert endpoint_family("https://api/v1/stakes/leaderboard") == "stakes"
+    assert endpoint_family("https://api/v1/platform_status") == "status"
+    assert endpoint_family("https://node/api/v1/peers") == "default"
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+
+from swingby import Fee, HttpTransport, Holder, LeaderboardEntry, NodeHttpClient, Stake, Swap
+from swingby.json_codec import BACKEND, get_loads
+from swingby.records import to_decimal
+
+SWAPS = [{ "hash": "{:064x}".format(i), "status": "COMPLETED", "addressIn": "tb1q{:038x}".format(i),
+    "amountIn": "1.{:08d}".format(i), "currencyIn": "BTC", "currencyOut": "BTC.B", "fee": "0.00010000" } for i in range(3)]
+
+STAKERS = [{ "address": "tbnb1{:038x}".format(i), "staked_amount": "{}.5".format(1000 + i),
+    "reward_amount": "{}.25".format(i % 100), "weekly_memo": "2020_10_01" } for i in range(10)]
+
+def test_records_from_the_stub_responses(serve, node, api):
+    serve("/api/v1/swaps/query", { "items": SWAPS, "total": len(SWAPS) })
+    serve("/api/v1/swaps/fees", [{ "currency": "BTC", "bridgeFeePercent": "0.2", "minerFee": "0.0001" },
+        { "currency": "BTC.B", "bridgeFeePercent": "0.2", "minerFee": "0.00000001" }])
+    serve("/v1/stakes", STAKERS)
+    serve("/v1/stakes/leaderboard", { "items": [{ "address": s["address"], "stake": s["staked_amount"],
+        "reward": s["reward_amount"] } for s in STAKERS[:2]], "total": len(STAKERS) })
+    serve("/v1/stakes/holders", { s["address"]: { "quantity": s["staked_amount"], "percentage": "0.1" } for s in STAKERS })
+    swaps = Swap.from_list(node.query_swaps(page_size=3))
+    assert [swap.hash for swap in swaps] == [s["hash"] for s in SWAPS]
+    assert swaps[2].amount_in == Decimal("1.00000002") and swaps[2].fee == Decimal("0.0001")
+    assert swaps[2].currency_in is swaps[1].currency_in
+    assert not hasattr(swaps[0], "__dict__")
+    fees = Fee.from_list(node.get_swap_fees())
+    assert fees[1] == Fee("BTC.B", Decimal("0.2"), Decimal("0.00000001"))
+    stakes = Stake.from_list(api.get_stakes())
+    assert stakes[3].staked_amount == Decimal("1003.5") and stakes[3].weekly_memo == "2020_10_01"
+    entries = LeaderboardEntry.from_list(api.get_leaderboard(page_size=2))
+    assert entries[1] == LeaderboardEntry(STAKERS[1]["address"], Decimal("1001.5"), Decimal("1.25"))
+    holders = Holder.from_holders(api.get_holders())
+    assert holders[0].quantity == Decimal("1000.5") and len(holders) == 10
+
+def test_missing_and_malformed_amounts():
+    swap = Swap.from_dict({ "hash": "h", "amountIn": "nope", "amountOut": "" })
+    assert swap.amount_in is None and swap.amount_out is None and swap.timestamp is None
+    assert to_decimal(0.1) == Decimal("0.1") and to_decimal(None) is None
+
+def test_json_backends(stub, serve):
+    serve("/api/v1/peers", [{ "id": "peer0", "moniker": "peer0" }])
+    assert get_loads("json")(b'{"a": [1, "\\u00e9"]}') == { "a": [1, "é"] }
+    with pytest.raises(Exception, match="JSON backend simdjson is not available"):
+        get_loads("simdjson")
+    with HttpTransport(json_backend=BACKEND) as transport:
+        assert NodeHttpClient(stub.url, transport.send_get, transport.send_post).get_peers()[0]["id"] == "peer0"
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+
+from swingby import NodeHttpClient, SingleFlight
+
+def _concurrently(count, fn):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_identical_gets_share_one_request(stub, serve, transport):
+    status = serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    stub.latency = 0.2
+    flight = SingleFlight()
+    node = NodeHttpClient(stub.url, flight.wrap(transport.send_get), transport.send_post)
+    results = _concurrently(8, node.get_status)
+    assert len(status) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == { "calls": 1, "coalesced": 7 }
+
+def test_different_queries_and_later_calls_go_out(stub, serve, transport):
+    peers = serve("/api/v1/peers", [{ "id": "peer0" }])
+    flight = SingleFlight()
+    node = NodeHttpClient(stub.url, flight.wrap(transport.send_get), transport.send_post)
+    node.get_peers("normal")
+    node.get_peers("normal")
+    node.get_peers("btc")
+    assert [query["type"] for query in peers] == ["normal", "normal", "btc"]
+
+def test_errors_reach_every_waiter(stub, serve, transport):
+    stub.latency = 0.2
+    status = serve("/api/v1/status", { "message": "down" }, status=500)
+    flight = SingleFlight()
+    node = NodeHttpClient(stub.url, flight.wrap(transport.send_get), transport.send_post)
+    results = _concurrently(4, node.get_status)
+    assert len(status) == 1
+    assert all(isinstance(result, Exception) and "status code 500" in str(result) for result in results)
+
+def test_async_gets_are_coalesced_across_tasks(stub, serve):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+    status = serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    stub.latency = 0.1
+    flight = SingleFlight()
+
+    async def poll():
+        transport = AsyncHttpTransport()
+        try:
+            node = AsyncNodeHttpClient(stub.url, flight.wrap(transport.send_get), transport.send_post)
+            return await asyncio.gather(*[node.get_status() for _ in range(6)])
+        finally:
+            await transport.close()
+
+    results = asyncio.run(poll())
+    assert len(status) == 1
+    assert all(result == results[0] for result in results)
+    assert flight.stats() == { "calls": 1, "coalesced": 5 }
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from swingby import StakeTable
+from swingby.stakes_analytics import memo_matrix
+
+STAKERS = [{ "address": "tbnb1{:038x}".format(i), "staked_amount": "{}.5".format(1000 + i),
+    "reward_amount": "{}.25".format(i % 100) } for i in range(1000)]
+
+def test_tables_from_the_staking_api(serve, api):
+    serve("/v1/stakes/holders", { s["address"]: { "quantity": s["staked_amount"], "percentage": "0.001" } for s in STAKERS })
+    serve("/v1/stakes", STAKERS[:10])
+    serve("/v1/stakes/leaderboard", { "items": [{ "address": s["address"], "stake": s["staked_amount"],
+        "reward": s["reward_amount"] } for s in STAKERS[:5]], "total": len(STAKERS) })
+    holders = StakeTable.from_holders(api.get_holders(), memo="2020_10_01")
+    assert len(holders) == len(STAKERS)
+    assert holders.total("quantity") == sum(float(s["staked_amount"]) for s in STAKERS)
+    addresses, values = holders.top("quantity", 3)
+    assert addresses.tolist() == [s["address"] for s in STAKERS[::-1][:3]]
+    assert values.tolist() == [1999.5, 1998.5, 1997.5]
+    stakes = StakeTable.from_stakes(api.get_stakes())
+    assert stakes.total("reward_amount") == 47.5
+    leaderboard = StakeTable.from_leaderboard(api.get_leaderboard(page_size=5), columns=("stake", "reward"))
+    assert leaderboard["stake"].tolist() == [1000.5, 1001.5, 1002.5, 1003.5, 1004.5]
+
+def test_rows_of_the_same_address_are_summed():
+    table = StakeTable.from_records([{ "address": "b", "x": "1" }, { "address": "a", "x": 2 }, { "address": "b", "x": None },
+        { "address": "b", "x": "0.5" }], ("x",))
+    assert table.addresses.tolist() == ["a", "b"]
+    assert table["x"].tolist() == [2, 1.5]
+
+def test_distribution_metrics():
+    even = StakeTable(["a", "b", "c", "d"], { "x": [1, 1, 1, 1] })
+    skewed = StakeTable(["a", "b", "c", "d"], { "x": [0, 0, 0, 8] })
+    assert even.gini("x") == 0
+    assert skewed.gini("x") == pytest.approx(0.75)
+    assert skewed.top_share("x", 1) == 1
+    assert even.shares("x").tolist() == [0.25] * 4
+    assert StakeTable([], { "x": [] }).gini("x") == 0
+
+def test_joins_across_memos():
+    before = StakeTable(["a", "b"], { "x": [1, 2] }, memo="1")
+    now = StakeTable(["b", "c"], { "x": [5, 3] }, memo="2")
+    addresses, deltas = now.delta(before, "x")
+    assert addresses.tolist() == ["a", "b", "c"]
+    assert deltas.tolist() == [-1, 3, 3]
+    addresses, matrix = memo_matrix([before, now], "x")
+    assert matrix.tolist() == [[1, 0], [2, 5], [0, 3]]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from swingby import NodeHttpClient, StakesHttpClient, NodeClusterClient, HttpTransport, Metrics
+from swingby.utils import default_send_get, default_send_post, default_send_stream
+
+KV_STORE = { "swap/{}".format(i): { "amount": i } for i in range(50) }
+KV_STORE["config"] = "x"
+
+@pytest.fixture
+def kv_stub(stub):
+    stub.routes["/api/v1/debug/kvstore"] = lambda query, body: (200, KV_STORE)
+    return stub
+
+def test_iter_kv_store(kv_stub, node):
+    assert dict(node.iter_kv_store(chunk_size=64)) == KV_STORE
+    assert dict(node.iter_kv_store(prefix="swap/")) == { k: v for k, v in KV_STORE.items() if k.startswith("swap/") }
+    assert node.get_kv_store() == KV_STORE
+
+def test_iter_kv_store_encoded(stub, node):
+    stub.routes["/api/v1/debug/kvstore"] = lambda query, body: (200, json.dumps(json.dumps(KV_STORE)))
+    assert dict(node.iter_kv_store(chunk_size=64)) == KV_STORE
+
+def test_dump_kv_store(kv_stub, node, tmp_path):
+    path = str(tmp_path / "kvstore.json")
+    assert node.dump_kv_store(path, prefix="swap/") == 50
+    with open(path) as f:
+        assert json.load(f) == { k: v for k, v in KV_STORE.items() if k.startswith("swap/") }
+
+def test_stream_uses_the_injected_transport(kv_stub):
+    metrics = Metrics()
+    with HttpTransport(metrics=metrics) as transport:
+        node = NodeHttpClient(kv_stub.url, transport.send_get, transport.send_post)
+        api = StakesHttpClient(kv_stub.url, transport.send_get, transport.send_post)
+        cluster = NodeClusterClient([kv_stub.url], transport.send_get, transport.send_post)
+        assert node.stream == transport.send_stream and api.stream == transport.send_stream
+        assert len(list(node.iter_kv_store())) == len(KV_STORE)
+        assert len(list(cluster.iter_kv_store())) == len(KV_STORE)
+        assert len(list(api.iter_holders())) == len(kv_stub.stakers)
+    endpoints = metrics.snapshot()["endpoints"]
+    assert endpoints["GET api/v1/debug/kvstore"]["requests"] == 2
+    assert endpoints["GET v1/stakes/holders"]["requests"] == 1
+
+def test_default_functions_stream_over_the_default_transport():
+    assert NodeHttpClient("http://node").stream is default_send_stream
+    assert StakesHttpClient(None, default_send_get, default_send_post).stream is default_send_stream
+
+def test_custom_functions_require_a_stream_function(kv_stub, transport):
+    get = lambda endpoint, query={}, json=True: transport.send_get(endpoint, query=query, json=json)
+    node = NodeHttpClient(kv_stub.url, get, lambda *args, **kwargs: None)
+    assert node.get_status()["nodeInfo"]["moniker"] == "stub"
+    with pytest.raises(Exception, match="sendStreamRequestFunc"):
+        list(node.iter_kv_store())
+    node = NodeHttpClient(kv_stub.url, get, None, transport.send_stream)
+    assert dict(node.iter_kv_store()) == KV_STORE
+
+def test_iter_holders_and_stakes(api, stub):
+    assert dict(api.iter_holders(memo="m", chunk_size=100)) == api.get_holders(memo="m")
+    assert list(api.iter_stakes(chunk_size=100)) == api.get_stakes()
+    address = stub.stakers[5]["address"]
+    assert list(api.iter_stakes(address=address)) == [stub.stakers[5]]
@@ -0,0 +1,63 @@
+import pytest
+
+from swingby import SwapIndex
+
+@pytest.fixture
+def swaps():
+    # completed swaps, oldest first like sort=1, swap n is paid out with the inbound hash of swap n + 1
+    return [{ "hash": "{:064x}".format(i), "status": "COMPLETED", "addressIn": "tb1q{:038x}".format(i),
+        "addressOut": "tbnb1{:038x}".format(i), "currencyIn": "BTC", "currencyOut": "BTC.B",
+        "txIdIn": "{:064x}".format(i), "txIdOut": "{:064x}".format(i + 1), "timestamp": 1600000000 + i }
+        for i in range(1000)]
+
+@pytest.fixture
+def queries(stub, swaps):
+    queries = []
+
+    def query(query, body):
+        queries.append(query)
+        page_size, page = int(query["page_size"]), int(query.get("page") or 0)
+        return 200, { "items": swaps[page * page_size:(page + 1) * page_size], "total": len(swaps) }
+
+    stub.routes["/api/v1/swaps/query"] = query
+    return queries
+
+@pytest.fixture
+def index(node):
+    index = SwapIndex(node, page_size=100)
+    yield index
+    index.close()
+
+def test_sync(swaps, queries, index):
+    assert index.sync() == len(swaps)
+    assert len(index) == len(swaps) == index.high_water_mark
+    swap = swaps[42]
+    assert index.by_address(swap["addressIn"]) == [swap]
+    assert index.by_address(swap["addressOut"]) == [swap]
+    assert index.by_hash(swap["txIdOut"]) == [swaps[43], swap]
+    assert index.query(since=1600000010, until=1600000012) == swaps[10:13][::-1]
+    assert len(index.query(currency_in="BTC", limit=5)) == 5
+
+def test_incremental_sync_resumes_at_the_oldest_pending_swap(swaps, queries, index):
+    swaps[250]["status"] = "WAITING"
+    index.sync()
+    requests = len(queries)
+    swaps.extend(dict(swaps[0], hash="new{}".format(i), txIdIn="new{}".format(i)) for i in range(10))
+    # pages 2 (holding the pending swap) to 10
+    assert index.sync() == len(swaps) - 200
+    assert len(queries) - requests == 9
+    assert len(index) == len(swaps)
+
+def test_swap_without_hash_is_replaced_once_the_hash_arrives(swaps, queries, index):
+    swap = swaps[150]
+    tx_hash = swap["hash"]
+    swap.update(hash=None, txIdIn=None, status="WAITING")
+    index.sync()
+    assert len(index) == len(swaps)
+    assert index._resume_position() == 150
+
+    swap.update(hash=tx_hash, txIdIn=tx_hash, status="COMPLETED")
+    index.sync()
+    assert len(index) == len(swaps)
+    assert index.by_hash(tx_hash)[0]["status"] == "COMPLETED"
+    assert index._resume_position() == index.high_water_mark
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+@pytest.fixture
+def calls(stub):
+    # calculate and create routes that echo the swap, returns the routes called in order
+    calls = []
+
+    def calculate(query, body):
+        calls.append("calculate")
+        return 200, { "send_amount": body["amount"], "nonce": 0 }
+
+    def create(query, body):
+        calls.append("create")
+        return 200, { "address_out": body["address_to"], "amount_in": body["amount"] }
+
+    stub.routes["/api/v1/swaps/calculate"] = calculate
+    stub.routes["/api/v1/swaps/create"] = create
+    return calls
+
+def _swaps(count):
+    return [{ "address_to": "tbnb1to{}".format(i), "amount": "1.{:08d}".format(i), "currency_from": "BTC",
+        "currency_to": "BTC.B" } for i in range(count)]
+
+def test_results_keep_the_order_of_the_swaps(calls, node):
+    results = node.swap_many(_swaps(20), max_workers=4)
+    assert [r["error"] for r in results] == [None] * 20
+    assert [r["swap"]["address_out"] for r in results] == ["tbnb1to{}".format(i) for i in range(20)]
+    assert [r["swap"]["calc"]["send_amount"] for r in results] == [s["amount"] for s in _swaps(20)]
+    assert calls.count("calculate") == calls.count("create") == 20
+
+def test_a_failed_swap_does_not_abort_the_batch(stub, calls, node):
+    create = stub.routes["/api/v1/swaps/create"]
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: ((400, { "message": "bad address" })
+        if body["address_to"] == "tbnb1to3" else create(query, body))
+    results = node.swap_many(_swaps(6))
+    assert [r["swap"] is None for r in results] == [False, False, False, True, False, False]
+    assert "bad address" in str(results[3]["error"])
+
+def test_creates_are_pipelined_and_bounded(stub, calls, node):
+    lock = threading.Lock()
+    in_flight = [0, 0]
+    calculate = stub.routes["/api/v1/swaps/calculate"]
+
+    def slow_calculate(query, body):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return calculate(query, body)
+
+    stub.routes["/api/v1/swaps/calculate"] = slow_calculate
+    start = time.monotonic()
+    node.swap_many(_swaps(12), max_workers=4)
+    assert time.monotonic() - start < 12 * 0.05 / 2
+    assert in_flight[1] == 4
+
+def test_async_swap_many(stub, calls):
+    pytest.importorskip("aiohttp")
+    from swingby import AsyncHttpTransport, AsyncNodeHttpClient
+    create = stub.routes["/api/v1/swaps/create"]
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: ((500, { "message": "down" })
+        if body["address_to"] == "tbnb1to0" else create(query, body))
+
+    async def run():
+        transport = AsyncHttpTransport()
+        try:
+            node = AsyncNodeHttpClient(stub.url, transport.send_get, transport.send_post)
+            return await node.swap_many(_swaps(5), max_workers=2)
+        finally:
+            await transport.close()
+
+    results = asyncio.run(run())
+    assert results[0]["swap"] is None and "down" in str(results[0]["error"])
+    assert [r["swap"]["address_out"] for r in results[1:]] == ["tbnb1to{}".format(i) for i in range(1, 5)]
@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from swingby import SwapStats
+
+STATS = {
+    "network24hrSwaps": [4, 0, 6, 10],
+    "network24hrSwapsVolume": ["1.5", "0", "2.5", "4"],
+    "networkRewards24hrVolume": [1, 1, 1, 1],
+    "participated24hrSwaps": [2, 0, 3, 10],
+    "participated24hrSwapsVolume": ["0.75", "0", "0.5", "1"],
+    "rewards24hrVolume": [0.5, 0.25, 0, 1],
+    "network1mSwaps": [{ "at": "2020-10-01T00:00:00.000Z", "count": 30 }, { "at": "2020-10-02T00:00:00.000Z", "count": 60 }],
+    "participated1mSwaps": [{ "at": "2020-10-01T00:00:00.000Z", "count": 3 }, { "at": "2020-10-02T00:00:00.000Z", "count": 12 }],
+    "networkSwaps": 1000,
+    "participatedSwaps": 100,
+}
+
+def test_fetch_decodes_the_series_with_aligned_timestamps(stub, node):
+    stub.routes["/api/v1/swaps/stats"] = lambda query, body: (200, STATS)
+    stats = SwapStats.fetch(node, dtype="float32")
+    assert stats["network24hrSwapsVolume"].dtype == np.float32
+    assert stats["network24hrSwapsVolume"].tolist() == [1.5, 0, 2.5, 4]
+    assert np.diff(stats.timestamps["24hr"]).tolist() == [3600] * 3
+    assert stats.timestamps["1m"].tolist() == [1601510400, 1601596800]
+    assert stats.totals == { "networkSwaps": 1000, "participatedSwaps": 100 }
+    assert stats["networkRewards1mVolume"].size == 0
+    assert stats.nbytes > 0
+
+def test_rolling_sums_and_rates():
+    stats = SwapStats(STATS, fetched_at=1601600000)
+    assert stats.rolling_sum("network24hrSwaps", 2).tolist() == [4, 4, 6, 16]
+    assert stats.rolling_sum("network24hrSwaps", 10).tolist() == [4, 4, 10, 20]
+    assert stats.rate("network1mSwaps").tolist() == [30 / 86400, 60 / 86400]
+    assert stats.rate("network24hrSwaps")[-1] == 10 / 3600
+
+def test_participation_is_zero_where_the_network_had_nothing():
+    stats = SwapStats(STATS)
+    assert stats.participation().tolist() == [0.5, 0, 0.5, 1]
+    assert stats.participation(volume=True).tolist() == [0.5, 0, 0.2, 0.25]
+    assert stats.participation(rewards=True).tolist() == [0.5, 0.25, 0, 1]
+    assert stats.participation("1m").tolist() == [0.1, 0.2]
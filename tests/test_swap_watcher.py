@@ -0,0 +1,65 @@
+import logging
+
+from swingby import SwapWatcher
+
+def _due(watcher):
+    for swap in watcher.swaps.values():
+        swap.next_check = 0.0
+
+def test_swaps_outside_the_scanned_pages_are_looked_up_on_their_own(stub, node):
+    for swap in stub.swaps[500:530]:
+        swap["status"] = "WAITING"
+    watcher = SwapWatcher(node, page_size=10, max_pages=2, max_lookups=20)
+    for swap in stub.swaps[500:525]:
+        watcher.watch(in_hash=swap["hash"])
+    for swap in stub.swaps[525:530]:
+        watcher.watch(in_address=swap["addressIn"])
+
+    events = watcher.poll()
+    assert len(events) == 20 and all(old is None and new == "WAITING" for _, old, new in events)
+    # 2 scanned pages, then 20 of the 30 missing swaps one query each
+    assert watcher.requests == 22
+    # the 10 deferred swaps stay due
+    events = watcher.poll()
+    assert len(events) == 10 and watcher.requests == 34
+    assert all(swap.status == "WAITING" for swap in watcher.swaps.values())
+
+    for swap in stub.swaps[500:530]:
+        swap["status"] = "COMPLETED"
+    _due(watcher)
+    events = watcher.poll() + watcher.poll()
+    assert len(events) == 30 and all(new == "COMPLETED" for _, _, new in events)
+    assert len(watcher) == 0
+
+def test_scanned_pages_match_recent_swaps(stub, node):
+    stub.swaps[3]["status"] = "PENDING"
+    watcher = SwapWatcher(node, page_size=10, max_pages=2)
+    key = watcher.watch(in_address=stub.swaps[3]["addressIn"])
+    assert [(swap.key, old, new) for swap, old, new in watcher.poll()] == [(key, None, "PENDING")]
+    assert watcher.requests == 1
+    # not due yet
+    assert watcher.poll() == [] and watcher.requests == 1
+
+def test_failing_callback_does_not_drop_the_other_transitions(stub, node, caplog):
+    for swap in stub.swaps[:3]:
+        swap["status"] = "SIGNING"
+    seen = []
+
+    def broken(swap, old, new):
+        raise ValueError("boom")
+
+    watcher = SwapWatcher(node, page_size=10)
+    for swap in stub.swaps[:3]:
+        watcher.watch(in_hash=swap["hash"], callback=broken)
+    watcher.on_change(lambda swap, old, new: seen.append((swap.key, new)))
+    with caplog.at_level(logging.ERROR, logger="swingby.swap_watcher"):
+        events = watcher.poll()
+    assert len(events) == 3
+    assert sorted(seen) == sorted((swap["hash"], "SIGNING") for swap in stub.swaps[:3])
+    assert len([r for r in caplog.records if r.exc_info and "boom" in str(r.exc_info[1])]) == 3
+
+def test_run_until_terminal(stub, node):
+    watcher = SwapWatcher(node, page_size=10, min_interval=0)
+    watcher.watch(in_hash=stub.swaps[0]["hash"])
+    watcher.run()
+    assert len(watcher) == 0
@@ -0,0 +1,62 @@
+import pytest
+
+from swingby import HttpTransport, NodeHttpClient, StakesHttpClient
+
+def _connections(transport, url):
+    pools = transport.session.get_adapter(url).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+def test_clients_share_one_kept_alive_connection(stub, serve, transport, node, api):
+    status = serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    floats = serve("/v1/floats", { "balances": { "BTC": "12.5" } })
+    calc = serve("/api/v1/swaps/calculate", { "nonce": 0 })
+    for _ in range(10):
+        node.get_status()
+        api.get_floats()
+    node.calculate_swap("tbnb1to", "1", "BTC", "BTC.B")
+    assert len(status) == len(floats) == 10 and calc[0]["address_to"] == "tbnb1to"
+    assert _connections(transport, stub.url) == 1
+
+def test_keep_alive_can_be_disabled(stub, serve):
+    status = serve("/api/v1/status", { "nodeInfo": { "moniker": "stub" } })
+    with HttpTransport(keep_alive=False) as transport:
+        node = NodeHttpClient(stub.url, transport.send_get, transport.send_post)
+        assert node.get_status() == node.get_status()
+        assert transport.session.headers["Connection"] == "close"
+    assert len(status) == 2
+
+def test_text_and_stream_responses(stub, serve, transport, api):
+    serve("/v1/stakes/weekly_memo", "2020_10_01")
+    serve("/api/v1/peers", [{ "id": "peer{}".format(i) } for i in range(8)])
+    assert api.get_weekly_memo() == "2020_10_01"
+    chunks = list(transport.send_stream("{}/api/v1/peers".format(stub.url), chunk_size=16))
+    assert len(chunks) > 1 and all(len(chunk) <= 16 for chunk in chunks)
+    assert b"".join(chunks).startswith(b'[{"id": "peer0"')
+
+def test_failures_raise_with_the_status_code(stub, transport):
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: (400, { "message": "bad address" })
+    try:
+        transport.send_get("{}/api/v1/missing".format(stub.url))
+        assert False
+    except Exception as e:
+        assert "GET {}/api/v1/missing failed with status code 404".format(stub.url) in str(e)
+    try:
+        transport.send_post("{}/api/v1/swaps/create".format(stub.url), body={ "address_to": "x" })
+        assert False
+    except Exception as e:
+        assert str(e).endswith("failed with status code 400 - Err: bad address")
+
+def test_extra_headers(stub, serve):
+    serve("/v1/platform_status", { "status": 1 })
+    with HttpTransport(headers={ "X-Api-Key": "secret" }, gzip=False) as transport:
+        assert transport.session.headers["X-Api-Key"] == "secret"
+        assert transport.session.headers["Accept-Encoding"] == "identity"
+        assert StakesHttpClient(stub.url, transport.send_get, transport.send_post).get_platform_status() == 1
+
+def test_a_successful_post_with_an_invalid_body_raises(stub, node):
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: (200, "<html>gateway</html>")
+    with pytest.raises(Exception, match="status code 200 with an invalid JSON body - Err: <html>gateway</html>"):
+        node.create_swap("tbnb1to", "1", "BTC", "BTC.B", 0)
+    stub.routes["/api/v1/swaps/create"] = lambda query, body: (502, "<html>gateway</html>")
+    with pytest.raises(Exception, match="failed with status code 502 - Err: <html>gateway</html>"):
+        node.create_swap("tbnb1to", "1", "BTC", "BTC.B", 0)